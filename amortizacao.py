@@ -0,0 +1,184 @@
+from datetime import date
+
+import numpy as np
+
+from dinheiro import Dinheiro
+
+# ==========================
+# 🔹 AMORTIZAÇÃO (Price, SAC e Bullet)
+# ==========================
+# Gera o cronograma completo de um ou de vários empréstimos de uma vez,
+# com NumPy: cada linha é um empréstimo e cada coluna uma parcela. Todos
+# os valores são centavos (int64), com arredondamento meio-para-cima; a
+# última parcela absorve as sobras de arredondamento, então a soma das
+# amortizações é sempre exatamente o capital.
+#
+# - Price:  prestação fixa; juros sobre o saldo, amortização = prestação - juros
+# - SAC:    amortização fixa (capital / prazo); prestação decrescente
+# - Bullet: só juros todo mês; o capital inteiro na última parcela
+
+PRICE = "price"
+SAC = "sac"
+BULLET = "bullet"
+
+SISTEMAS = {
+    PRICE: "Price (prestação fixa)",
+    SAC: "SAC (amortização constante)",
+    BULLET: "Bullet (só juros, capital no fim)",
+}
+
+
+class Cronograma:
+    """
+    Resultado de calcular_cronogramas(): arrays de forma (empréstimos, parcelas).
+    Parcelas além do prazo de cada empréstimo ficam zeradas (e vencimento NaT).
+    """
+
+    __slots__ = ("prazo", "vencimento", "prestacao", "juros", "amortizacao", "saldo")
+
+    def __init__(self, prazo, vencimento, prestacao, juros, amortizacao, saldo):
+        self.prazo = prazo              # int64 (m,)
+        self.vencimento = vencimento    # datetime64[D] (m, n)
+        self.prestacao = prestacao      # centavos (m, n)
+        self.juros = juros
+        self.amortizacao = amortizacao
+        self.saldo = saldo              # saldo devedor depois de cada parcela
+
+    def total_pago(self):
+        return self.prestacao.sum(axis=-1)
+
+    def total_juros(self):
+        return self.juros.sum(axis=-1)
+
+    def parcelas(self, linha=0):
+        """
+        Parcelas de um empréstimo como tuplas
+        (número, vencimento (date), prestação, juros, amortização, saldo), em Dinheiro.
+        """
+        for k in range(int(self.prazo[linha])):
+            yield (
+                k + 1,
+                self.vencimento[linha, k].astype(date),
+                Dinheiro(int(self.prestacao[linha, k])),
+                Dinheiro(int(self.juros[linha, k])),
+                Dinheiro(int(self.amortizacao[linha, k])),
+                Dinheiro(int(self.saldo[linha, k])),
+            )
+
+
+def _arredondar(valores):
+    """Centavos fracionários -> int64, meio para cima."""
+    return np.floor(valores + 0.5).astype(np.int64)
+
+
+def _vencimentos(inicios, prazo_maximo):
+    """Mesmo dia do mês a partir do mês seguinte ao início (ajustado ao fim do mês)."""
+    inicio = np.asarray(inicios, dtype="datetime64[D]")
+    mes_inicio = inicio.astype("datetime64[M]")
+    dia = (inicio - mes_inicio.astype("datetime64[D]")).astype(np.int64)  # 0 = dia 1
+
+    meses = mes_inicio[:, None] + np.arange(1, prazo_maximo + 1)
+    ultimo_dia = (meses + 1).astype("datetime64[D]") - 1
+    return np.minimum(meses.astype("datetime64[D]") + dia[:, None], ultimo_dia)
+
+
+def _calcular(sistema, capital, taxa, prazo, k):
+    """
+    Juros e amortização (centavos) para empréstimos de um mesmo sistema.
+    capital/taxa/prazo: (m, 1); k: (1, n) com os números das parcelas.
+    """
+    m, n = capital.shape[0], k.shape[1]
+    ativa = k <= prazo
+    ultima = k == prazo
+    cap = capital.astype(np.float64)
+
+    if sistema == PRICE:
+        fator = (1 + taxa) ** prazo
+        com_juros = taxa > 0
+        pmt = np.where(
+            com_juros,
+            cap * taxa * fator / np.where(com_juros, fator - 1, 1),
+            cap / prazo,
+        )
+        pmt = _arredondar(pmt)
+        # saldo antes da parcela k, já com a prestação arredondada
+        crescimento = (1 + taxa) ** (k - 1)
+        saldo_anterior = np.where(
+            com_juros,
+            cap * crescimento - pmt * (crescimento - 1) / np.where(com_juros, taxa, 1),
+            cap - pmt * (k - 1),
+        )
+        juros = _arredondar(saldo_anterior * taxa)
+        amortizacao = pmt - juros
+    elif sistema == SAC:
+        amortizacao = np.broadcast_to(capital // prazo + (k <= capital % prazo), (m, n)).copy()
+        juros = None
+    elif sistema == BULLET:
+        amortizacao = np.zeros((m, n), dtype=np.int64)
+        juros = None
+    else:
+        raise ValueError(f"sistema de amortização desconhecido: {sistema!r}")
+
+    # A última parcela fecha o saldo exatamente; depois do prazo, tudo zero
+    amortizacao = np.where(ativa & ~ultima, amortizacao, 0)
+    amortizacao = np.where(ultima, capital - amortizacao.sum(axis=1, keepdims=True), amortizacao)
+    saldo = capital - np.cumsum(amortizacao, axis=1)
+    saldo_anterior = saldo + amortizacao
+
+    juros_do_saldo = _arredondar(saldo_anterior * taxa)
+    if juros is None:
+        juros = juros_do_saldo
+    else:
+        # Price: a última parcela recalcula os juros sobre o saldo real
+        juros = np.where(ultima, juros_do_saldo, juros)
+    juros = np.where(ativa, juros, 0)
+    saldo = np.where(ativa, saldo, 0)
+    return juros, amortizacao, saldo
+
+
+def calcular_cronogramas(capitais, taxas, prazos, inicios, sistemas=PRICE):
+    """
+    Cronogramas de vários empréstimos numa única chamada.
+    - capitais: centavos (int) por empréstimo
+    - taxas: taxa mensal (0.05 = 5% a.m.)
+    - prazos: quantidade de parcelas (>= 1)
+    - inicios: data do empréstimo (date ou "AAAA-MM-DD"); 1º vencimento um mês depois
+    - sistemas: PRICE / SAC / BULLET, um para todos ou um por empréstimo
+    """
+    capital = np.atleast_1d(np.asarray(capitais, dtype=np.int64))
+    m = capital.shape[0]
+    taxa = np.broadcast_to(np.asarray(taxas, dtype=np.float64), (m,))
+    prazo = np.broadcast_to(np.asarray(prazos, dtype=np.int64), (m,))
+    inicio = np.broadcast_to(np.asarray(inicios, dtype="datetime64[D]"), (m,))
+    sistema = np.broadcast_to(np.asarray(sistemas), (m,))
+
+    if (prazo < 1).any():
+        raise ValueError("o prazo deve ter pelo menos uma parcela")
+    if (taxa < 0).any():
+        raise ValueError("a taxa de juros não pode ser negativa")
+
+    n = int(prazo.max())
+    k = np.arange(1, n + 1)[None, :]
+    juros = np.zeros((m, n), dtype=np.int64)
+    amortizacao = np.zeros((m, n), dtype=np.int64)
+    saldo = np.zeros((m, n), dtype=np.int64)
+
+    # Um cálculo vetorizado por sistema (no máximo três)
+    for nome in np.unique(sistema):
+        linhas = sistema == nome
+        j, a, s = _calcular(
+            str(nome), capital[linhas, None], taxa[linhas, None], prazo[linhas, None], k
+        )
+        juros[linhas], amortizacao[linhas], saldo[linhas] = j, a, s
+
+    vencimento = _vencimentos(inicio, n)
+    vencimento = np.where(k <= prazo[:, None], vencimento, np.datetime64("NaT"))
+
+    return Cronograma(prazo.copy(), vencimento, juros + amortizacao, juros, amortizacao, saldo)
+
+
+def calcular_cronograma(capital, taxa, prazo, inicio, sistema=PRICE):
+    """Cronograma de um único empréstimo (capital em centavos ou Dinheiro)."""
+    if isinstance(capital, Dinheiro):
+        capital = capital.centavos
+    return calcular_cronogramas([capital], taxa, prazo, inicio, sistema)
@@ -0,0 +1,133 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from config import get_local_db_path
+
+# ==========================
+# 🔹 CONEXÃO LOCAL (SQLite)
+# ==========================
+# Cada thread recebe a sua própria conexão, aberta uma única vez e
+# reaproveitada por todos os módulos de dados (clientes, emprestimos,
+# parcelas, movimentacoes) e pelo supabase_utils.
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",      # leitores não bloqueiam o escritor
+    "PRAGMA synchronous=NORMAL",    # com WAL, um fsync por checkpoint basta
+    "PRAGMA cache_size=-16000",     # ~16 MB de cache de páginas
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA recursive_triggers=ON", # INSERT OR REPLACE dispara os triggers de DELETE (busca)
+)
+
+# Quantidade de comandos preparados mantidos em cache por conexão
+CACHE_COMANDOS = 256
+
+_local = threading.local()
+_conexoes = set()
+_lock = threading.Lock()
+# Muda a cada fechar_todas(); conexão de outra geração é reaberta pela thread
+_geracao = 0
+
+
+def _abrir_conexao(caminho):
+    # isolation_level=None: as transações são controladas por transacao()
+    conn = sqlite3.connect(
+        caminho,
+        timeout=30,
+        isolation_level=None,
+        cached_statements=CACHE_COMANDOS,
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_conexao():
+    """Retorna a conexão da thread atual, abrindo-a na primeira chamada."""
+    caminho = get_local_db_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.caminho == caminho and (
+        _local.geracao == _geracao or _local.profundidade
+    ):
+        return conn
+
+    if conn is not None:
+        fechar_conexao()
+
+    conn = _abrir_conexao(caminho)
+    _local.conn = conn
+    _local.caminho = caminho
+    _local.profundidade = 0
+    with _lock:
+        _conexoes.add(conn)
+        _local.geracao = _geracao
+    return conn
+
+
+@contextmanager
+def transacao():
+    """
+    Executa o bloco dentro de uma única transação na conexão da thread.
+    Pode ser aninhada: só a transação mais externa faz COMMIT/ROLLBACK,
+    então vários salvar_* chamados juntos viram um único commit.
+    """
+    conn = get_conexao()
+    if _local.profundidade == 0:
+        conn.execute("BEGIN IMMEDIATE")
+    _local.profundidade += 1
+    try:
+        yield conn
+    except BaseException:
+        _local.profundidade -= 1
+        if _local.profundidade == 0:
+            conn.execute("ROLLBACK")
+        raise
+    else:
+        _local.profundidade -= 1
+        if _local.profundidade == 0:
+            try:
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+
+def fechar_conexao():
+    """Fecha a conexão da thread atual (se houver)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        return
+    with _lock:
+        _conexoes.discard(conn)
+    conn.close()
+    _local.conn = None
+    _local.caminho = None
+    _local.profundidade = 0
+
+
+def fechar_todas():
+    """
+    Fecha as conexões abertas (usado ao encerrar o programa). Conexões de
+    outras threads não podem ser fechadas daqui: ficam para o coletor, e a
+    thread que ainda estiver viva abre uma nova no próximo get_conexao().
+    """
+    global _geracao
+    with _lock:
+        conexoes = list(_conexoes)
+        _conexoes.clear()
+        _geracao += 1
+    for conn in conexoes:
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            # conexão pertence a outra thread; será liberada com ela
+            pass
+    _local.conn = None
+    _local.caminho = None
+    _local.profundidade = 0
+
+
+def agora_iso():
+    """Carimbo de tempo (UTC, ISO-8601) usado nas colunas de versão."""
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
@@ -0,0 +1,7 @@
+# ==========================
+# 🔹 BENCHMARKS DA CAMADA DE DADOS E DA SINCRONIZAÇÃO
+# ==========================
+# Uso (na pasta do projeto):
+#   python -m benchmarks --clientes 5000 --repeticoes 5 --saida relatorio.json
+# Roda sobre um banco temporário com dados sintéticos e um Supabase local;
+# o dados.db e a nuvem de verdade nunca são tocados.
@@ -0,0 +1,54 @@
+import argparse
+import json
+import os
+import sys
+
+# Sem tela: as janelas do Qt são criadas fora da área de trabalho
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.cenarios import Benchmark
+
+CENARIOS = ["carga", "salvamento", "interface", "sincronizacao"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Mede carga, salvamento, busca, parcelas e sincronização com dados sintéticos.",
+    )
+    parser.add_argument("--clientes", type=int, default=2000)
+    parser.add_argument("--emprestimos-por-cliente", type=int, default=2)
+    parser.add_argument("--parcelas-por-emprestimo", type=int, default=12)
+    parser.add_argument("--movimentacoes", type=int, default=2000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=1)
+    parser.add_argument("--latencia", type=float, default=0.0,
+                        help="segundos somados a cada requisição ao Supabase local")
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS, default=CENARIOS)
+    parser.add_argument("--saida", help="arquivo JSON do relatório (padrão: só na saída padrão)")
+    parser.add_argument("--log", default="WARNING",
+                        help="níveis do log durante as medições, como em AGIOTA_LOG "
+                             "(ex.: INFO ou WARNING,supabase_utils=DEBUG)")
+    args = parser.parse_args(argv)
+
+    relatorio = Benchmark(
+        clientes=args.clientes,
+        emprestimos_por_cliente=args.emprestimos_por_cliente,
+        parcelas_por_emprestimo=args.parcelas_por_emprestimo,
+        movimentacoes=args.movimentacoes,
+        repeticoes=args.repeticoes,
+        semente=args.semente,
+        latencia=args.latencia,
+        nivel_log=args.log,
+    ).executar(args.cenarios)
+
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto + "\n")
+        print(f"✅ Relatório salvo em {args.saida}", file=sys.stderr)
+    print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import random
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+
+from amortizacao import calcular_cronogramas, PRICE, SAC, BULLET
+
+# ==========================
+# 🔹 CARTEIRA SINTÉTICA
+# ==========================
+# Gera uma carteira determinística (mesma semente -> mesmos dados, inclusive
+# os IDs): clientes, empréstimos por cliente, parcelas por empréstimo (com o
+# cronograma de verdade, via amortizacao) e movimentações. As linhas saem no
+# formato do banco local (centavos e datas ISO), na ordem de
+# TABELAS[nome]["campos"], mais a coluna de versão no fim.
+
+VERSAO_INICIAL = "2025-01-01T00:00:00.000000+00:00"
+HOJE = date(2025, 6, 1)  # referência fixa para "pago" / "em aberto"
+
+_NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elaine", "Fábio", "Gisele", "Hugo",
+          "Isabel", "João", "Karina", "Lucas", "Márcia", "Nelson", "Otávio", "Paula"]
+_SOBRENOMES = ["Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Carvalho",
+               "Ferreira", "Rodrigues", "Almeida", "Costa", "Gomes", "Ribeiro", "Araújo"]
+_CIDADES = ["Fortaleza", "Caucaia", "Maracanaú", "Sobral", "Juazeiro do Norte", "Crato",
+            "Iguatu", "Quixadá", "Aquiraz", "Pacatuba", "Horizonte", "Eusébio"]
+_RUAS = ["Rua das Flores", "Av. Beira Mar", "Rua Barão do Rio Branco", "Rua Padre Cícero",
+         "Av. Santos Dumont", "Rua São José", "Travessa Boa Vista"]
+_SISTEMAS = [PRICE, PRICE, PRICE, SAC, BULLET]
+
+
+def _gerador_ids(rng):
+    return lambda: str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def gerar_carteira(clientes=1000, emprestimos_por_cliente=2, parcelas_por_emprestimo=12,
+                   movimentacoes=1000, semente=1):
+    """
+    Carteira sintética: dict tabela -> lista de linhas (formato do banco +
+    versão). Cada empréstimo tem exatamente `parcelas_por_emprestimo` parcelas.
+    """
+    rng = random.Random(semente)
+    novo_id = _gerador_ids(rng)
+    versao = VERSAO_INICIAL
+
+    linhas_clientes = []
+    for _ in range(clientes):
+        nome = f"{rng.choice(_NOMES)} {rng.choice(_SOBRENOMES)} {rng.choice(_SOBRENOMES)}"
+        linhas_clientes.append((
+            novo_id(),
+            nome,
+            f"{rng.randrange(10**11):011d}",
+            f"(85) 9{rng.randrange(10**8):08d}",
+            f"{rng.choice(_RUAS)}, {rng.randint(1, 3000)}",
+            rng.choice(_CIDADES),
+            rng.choice(_NOMES) if rng.random() < 0.6 else "",
+            versao,
+        ))
+
+    # Empréstimos: capital, taxa, início e sistema sorteados
+    linhas_emprestimos, capitais, taxas, inicios, sistemas = [], [], [], [], []
+    for cliente in linhas_clientes:
+        for _ in range(emprestimos_por_cliente):
+            capital = rng.randrange(500, 20000) * 100
+            taxa = rng.choice([0.03, 0.05, 0.08, 0.10, 0.15])
+            sistema = rng.choice(_SISTEMAS)
+            inicio = HOJE - timedelta(days=rng.randrange(0, 720))
+            linhas_emprestimos.append((
+                novo_id(), cliente[0], capital, inicio.isoformat(),
+                str(parcelas_por_emprestimo),
+                f"Taxa {taxa * 100:.0f}% ({sistema.upper()})",
+                versao,
+            ))
+            capitais.append(capital)
+            taxas.append(taxa)
+            inicios.append(inicio)
+            sistemas.append(sistema)
+
+    # Parcelas: todos os cronogramas de uma vez
+    linhas_parcelas = []
+    if linhas_emprestimos and parcelas_por_emprestimo:
+        cronogramas = calcular_cronogramas(
+            capitais, taxas, parcelas_por_emprestimo, np.array(inicios, dtype="datetime64[D]"), sistemas
+        )
+        vencimentos = cronogramas.vencimento.astype(str).tolist()
+        prestacoes = cronogramas.prestacao.tolist()
+        hoje = HOJE.isoformat()
+        for e, emprestimo in enumerate(linhas_emprestimos):
+            for k in range(parcelas_por_emprestimo):
+                valor = prestacoes[e][k]
+                vencimento = vencimentos[e][k]
+                paga = vencimento < hoje and rng.random() < 0.85
+                linhas_parcelas.append((
+                    novo_id(), emprestimo[0], str(k + 1), valor, vencimento,
+                    None, None, valor, valor if paga else None,
+                    0 if paga else valor, "Sim" if paga else "Não",
+                    vencimento if paga else None,
+                    versao,
+                ))
+
+    linhas_movimentacoes = []
+    for _ in range(movimentacoes):
+        emprestimo = rng.choice(linhas_emprestimos) if linhas_emprestimos else None
+        entrada = rng.random() < 0.5
+        linhas_movimentacoes.append((
+            novo_id(),
+            "Entrada" if entrada else "Saída",
+            rng.randrange(50, 5000) * 100,
+            (HOJE - timedelta(days=rng.randrange(0, 720))).isoformat(),
+            "Recebimento de parcela" if entrada else "Liberação de empréstimo",
+            emprestimo[0] if emprestimo else "",
+            "benchmark",
+            versao,
+        ))
+
+    return {
+        "clientes": linhas_clientes,
+        "emprestimos": linhas_emprestimos,
+        "parcelas": linhas_parcelas,
+        "movimentacoes": linhas_movimentacoes,
+    }
@@ -0,0 +1,311 @@
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import caixa_saida
+from banco import transacao, fechar_todas
+from config import preparar_banco_local
+from esquema import conversor_para_nuvem
+from logs import configurar_logs, encerrar_logs
+from supabase_utils import TABELAS
+
+from benchmarks.carteira import gerar_carteira
+from benchmarks.supabase_local import SupabaseLocal
+
+# ==========================
+# 🔹 CENÁRIOS DE BENCHMARK
+# ==========================
+# Cada cenário roda `repeticoes` vezes sobre um banco SQLite temporário
+# (nunca o dados.db) com a carteira sintética, e a sincronização conversa
+# com o SupabaseLocal. Os tempos de cada repetição vão para o relatório
+# JSON, com mínimo, mediana, p95 e máximo, para comparar execução a execução.
+
+NOMES_TABELAS = ["clientes", "emprestimos", "parcelas", "movimentacoes"]
+BUSCAS = ["silva", "ana sou", "fortaleza", "9", "rua das flores 12"]
+
+
+def _resumo(tempos_ms, **extras):
+    ordenados = sorted(tempos_ms)
+    p95 = ordenados[min(len(ordenados) - 1, round(0.95 * (len(ordenados) - 1)))]
+    return {
+        "repeticoes": len(tempos_ms),
+        "ms": [round(t, 3) for t in tempos_ms],
+        "min_ms": round(ordenados[0], 3),
+        "mediana_ms": round(statistics.median(ordenados), 3),
+        "p95_ms": round(p95, 3),
+        "max_ms": round(ordenados[-1], 3),
+        **extras,
+    }
+
+
+class Benchmark:
+    """
+    Monta o ambiente (banco temporário + Supabase local), roda os cenários e
+    devolve o relatório. Uso: Benchmark(...).executar() -> dict.
+    """
+
+    def __init__(self, clientes=2000, emprestimos_por_cliente=2, parcelas_por_emprestimo=12,
+                 movimentacoes=2000, repeticoes=5, semente=1, latencia=0.0, nivel_log="WARNING"):
+        self.parametros = {
+            "clientes": clientes,
+            "emprestimos_por_cliente": emprestimos_por_cliente,
+            "parcelas_por_emprestimo": parcelas_por_emprestimo,
+            "movimentacoes": movimentacoes,
+            "repeticoes": repeticoes,
+            "semente": semente,
+            "latencia_s": latencia,
+        }
+        self.repeticoes = repeticoes
+        self.nivel_log = nivel_log
+        self.supabase = SupabaseLocal(latencia)
+        self.resultados = {}
+
+    # ==========================
+    # 🔹 Medição
+    # ==========================
+    def medir(self, nome, executar, preparar=None, repeticoes=None, **extras):
+        """Roda `executar` várias vezes (com `preparar` antes, fora do tempo)."""
+        tempos = []
+        for _ in range(repeticoes or self.repeticoes):
+            if preparar:
+                preparar()
+            inicio = time.perf_counter()
+            executar()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        self.resultados[nome] = _resumo(tempos, **extras)
+        print(f"⏱ {nome}: mediana {self.resultados[nome]['mediana_ms']:.1f} ms", file=sys.stderr)
+
+    # ==========================
+    # 🔹 Ambiente
+    # ==========================
+    def _preparar_ambiente(self, pasta):
+        os.environ["AGIOTA_BANCO"] = os.path.join(pasta, "benchmark.db")
+        fechar_todas()
+        preparar_banco_local()
+
+        p = self.parametros
+        self.carteira = gerar_carteira(
+            p["clientes"], p["emprestimos_por_cliente"], p["parcelas_por_emprestimo"],
+            p["movimentacoes"], p["semente"],
+        )
+        with transacao() as conn:
+            for nome in NOMES_TABELAS:
+                config = TABELAS[nome]
+                colunas = config["campos"] + [config["versao"]]
+                conn.executemany(
+                    f"INSERT INTO {config['local']} ({', '.join(colunas)}) "
+                    f"VALUES ({', '.join(['?'] * len(colunas))})",
+                    self.carteira[nome],
+                )
+
+        # A nuvem começa com a mesma carteira, no formato dela (texto de exibição)
+        for nome in NOMES_TABELAS:
+            config = TABELAS[nome]
+            colunas = config["campos"] + [config["versao"]]
+            converter = conversor_para_nuvem(config["local"], colunas)
+            self.supabase.carregar(nome, (dict(zip(colunas, converter(l))) for l in self.carteira[nome]))
+
+    # ==========================
+    # 🔹 Cenários
+    # ==========================
+    def cenario_carga(self):
+        from clientes import carregar_clientes
+        from emprestimos import carregar_emprestimos
+        from parcelas import carregar_parcelas
+        from movimentacoes import carregar_movimentacoes
+
+        carregar = {
+            "clientes": carregar_clientes, "emprestimos": carregar_emprestimos,
+            "parcelas": carregar_parcelas, "movimentacoes": carregar_movimentacoes,
+        }
+        for nome, func in carregar.items():
+            self.medir(f"carga.{nome}", func, linhas=len(self.carteira[nome]))
+        self.medir("carga.total", lambda: [func() for func in carregar.values()])
+
+    def cenario_salvamento(self):
+        from persistencia import fila_gravacao
+        from rastreio import ListaRastreada
+        from clientes import carregar_clientes
+        from emprestimos import carregar_emprestimos
+        from parcelas import carregar_parcelas
+        from movimentacoes import carregar_movimentacoes
+
+        # As listas em memória podem não ter sido carregadas (cenário avulso)
+        listas = {
+            "clientes": carregar_clientes(), "emprestimos": carregar_emprestimos(),
+            "parcelas": carregar_parcelas(), "movimentacoes": carregar_movimentacoes(),
+        }
+        clientes = listas["clientes"]
+        # Salvamento completo: todas as linhas marcadas como alteradas
+        def todas_alteradas(lista):
+            rastreada = ListaRastreada()
+            rastreada.extend(lista)
+            return rastreada
+
+        self.medir(
+            "salvamento.completo",
+            lambda: fila_gravacao.gravar(**{nome: todas_alteradas(lista) for nome, lista in listas.items()}),
+            linhas=sum(len(lista) for lista in listas.values()),
+        )
+
+        # Uma edição de cliente, salva como a tela faz (só o que mudou)
+        contador = iter(range(10 ** 9))
+
+        def editar():
+            i = next(contador) % len(clientes)
+            clientes[i] = clientes[i]._replace(telefone=f"(85) 9{next(contador):08d}")
+
+        self.medir("salvamento.uma_edicao", lambda: fila_gravacao.gravar(**listas), preparar=editar)
+
+    def cenario_interface(self):
+        from PySide6.QtWidgets import QApplication
+
+        app = QApplication.instance() or QApplication([])
+        from main import ModernWindow
+        from emprestimos import emprestimos
+        from ui.parcelas_ui import ParcelasWindow
+
+        janela = ModernWindow()
+        janela.show_search_screen()
+
+        # Busca por texto (FTS) e filtro de cidade, pelo mesmo caminho da tela
+        buscas = iter(BUSCAS * self.repeticoes)
+
+        def digitar():
+            janela.inp_busca.blockSignals(True)
+            janela.inp_busca.setText(next(buscas))
+            janela.inp_busca.blockSignals(False)
+
+        self.medir("busca.texto", janela.apply_search_filters, preparar=digitar,
+                   repeticoes=len(BUSCAS) * self.repeticoes)
+
+        cidades = iter(janela.modelos_filtro["cidade"].stringList()[1:] * self.repeticoes)
+
+        def escolher_cidade():
+            janela.clear_search_filters()
+            janela.cb_cidade.blockSignals(True)
+            janela.cb_cidade.setCurrentText(next(cidades))
+            janela.cb_cidade.blockSignals(False)
+
+        self.medir("busca.filtro_cidade", janela.apply_search_filters, preparar=escolher_cidade)
+
+        # Abrir as parcelas de um empréstimo (lidas do índice em memória)
+        ids = iter([e[0] for e in emprestimos] * 2)
+        janelas = []
+
+        def abrir():
+            janelas.append(ParcelasWindow({"id": next(ids)}))
+
+        def fechar_janelas():
+            for aberta in janelas:
+                aberta.deleteLater()
+            janelas.clear()
+
+        self.medir("parcelas.abrir", abrir, preparar=fechar_janelas)
+        fechar_janelas()
+
+        janela.deleteLater()
+        app.processEvents()
+
+    def cenario_sincronizacao(self):
+        from sincronizacao import baixar_tudo, enviar_tudo
+
+        def zerar_marcas():
+            with transacao() as conn:
+                conn.execute("DELETE FROM sincronizacao")
+                conn.execute("DELETE FROM caixa_saida")
+                conn.execute("DELETE FROM resumos_nuvem")
+
+        def tudo_pendente():
+            # Toda a carteira na caixa de saída, como se nunca tivesse sido enviada
+            zerar_marcas()
+            with transacao() as conn:
+                for nome in NOMES_TABELAS:
+                    caixa_saida.registrar(conn, nome, (linha[0] for linha in self.carteira[nome]))
+
+        def esvaziar_local():
+            zerar_marcas()
+            with transacao() as conn:
+                for nome in NOMES_TABELAS:
+                    conn.execute(f"DELETE FROM {TABELAS[nome]['local']}")
+
+        removiveis = iter(linha[0] for linha in self.carteira["movimentacoes"])
+
+        def remover_uma():
+            # Uma movimentação apagada localmente, à espera do envio
+            chave = next(removiveis)
+            with transacao() as conn:
+                conn.execute(f"DELETE FROM {TABELAS['movimentacoes']['local']} WHERE id = ?", (chave,))
+                caixa_saida.registrar(conn, "movimentacoes", [chave], caixa_saida.REMOVER)
+
+        def remover_e_baixar():
+            # Apagar na nuvem e baixar logo depois, na mesma conexão com o servidor
+            envio, download = enviar_tudo(), baixar_tudo()
+            if not all(envio.values()) or None in download.values():
+                raise RuntimeError(f"sincronização falhou: envio {envio}, download {download}")
+
+        requisicoes = {}
+
+        def contando(nome, func):
+            # Quantas requisições cada cenário faz à nuvem
+            def executar():
+                antes = self.supabase.requisicoes
+                func()
+                requisicoes[nome] = self.supabase.requisicoes - antes
+            return executar
+
+        total = sum(len(self.carteira[nome]) for nome in NOMES_TABELAS)
+        cenarios = [
+            ("sincronizacao.download_completo", baixar_tudo, esvaziar_local),
+            ("sincronizacao.envio_completo", enviar_tudo, tudo_pendente),
+            ("sincronizacao.sem_alteracoes", lambda: (baixar_tudo(), enviar_tudo()), None),
+            ("sincronizacao.remocao_e_download", remover_e_baixar, remover_uma),
+        ]
+        for nome, func, preparar in cenarios:
+            self.medir(nome, contando(nome, func), preparar=preparar, linhas=total)
+            self.resultados[nome]["requisicoes"] = requisicoes[nome]
+
+    # ==========================
+    # 🔹 Execução
+    # ==========================
+    def executar(self, cenarios=None):
+        """Roda os cenários (todos, por padrão) e devolve o relatório."""
+        todos = {
+            "carga": self.cenario_carga,
+            "salvamento": self.cenario_salvamento,
+            "interface": self.cenario_interface,
+            "sincronizacao": self.cenario_sincronizacao,
+        }
+        banco_anterior = os.environ.get("AGIOTA_BANCO")
+        with tempfile.TemporaryDirectory(prefix="agiota_benchmark_") as pasta, self.supabase:
+            # Log no nível pedido (padrão: só avisos, que escrever custa tempo)
+            configurar_logs(pasta, self.nivel_log)
+            try:
+                self._preparar_ambiente(pasta)
+                for nome in cenarios or todos:
+                    todos[nome]()
+            finally:
+                from persistencia import fila_gravacao
+                fila_gravacao.esperar(30)
+                fechar_todas()
+                encerrar_logs()
+                if banco_anterior is None:
+                    os.environ.pop("AGIOTA_BANCO", None)
+                else:
+                    os.environ["AGIOTA_BANCO"] = banco_anterior
+
+        return {
+            "gerado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "ambiente": {
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "plataforma": platform.platform(),
+            },
+            "parametros": self.parametros,
+            "cenarios": self.resultados,
+        }
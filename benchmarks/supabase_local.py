@@ -0,0 +1,260 @@
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from itertools import islice
+from urllib.parse import urlsplit, parse_qsl
+
+import supabase_utils
+from supabase_utils import TABELAS
+
+# ==========================
+# 🔹 SUPABASE LOCAL (substituto da API REST)
+# ==========================
+# Servidor HTTP em memória que responde como o PostgREST do Supabase, só no
+# que o supabase_utils usa: GET /rest/v1/<tabela> com select, filtros
+# (coluna=gt.valor, gte, lt, lte, eq, is.null e or=(...) com and(...)
+# aninhado, como na paginação por (versão, chave)), order, offset e
+# limit; POST com
+# upsert (on_conflict); e DELETE com coluna=in.(a,b,...). O cliente oficial do supabase conversa com ele
+# normalmente, então o benchmark mede o caminho real (HTTP + JSON).
+# `latencia` (segundos) é somada a cada requisição para simular a rede.
+
+_OPERADORES = {
+    "eq": lambda a, b: a == b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+def _partes(texto):
+    """Divide "a,and(b,c),d" nas vírgulas de fora dos parênteses e das aspas."""
+    partes, atual, nivel, aspas = [], "", 0, False
+    for i, ch in enumerate(texto):
+        if ch == '"' and (i == 0 or texto[i - 1] != "\\"):
+            aspas = not aspas
+        elif not aspas and ch == "(":
+            nivel += 1
+        elif not aspas and ch == ")":
+            nivel -= 1
+        elif not aspas and nivel == 0 and ch == ",":
+            partes.append(atual)
+            atual = ""
+            continue
+        atual += ch
+    return partes + [atual]
+
+
+def _sem_aspas(valor):
+    if len(valor) >= 2 and valor[0] == valor[-1] == '"':
+        return valor[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return valor
+
+
+def _condicao(texto):
+    """Filtro lógico do PostgREST ("and(...)", "or(...)" ou "coluna.op.valor") -> função."""
+    for logico, juntar in (("and", all), ("or", any)):
+        if texto.startswith(logico + "("):
+            condicoes = [_condicao(p) for p in _partes(texto[len(logico) + 1:-1])]
+            return lambda r: juntar(c(r) for c in condicoes)
+    coluna, operador, valor = texto.split(".", 2)
+    return _filtro(coluna, operador, _sem_aspas(valor))
+
+
+def _filtro(coluna, operador, valor):
+    if operador == "is":
+        return lambda r: r.get(coluna) is None
+    comparar = _OPERADORES[operador]
+    return lambda r: r.get(coluna) is not None and comparar(r[coluna], valor)
+
+
+def _primeira_que_passa(registros, condicao):
+    """Busca binária: a condição é falsa até um ponto da ordem e verdadeira dali em diante."""
+    inicio, fim = 0, len(registros)
+    while inicio < fim:
+        meio = (inicio + fim) // 2
+        if condicao(registros[meio]):
+            fim = meio
+        else:
+            inicio = meio + 1
+    return inicio
+
+
+class SupabaseLocal:
+    def __init__(self, latencia=0.0):
+        self.latencia = latencia
+        self.requisicoes = 0
+        self._tabelas = {}     # tabela remota -> {chave: registro}
+        self._ordenadas = {}   # (tabela, ordem) -> registros ordenados
+        self._lock = threading.Lock()
+        self._servidor = None
+
+    # ==========================
+    # 🔹 Dados
+    # ==========================
+    def carregar(self, nome, registros):
+        """Substitui o conteúdo de uma tabela (registros no formato da nuvem)."""
+        config = TABELAS[nome]
+        with self._lock:
+            self._tabelas[config["remota"]] = {r[config["chave"]]: dict(r) for r in registros}
+            self._ordenadas.clear()
+
+    def quantidade(self, nome):
+        return len(self._tabelas.get(TABELAS[nome]["remota"], {}))
+
+    def _chave_da_tabela(self, remota):
+        return next(c["chave"] for c in TABELAS.values() if c["remota"] == remota)
+
+    def _ordenados(self, remota, ordem):
+        ordenados = self._ordenadas.get((remota, ordem))
+        if ordenados is None:
+            registros = list(self._tabelas.get(remota, {}).values())
+            for coluna, decrescente in reversed(ordem):
+                registros.sort(key=lambda r: (r.get(coluna) is None, r.get(coluna) or ""),
+                               reverse=decrescente)
+            ordenados = self._ordenadas[(remota, ordem)] = registros
+        return ordenados
+
+    def consultar(self, remota, parametros):
+        colunas = [c for c in parametros.pop("select", "*").split(",") if c]
+        ordem = tuple(
+            (partes[0], len(partes) > 1 and partes[1] == "desc")
+            for partes in (o.split(".") for o in parametros.pop("order", "").split(",") if o)
+        )
+        inicio = int(parametros.pop("offset", 0))
+        limite = parametros.pop("limit", None)
+        filtros = []  # (condição, True se só corta o começo da ordem)
+        for coluna, expressao in parametros.items():
+            if coluna == "or":
+                # Paginação por (versão, chave): "depois do último par visto"
+                filtros.append((_condicao(f"or{expressao}"), True))
+                continue
+            operador, _, valor = expressao.partition(".")
+            if operador in _OPERADORES or operador == "is":
+                em_ordem = bool(ordem) and (coluna, operador) == (ordem[0][0], "gt") and not ordem[0][1]
+                filtros.append((_filtro(coluna, operador, valor), em_ordem))
+
+        with self._lock:
+            registros = self._ordenados(remota, ordem)
+            comeco = 0
+            for condicao, em_ordem in filtros:
+                if em_ordem:
+                    # Nulos ficam no fim da ordem: contam como "passa" só para
+                    # a busca binária achar o começo; o filtro abaixo os confere
+                    coluna = ordem[0][0]
+                    comeco = max(comeco, _primeira_que_passa(
+                        registros, lambda r, c=condicao: r.get(coluna) is None or c(r)))
+            fim = None if limite is None else inicio + int(limite)
+            pagina = list(islice(
+                (r for r in map(registros.__getitem__, range(comeco, len(registros))) if all(c(r) for c, _ in filtros)),
+                inicio, fim
+            ))
+            if colunas != ["*"]:
+                pagina = [{c: r.get(c) for c in colunas} for r in pagina]
+            else:
+                pagina = [dict(r) for r in pagina]
+        return pagina
+
+    def gravar(self, remota, parametros, registros):
+        chave = parametros.get("on_conflict") or self._chave_da_tabela(remota)
+        with self._lock:
+            tabela = self._tabelas.setdefault(remota, {})
+            for registro in registros:
+                existente = tabela.get(registro[chave])
+                if existente is None:
+                    tabela[registro[chave]] = dict(registro)
+                else:
+                    existente.update(registro)
+            self._ordenadas = {k: v for k, v in self._ordenadas.items() if k[0] != remota}
+        return registros
+
+    def remover(self, remota, parametros):
+        chave = self._chave_da_tabela(remota)
+        operador, _, valores = parametros.get(chave, "").partition(".")
+        if operador != "in":
+            return []
+        chaves = [v.strip('"') for v in valores.strip("()").split(",") if v]
+        with self._lock:
+            tabela = self._tabelas.setdefault(remota, {})
+            removidos = [tabela.pop(c) for c in chaves if c in tabela]
+            self._ordenadas = {k: v for k, v in self._ordenadas.items() if k[0] != remota}
+        return removidos
+
+    # ==========================
+    # 🔹 Servidor
+    # ==========================
+    def iniciar(self):
+        """Sobe o servidor numa porta livre e aponta o supabase_utils para ele."""
+        supabase = self
+
+        class Requisicao(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _responder(self, status, corpo):
+                dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def _rota(self):
+                # O corpo sempre é lido (o postgrest manda "{}" até no DELETE):
+                # sobras dele na conexão keep-alive estragariam a próxima requisição
+                self.corpo = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                url = urlsplit(self.path)
+                remota = url.path.rstrip("/").rsplit("/", 1)[-1]
+                supabase.requisicoes += 1
+                if supabase.latencia:
+                    time.sleep(supabase.latencia)
+                return remota, dict(parse_qsl(url.query))
+
+            def do_GET(self):
+                remota, parametros = self._rota()
+                self._responder(200, supabase.consultar(remota, parametros))
+
+            def do_POST(self):
+                remota, parametros = self._rota()
+                corpo = json.loads(self.corpo)
+                registros = corpo if isinstance(corpo, list) else [corpo]
+                self._responder(201, supabase.gravar(remota, parametros, registros))
+
+            def do_DELETE(self):
+                remota, parametros = self._rota()
+                self._responder(200, supabase.remover(remota, parametros))
+
+            def log_message(self, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), Requisicao)
+        self._servidor.daemon_threads = True
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+
+        # O cliente do supabase_utils é criado na primeira sincronização, com
+        # estas variáveis (o .env não sobrepõe variáveis já definidas); as
+        # credenciais guardadas são descartadas para serem lidas de novo
+        os.environ["SUPABASE_URL"] = self.url
+        os.environ["SUPABASE_KEY"] = "chave-local"
+        supabase_utils._cliente = supabase_utils._credenciais = None
+        return self
+
+    @property
+    def url(self):
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def parar(self):
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+        supabase_utils._cliente = supabase_utils._credenciais = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
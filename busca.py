@@ -0,0 +1,62 @@
+import re
+
+from banco import get_conexao
+
+# ==========================
+# 🔹 BUSCA DE CLIENTES POR TEXTO (FTS5)
+# ==========================
+# Usa o índice clientes_busca (migração 4): nome, CPF, telefone, endereço,
+# cidade e indicação, sem diferenciar acentos e maiúsculas. Cada palavra
+# digitada vale como prefixo ("jo sil" acha "João da Silva") e todas
+# precisam aparecer. Os resultados vêm ordenados por relevância (bm25).
+#
+# Ordenar por relevância custa proporcional ao número de clientes que
+# casam. Buscas muito amplas (ex.: "jo" em 100 mil clientes) trazem os
+# primeiros LIMITE_RESULTADOS na ordem do cadastro; a partir de poucas
+# letras o resultado já é pequeno e vem ranqueado em poucos milissegundos.
+#
+# A busca roda a cada tecla, na thread da tela, e não espera a fila de
+# gravação: consulta o que já está no banco. Quem acabou de salvar um
+# cliente e precisa dele no resultado espera a fila antes de buscar.
+
+LIMITE_RESULTADOS = 500
+RANQUEAR_ATE = 1000
+
+_PALAVRA = re.compile(r"\w+")
+
+_BUSCAR = """
+    SELECT c.id_cliente
+    FROM clientes_busca
+    JOIN clientes c ON c.rowid = clientes_busca.rowid
+    WHERE clientes_busca MATCH ?
+    LIMIT ?
+"""
+_BUSCAR_RANQUEADO = """
+    SELECT c.id_cliente
+    FROM clientes_busca
+    JOIN clientes c ON c.rowid = clientes_busca.rowid
+    WHERE clientes_busca MATCH ?
+    ORDER BY rank
+    LIMIT ?
+"""
+
+
+def consulta_fts(texto):
+    """Texto digitado -> consulta FTS5 com cada palavra como prefixo ("" se não há palavras)."""
+    return " ".join(f'"{palavra}"*' for palavra in _PALAVRA.findall(texto))
+
+
+def buscar_clientes(texto, limite=LIMITE_RESULTADOS):
+    """
+    IDs dos clientes que casam com `texto`, do mais ao menos relevante.
+    Texto sem palavras devolve None (sem busca: todos os clientes).
+    """
+    consulta = consulta_fts(texto)
+    if not consulta:
+        return None
+
+    conn = get_conexao()
+    ids = [linha[0] for linha in conn.execute(_BUSCAR, (consulta, RANQUEAR_ATE + 1))]
+    if len(ids) > RANQUEAR_ATE:
+        return ids[:limite]  # busca ampla: sem ranquear
+    return [linha[0] for linha in conn.execute(_BUSCAR_RANQUEADO, (consulta, limite))]
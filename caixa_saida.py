@@ -0,0 +1,72 @@
+from banco import get_conexao, agora_iso
+
+# ==========================
+# 🔹 CAIXA DE SAÍDA (alterações locais ainda não enviadas)
+# ==========================
+# Toda gravação local nas tabelas de dados anota aqui, na mesma transação,
+# a chave da linha e a operação (gravar ou remover). Uma chave tem no
+# máximo uma entrada por tabela: a mais recente vale. A entrada só sai
+# quando a nuvem confirma o envio, e apenas se a linha não mudou de novo
+# nesse meio-tempo (o carimbo registrado_em é conferido).
+#
+# Como a tabela fica no SQLite, nada se perde se o programa fechar ou cair
+# antes do envio. O download também consulta a caixa: linha com alteração
+# local pendente não é sobrescrita pela versão da nuvem.
+
+GRAVAR = "gravar"
+REMOVER = "remover"
+
+
+def registrar(conn, nome, chaves, operacao=GRAVAR, carimbo=None):
+    """Anota as chaves alteradas (ou removidas) da tabela. Use dentro da transação da gravação."""
+    carimbo = carimbo or agora_iso()
+    conn.executemany(
+        "INSERT OR REPLACE INTO caixa_saida (tabela, chave, operacao, registrado_em) VALUES (?, ?, ?, ?)",
+        ((nome, chave, operacao, carimbo) for chave in chaves)
+    )
+
+
+def pendentes(nome, operacao, limite, ate=None, conn=None):
+    """
+    Próximas entradas da tabela com a operação dada, das mais antigas para as
+    mais novas: [(chave, registrado_em)]. `ate` ignora as registradas depois.
+    """
+    conn = conn or get_conexao()
+    sql = "SELECT chave, registrado_em FROM caixa_saida WHERE tabela = ? AND operacao = ?"
+    parametros = [nome, operacao]
+    if ate:
+        sql += " AND registrado_em <= ?"
+        parametros.append(ate)
+    sql += " ORDER BY registrado_em, chave LIMIT ?"
+    return conn.execute(sql, parametros + [limite]).fetchall()
+
+
+def confirmar(conn, nome, entradas):
+    """Retira as entradas enviadas, exceto as que foram registradas de novo depois."""
+    conn.executemany(
+        "DELETE FROM caixa_saida WHERE tabela = ? AND chave = ? AND registrado_em = ?",
+        ((nome, chave, carimbo) for chave, carimbo in entradas)
+    )
+
+
+def descartar(conn, nome, chaves):
+    """Retira as entradas das chaves, sem enviar (ex.: a versão da nuvem venceu o conflito)."""
+    conn.executemany(
+        "DELETE FROM caixa_saida WHERE tabela = ? AND chave = ?",
+        ((nome, chave) for chave in chaves)
+    )
+
+
+def anotar_falha(conn, nome, entradas, erro):
+    conn.executemany(
+        "UPDATE caixa_saida SET tentativas = tentativas + 1, erro = ? WHERE tabela = ? AND chave = ?",
+        ((str(erro), nome, chave) for chave, _ in entradas)
+    )
+
+
+def quantidade(nome=None, conn=None):
+    """Quantas alterações locais ainda não chegaram à nuvem (de uma tabela ou de todas)."""
+    conn = conn or get_conexao()
+    if nome:
+        return conn.execute("SELECT COUNT(*) FROM caixa_saida WHERE tabela = ?", (nome,)).fetchone()[0]
+    return conn.execute("SELECT COUNT(*) FROM caixa_saida").fetchone()[0]
@@ -1,55 +1,28 @@
-import sqlite3
-from supabase_utils import baixar_clientes, enviar_clientes
-from config import get_local_db_path
-
-# Lista que vai guardar os clientes em memória
-clientes = []
+from supabase_utils import TABELAS
+from banco import get_conexao
+from persistencia import fila_gravacao
+from instrumentacao import medido
+from repositorio import Tabela, Cliente
+from esquema import conversor_do_banco
+
+# Colunas na ordem das tuplas em memória (a coluna de versão fica só no banco)
+SELECT_CLIENTES = f"SELECT {', '.join(TABELAS['clientes']['campos'])} FROM clientes"
+# Centavos -> Dinheiro e datas ISO -> DD/MM/AAAA
+_do_banco = conversor_do_banco("clientes", TABELAS["clientes"]["campos"])
+
+# Clientes em memória (sempre o mesmo objeto; recarregar troca o conteúdo),
+# com os valores distintos dos campos usados nos filtros da busca
+clientes = Tabela(Cliente, facetas=("nome", "cidade", "indicacao"))
 
 # 🔹 Função para carregar os clientes do banco local
-def carregar_clientes():    
-    conn = sqlite3.connect(get_local_db_path())
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM clientes")
-    clientes_db = cursor.fetchall()
-    conn.close()    
-
-    # Atualiza a variável global
-    global clientes
-    clientes = clientes_db
-
-    # E também retorna a lista, caso alguém queira usar
-    return clientes_db
+@medido()
+def carregar_clientes():
+    clientes.recarregar(map(_do_banco, get_conexao().execute(SELECT_CLIENTES)))
+    return clientes
 
 
 # 🔹 Função para salvar os clientes no banco local (agora recebe a lista como argumento)
+@medido()
 def salvar_clientes(lista_clientes):
-    conn = sqlite3.connect(get_local_db_path())
-    cur = conn.cursor()
-
-    # Limpa a tabela antes de salvar os dados atualizados
-    cur.execute("DELETE FROM clientes")
-
-    for cliente in lista_clientes:
-        cur.execute("""
-            INSERT INTO clientes (
-                id_cliente, nome, cpf, telefone, endereco, cidade, indicacao
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, cliente)
-
-    conn.commit()
-
-    # 🔹 Debug: conferir se realmente gravou
-    cur.execute("SELECT * FROM clientes")    
-
-    conn.close()
-
-
-# 🔹 Função para baixar clientes da nuvem (Supabase)
-def sincronizar_clientes_download():
-    global clientes
-    clientes = baixar_clientes()
-
-# 🔹 Função para enviar clientes para a nuvem (Supabase)
-def sincronizar_clientes_upload():
-    global clientes
-    enviar_clientes(clientes)
+    # A lista rastreada grava só os clientes alterados e removidos
+    fila_gravacao.gravar(clientes=lista_clientes)
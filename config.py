@@ -1,17 +1,64 @@
 import os
 import sqlite3
+import sys
+
+from migracoes import aplicar_migracoes, versao_banco, VERSAO_ATUAL
+from logs import get_logger
+
+log = get_logger(__name__)
+
+TABELAS_ESPERADAS = ["clientes", "emprestimos", "parcelas", "movimentacoes"]
 
 
 def get_local_db_path():
-    return os.path.join(os.path.dirname(__file__), "dados.db")
+    # AGIOTA_BANCO aponta para outro arquivo (ex.: benchmarks com dados sintéticos)
+    return os.environ.get("AGIOTA_BANCO") or os.path.join(os.path.dirname(__file__), "dados.db")
+
+
+def resource_path(relative_path):
+    """Obtém o caminho do recurso (funciona no .exe e no modo normal)."""
+    try:
+        # PyInstaller cria uma pasta temporária e guarda tudo lá
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+
+    return os.path.join(base_path, relative_path)
+
+
+def _abrir():
+    # autocommit: as migrações controlam as próprias transações
+    return sqlite3.connect(get_local_db_path(), isolation_level=None)
+
+
+def preparar_banco_local():
+    """
+    Passo único de esquema na inicialização, com uma só conexão: se o
+    banco já está na versão atual, apenas confere as tabelas; senão cria
+    o que faltar e aplica as migrações.
+    """
+    conn = _abrir()
+    try:
+        if versao_banco(conn) != VERSAO_ATUAL:
+            _criar_tabelas(conn)
+        verificar_tabelas(conn)
+    finally:
+        conn.close()
 
 
 def criar_tabelas_local():
     """
-    Usado apenas no desenvolvimento, para criar as tabelas locais
-    caso o banco ainda não exista.
+    Cria as tabelas locais caso o banco ainda não exista e aplica as
+    migrações pendentes do esquema (bancos antigos são migrados no lugar).
     """
-    conn = sqlite3.connect(get_local_db_path())
+    conn = _abrir()
+    try:
+        _criar_tabelas(conn)
+    finally:
+        conn.close()
+
+
+def _criar_tabelas(conn):
     cur = conn.cursor()
 
     # 🔹 Tabela clientes
@@ -23,7 +70,8 @@ def criar_tabelas_local():
             telefone TEXT,
             endereco TEXT,
             cidade TEXT,
-            indicacao TEXT
+            indicacao TEXT,
+            atualizado_em TEXT
         )
     """)
 
@@ -32,29 +80,30 @@ def criar_tabelas_local():
         CREATE TABLE IF NOT EXISTS emprestimos (
             id TEXT PRIMARY KEY,
             id_cliente TEXT,
-            valor TEXT,
+            valor INTEGER,
             data_inicio TEXT,
             parcelas TEXT,
-            observacao TEXT
+            observacao TEXT,
+            atualizado_em TEXT
         )
     """)
 
-    # 🔹 Tabela parcelas
-        # 🔹 Tabela parcelas (atualizada com novos campos)
+    # 🔹 Tabela parcelas (dinheiro em centavos, datas AAAA-MM-DD)
     cur.execute("""
         CREATE TABLE IF NOT EXISTS parcelas (
             id TEXT PRIMARY KEY,
             id_emprestimo TEXT,
             numero TEXT,
-            valor TEXT,
+            valor INTEGER,
             vencimento TEXT,
-            juros TEXT,
-            desconto TEXT,
-            parcela_atualizada TEXT,
-            valor_pago TEXT,
-            residual TEXT,
+            juros INTEGER,
+            desconto INTEGER,
+            parcela_atualizada INTEGER,
+            valor_pago INTEGER,
+            residual INTEGER,
             pago TEXT,
-            data_pagamento TEXT
+            data_pagamento TEXT,
+            atualizado_em TEXT
         )
     """)
 
@@ -64,35 +113,46 @@ def criar_tabelas_local():
         CREATE TABLE IF NOT EXISTS movimentacoes (
             id TEXT PRIMARY KEY,
             tipo TEXT,
-            valor TEXT,
+            valor INTEGER,
             data TEXT,
             descricao TEXT,
             id_relacionado TEXT,
-            origem TEXT
+            origem TEXT,
+            atualizado_em TEXT
         )
     """)
 
-    conn.commit()
-    conn.close()
+    # 🔹 Marcas d'água da sincronização incremental com o Supabase
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS sincronizacao (
+            tabela TEXT PRIMARY KEY,
+            ultimo_download TEXT,
+            ultimo_envio TEXT
+        )
+    """)
 
+    # 🔹 Esquema versionado: tipos, índices etc. (migra bancos antigos no lugar)
+    aplicar_migracoes(conn)
 
-def verificar_tabelas():
+
+def verificar_tabelas(conn=None):
     """
     Usado no dia a dia: apenas checa se as tabelas mínimas existem.
     Se faltar alguma, gera erro e o programa não continua.
     """
-    conn = sqlite3.connect(get_local_db_path())
+    propria = conn is None
+    if propria:
+        conn = sqlite3.connect(get_local_db_path())
     cur = conn.cursor()
 
-    esperadas = ["clientes", "emprestimos", "parcelas", "movimentacoes"]
-
     cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
     existentes = {row[0] for row in cur.fetchall()}
 
-    faltando = [t for t in esperadas if t not in existentes]
-    conn.close()
+    faltando = [t for t in TABELAS_ESPERADAS if t not in existentes]
+    if propria:
+        conn.close()
 
     if faltando:
         raise RuntimeError(f"⚠ Banco local inválido! Tabelas ausentes: {faltando}")
     else:
-        print("✅ Banco local OK, todas as tabelas estão presentes.")
+        log.info("✅ Banco local OK, todas as tabelas estão presentes.")
@@ -0,0 +1,143 @@
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import total_ordering
+
+# ==========================
+# 🔹 DINHEIRO (centavos inteiros)
+# ==========================
+# Todo valor monetário do sistema é um Dinheiro: um inteiro de centavos,
+# com aritmética exata. O texto "R$ 1.234,56" só existe na tela e na
+# nuvem; é gerado por formatar() e lido por centavos_de_texto().
+
+_MILHAR = re.compile(r"\d{1,3}(\.\d{3})+")
+_UM = Decimal(1)
+_CEM = Decimal(100)
+
+
+def _arredondar(reais):
+    """Decimal em reais -> centavos (int), arredondando meio para cima."""
+    return int((reais * _CEM).quantize(_UM, rounding=ROUND_HALF_UP))
+
+
+def centavos_de_texto(texto):
+    """
+    Lê "R$ 1.234,56", "1234,56", "1234.56", "1.234" etc. e devolve centavos.
+    Texto vazio devolve None; texto que não é valor levanta ValueError.
+    """
+    txt = texto.replace("R$", "").replace("\xa0", "").replace(" ", "")
+    if not txt:
+        return None
+
+    if "," in txt:
+        # formato brasileiro: ponto é milhar, vírgula é decimal
+        txt = txt.replace(".", "").replace(",", ".")
+    elif txt.count(".") > 1 or _MILHAR.fullmatch(txt.lstrip("-")):
+        # "1.234" / "1.234.567": só separadores de milhar
+        txt = txt.replace(".", "")
+
+    try:
+        return _arredondar(Decimal(txt))
+    except InvalidOperation:
+        raise ValueError(f"valor monetário inválido: {texto!r}")
+
+
+def formatar(centavos):
+    """Centavos (int) -> "R$ 1.234,56"."""
+    reais, cents = divmod(abs(centavos), 100)
+    sinal = "-" if centavos < 0 else ""
+    return f"{sinal}R$ {reais:,}".replace(",", ".") + f",{cents:02d}"
+
+
+@total_ordering
+class Dinheiro:
+    """Valor monetário exato em centavos. Imutável e comparável."""
+
+    __slots__ = ("_centavos",)
+
+    def __init__(self, centavos=0):
+        if not isinstance(centavos, int):
+            raise TypeError("Dinheiro espera centavos inteiros; use de_reais() ou de_texto()")
+        self._centavos = centavos
+
+    # ==========================
+    # 🔹 Construção
+    # ==========================
+    @classmethod
+    def de_reais(cls, valor):
+        """A partir de reais (int, float, Decimal ou texto numérico "1234.56")."""
+        if isinstance(valor, float):
+            valor = repr(valor)
+        return cls(_arredondar(Decimal(valor)))
+
+    @classmethod
+    def de_texto(cls, texto, padrao=None):
+        """A partir do texto em pt-BR ("R$ 1.234,56"). Vazio devolve `padrao`."""
+        centavos = centavos_de_texto(texto)
+        return padrao if centavos is None else cls(centavos)
+
+    # ==========================
+    # 🔹 Valores
+    # ==========================
+    @property
+    def centavos(self):
+        return self._centavos
+
+    @property
+    def reais(self):
+        return Decimal(self._centavos) / _CEM
+
+    def __str__(self):
+        return formatar(self._centavos)
+
+    def __repr__(self):
+        return f"Dinheiro({self._centavos})"
+
+    # ==========================
+    # 🔹 Aritmética
+    # ==========================
+    def __add__(self, outro):
+        if isinstance(outro, Dinheiro):
+            return Dinheiro(self._centavos + outro._centavos)
+        if outro == 0:  # permite sum() sem valor inicial
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        if isinstance(outro, Dinheiro):
+            return Dinheiro(self._centavos - outro._centavos)
+        return NotImplemented
+
+    def __neg__(self):
+        return Dinheiro(-self._centavos)
+
+    def __mul__(self, fator):
+        if isinstance(fator, int):
+            return Dinheiro(self._centavos * fator)
+        if isinstance(fator, float):
+            fator = Decimal(repr(fator))
+        if isinstance(fator, Decimal):
+            return Dinheiro(_arredondar(self.reais * fator))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    # ==========================
+    # 🔹 Comparação
+    # ==========================
+    def __eq__(self, outro):
+        if isinstance(outro, Dinheiro):
+            return self._centavos == outro._centavos
+        return NotImplemented
+
+    def __lt__(self, outro):
+        if isinstance(outro, Dinheiro):
+            return self._centavos < outro._centavos
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._centavos)
+
+    def __bool__(self):
+        return self._centavos != 0
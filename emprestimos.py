@@ -1,46 +1,39 @@
-import sqlite3
 import uuid
-from supabase_utils import baixar_emprestimos, enviar_emprestimos
-from config import get_local_db_path
+from supabase_utils import TABELAS
+from banco import get_conexao
+from persistencia import fila_gravacao
+from instrumentacao import medido
+from logs import get_logger
+from repositorio import Tabela, Emprestimo
+from esquema import conversor_do_banco
 
-# Lista que vai guardar os empréstimos em memória
-emprestimos = []
+log = get_logger(__name__)
+
+# Colunas na ordem das tuplas em memória (a coluna de versão fica só no banco)
+SELECT_EMPRESTIMOS = f"SELECT {', '.join(TABELAS['emprestimos']['campos'])} FROM emprestimos"
+# Centavos -> Dinheiro e datas ISO -> DD/MM/AAAA
+_do_banco = conversor_do_banco("emprestimos", TABELAS["emprestimos"]["campos"])
+
+# Empréstimos em memória, indexados também por cliente
+emprestimos = Tabela(Emprestimo, indices=("id_cliente",))
 
 
 # 🔹 Carregar empréstimos do banco local
+@medido()
 def carregar_emprestimos():
-    
-    conn = sqlite3.connect(get_local_db_path())
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM emprestimos")
-    dados = cur.fetchall()
-    conn.close()
+    emprestimos.recarregar(map(_do_banco, get_conexao().execute(SELECT_EMPRESTIMOS)))
+    return emprestimos
 
-    
 
-    global emprestimos
-    emprestimos = dados
-    return dados
+# 🔹 Empréstimos de um cliente (pelo índice, sem varrer a lista)
+def emprestimos_do_cliente(id_cliente):
+    return emprestimos.por("id_cliente", id_cliente)
 
 
-# 🔹 Salvar todos os empréstimos no banco local
+# 🔹 Salvar no banco local os empréstimos alterados desde o último salvamento
+@medido()
 def salvar_emprestimos():
-    global emprestimos
-    conn = sqlite3.connect(get_local_db_path())
-    cursor = conn.cursor()
-
-    for emprestimo in emprestimos:
-        # Garante que o ID nunca será nulo
-        if not emprestimo[0] or emprestimo[0] == "null":
-            emprestimo = (str(uuid.uuid4()),) + emprestimo[1:]
-
-        cursor.execute("""
-            INSERT OR REPLACE INTO emprestimos (id, id_cliente, valor, data_inicio, parcelas, observacao)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, emprestimo)
-
-    conn.commit()
-    conn.close()
+    fila_gravacao.gravar(emprestimos=emprestimos)
 
 
 
@@ -50,32 +43,11 @@ def adicionar_emprestimo(id_cliente, valor, data_inicio, parcelas, observacao=""
     Cria um novo empréstimo com UUID e salva no banco.
     Retorna o registro criado como tupla.
     """
-    global emprestimos
-
     novo_id = str(uuid.uuid4())
     novo_emprestimo = (novo_id, id_cliente, valor, data_inicio, parcelas, observacao)
 
-    emprestimos.append(novo_emprestimo)
+    novo_emprestimo = emprestimos.gravar_registro(novo_emprestimo)
     salvar_emprestimos()
 
-    print(f"✅ Novo empréstimo criado: {novo_emprestimo}")
+    log.info("✅ Novo empréstimo criado: %s", novo_emprestimo[0])
     return novo_emprestimo
-
-
-# 🔹 Baixar da nuvem
-def sincronizar_emprestimos_download():
-    global emprestimos
-    emprestimos = baixar_emprestimos()
-
-
-# 🔹 Enviar para a nuvem
-def sincronizar_emprestimos_upload():
-    global emprestimos
-    emprestimos_corrigidos = []
-    for e in emprestimos:
-        if not e[0] or e[0] == "null":
-            novo_id = str(uuid.uuid4())
-            e = (novo_id,) + e[1:]
-        emprestimos_corrigidos.append(e)
-    emprestimos = emprestimos_corrigidos
-    enviar_emprestimos(emprestimos)
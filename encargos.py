@@ -0,0 +1,117 @@
+import json
+from datetime import date
+
+from banco import get_conexao, transacao
+from persistencia import fila_gravacao
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# ==========================
+# 🔹 ENCARGOS POR ATRASO
+# ==========================
+# Recalcula, numa única passada no banco, todas as parcelas em aberto:
+# dias de atraso, juros (multa + mora pro rata), parcela atualizada e
+# residual. Tudo é feito por um único UPDATE dentro de uma transação, sem
+# trazer as linhas para o Python; só as parcelas cujos valores mudaram
+# são regravadas.
+#
+# São valores calculados, derivados da data de hoje: o UPDATE não mexe no
+# carimbo de versão nem anota a caixa de saída (senão toda parcela
+# vencida iria para a nuvem todo dia). Eles seguem para a nuvem junto com
+# a próxima alteração de verdade da parcela.
+#
+# Juros digitados à mão nunca são sobrescritos: a coluna local
+# juros_atraso guarda os últimos juros calculados aqui, e só parcelas sem
+# juros (vazio) ou com juros iguais a ela recebem os do atraso. Juros de
+# R$ 0,00 digitados (encargo perdoado) também ficam como estão.
+
+MULTA_ATRASO = 0.02      # 2% sobre o valor em aberto, uma vez
+JUROS_MORA_MES = 0.01    # 1% ao mês, cobrado por dia de atraso (mês de 30 dias)
+
+# Parcela em aberto: não marcada como paga e com valor definido
+_ABERTA = "COALESCE(pago, '') <> 'Sim' AND valor IS NOT NULL"
+
+# Expressões de cada coluna nova, sobre os valores atuais da linha. O
+# SQLite avalia o SET com os valores antigos, então elas podem se repetir
+# no WHERE para pular as parcelas que não mudam.
+_CALCULAR = """(julianday(vencimento) < julianday(:referencia)
+    AND (juros IS NULL OR juros IS juros_atraso))"""
+_JUROS_ATRASO = f"""(CASE
+    WHEN {_CALCULAR} THEN CAST(ROUND(
+        MAX(valor - COALESCE(valor_pago, 0), 0)
+        * (:multa + :mora_dia * (julianday(:referencia) - julianday(vencimento)))
+    ) AS INTEGER)
+    ELSE juros_atraso
+END)"""
+_JUROS = f"(CASE WHEN {_CALCULAR} THEN {_JUROS_ATRASO} ELSE juros END)"
+_ATUALIZADA = f"(valor + COALESCE({_JUROS}, 0) - COALESCE(desconto, 0))"
+_RESIDUAL = f"({_ATUALIZADA} - COALESCE(valor_pago, 0))"
+
+_ATUALIZAR = f"""
+    UPDATE parcelas
+    SET juros = {_JUROS},
+        juros_atraso = {_JUROS_ATRASO},
+        parcela_atualizada = {_ATUALIZADA},
+        residual = {_RESIDUAL}
+    WHERE {_ABERTA}
+      AND (juros IS NOT {_JUROS}
+           OR parcela_atualizada IS NOT {_ATUALIZADA}
+           OR residual IS NOT {_RESIDUAL})
+"""
+
+_SITUACAO = f"""
+    SELECT
+        id_emprestimo,
+        SUM({_ABERTA}),
+        MAX(CASE WHEN {_ABERTA} AND julianday(vencimento) < julianday(:referencia)
+                 THEN CAST(julianday(:referencia) - julianday(vencimento) AS INTEGER) END)
+    FROM parcelas
+    WHERE id_emprestimo IN (SELECT value FROM json_each(:ids))
+    GROUP BY id_emprestimo
+"""
+
+
+def _referencia(data_referencia):
+    return (data_referencia or date.today()).isoformat()
+
+
+def atualizar_encargos(data_referencia=None, multa=MULTA_ATRASO, juros_mora_mes=JUROS_MORA_MES):
+    """
+    Recalcula juros, parcela atualizada e residual de todas as parcelas em
+    aberto na data de referência (padrão: hoje). Retorna quantas mudaram.
+    """
+    parametros = {
+        "referencia": _referencia(data_referencia),
+        "multa": multa,
+        "mora_dia": juros_mora_mes / 30,
+    }
+    with transacao() as conn:
+        alteradas = conn.execute(_ATUALIZAR, parametros).rowcount
+    log.info("📅 Encargos por atraso: %d parcelas atualizadas.", alteradas)
+    return alteradas
+
+
+def situacao_emprestimos(ids_emprestimos, data_referencia=None):
+    """
+    Situação de cada empréstimo pelas parcelas:
+    id -> (texto, dias de atraso da parcela mais atrasada).
+    """
+    ids = list(ids_emprestimos)
+    if not ids:
+        return {}
+
+    fila_gravacao.esperar()  # parcelas recém-salvas precisam estar no banco
+    linhas = get_conexao().execute(
+        _SITUACAO, {"referencia": _referencia(data_referencia), "ids": json.dumps(ids)}
+    )
+
+    situacao = dict.fromkeys(ids, ("Sem parcelas", 0))
+    for id_emprestimo, abertas, dias in linhas:
+        if not abertas:
+            situacao[id_emprestimo] = ("Quitado", 0)
+        elif dias:
+            situacao[id_emprestimo] = (f"Em atraso ({dias} dias)", dias)
+        else:
+            situacao[id_emprestimo] = ("Em andamento", 0)
+    return situacao
@@ -0,0 +1,126 @@
+import re
+from datetime import date
+from functools import lru_cache
+
+from dinheiro import Dinheiro, centavos_de_texto, formatar
+
+# ==========================
+# 🔹 TIPOS DAS COLUNAS NO BANCO LOCAL
+# ==========================
+# No SQLite, valores monetários ficam em centavos (INTEGER) e datas em
+# ISO-8601 (AAAA-MM-DD), para poderem ser somados e filtrados em SQL.
+# Em memória (tuplas) o dinheiro é Dinheiro e as datas "DD/MM/AAAA"; na
+# nuvem os dois continuam como texto de exibição ("R$ 1.234,56"). A
+# conversão acontece só na fronteira com o banco (carregar/salvar/sincronizar).
+
+DINHEIRO = "dinheiro"
+DATA = "data"
+
+TIPOS = {
+    "emprestimos": {"valor": DINHEIRO, "data_inicio": DATA},
+    "parcelas": {
+        "valor": DINHEIRO, "vencimento": DATA,
+        "juros": DINHEIRO, "desconto": DINHEIRO,
+        "parcela_atualizada": DINHEIRO, "valor_pago": DINHEIRO,
+        "residual": DINHEIRO, "data_pagamento": DATA,
+    },
+    "movimentacoes": {"valor": DINHEIRO, "data": DATA},
+}
+
+_DATA_BR = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+_DATA_ISO = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+# ==========================
+# 🔹 DATAS
+# ==========================
+def data_iso(valor):
+    """"DD/MM/AAAA" -> "AAAA-MM-DD". Vazio vira None; o que não é data fica como está."""
+    if not valor:
+        return None
+    m = _DATA_BR.fullmatch(str(valor).strip())
+    if not m:
+        return valor
+    dia, mes, ano = (int(x) for x in m.groups())
+    try:
+        return date(ano, mes, dia).isoformat()
+    except ValueError:
+        return valor
+
+
+def data_br(valor):
+    """"AAAA-MM-DD" -> "DD/MM/AAAA"."""
+    if isinstance(valor, str) and _DATA_ISO.fullmatch(valor):
+        return f"{valor[8:10]}/{valor[5:7]}/{valor[0:4]}"
+    return valor
+
+
+# ==========================
+# 🔹 CONVERSÃO DE LINHAS
+# ==========================
+def _para_banco_dinheiro(valor):
+    if isinstance(valor, Dinheiro):
+        return valor.centavos
+    if valor is None or isinstance(valor, int):
+        return valor
+    if isinstance(valor, float):
+        return Dinheiro.de_reais(valor).centavos
+    try:
+        return centavos_de_texto(str(valor))
+    except ValueError:
+        return valor  # guarda o texto original em vez de perder o dado
+
+
+def _do_banco_dinheiro(valor):
+    return Dinheiro(valor) if isinstance(valor, int) else valor
+
+
+def _para_nuvem_dinheiro(valor):
+    if valor is None:
+        return ""
+    return formatar(valor) if isinstance(valor, int) else valor
+
+
+def _do_banco_data(valor):
+    return "" if valor is None else data_br(valor)
+
+
+_FUNCOES = {
+    "para_banco": {DINHEIRO: _para_banco_dinheiro, DATA: data_iso},
+    "do_banco": {DINHEIRO: _do_banco_dinheiro, DATA: _do_banco_data},
+    "para_nuvem": {DINHEIRO: _para_nuvem_dinheiro, DATA: _do_banco_data},
+}
+
+
+@lru_cache(maxsize=None)
+def _conversores(tabela, campos, sentido):
+    tipos, funcoes = TIPOS.get(tabela, {}), _FUNCOES[sentido]
+    return tuple((i, funcoes[tipos[c]]) for i, c in enumerate(campos) if c in tipos)
+
+
+def _conversor(tabela, campos, sentido):
+    conversores = _conversores(tabela, tuple(campos), sentido)
+    if not conversores:
+        return tuple
+
+    def converter(linha):
+        linha = list(linha)
+        for i, func in conversores:
+            linha[i] = func(linha[i])
+        return tuple(linha)
+    return converter
+
+
+def conversor_para_banco(tabela, campos):
+    """Linha (em memória ou vinda da nuvem, na ordem de `campos`) -> formato do banco."""
+    return _conversor(tabela, campos, "para_banco")
+
+
+def conversor_do_banco(tabela, campos):
+    """Linha lida do banco -> tupla em memória (Dinheiro, datas DD/MM/AAAA)."""
+    return _conversor(tabela, campos, "do_banco")
+
+
+def conversor_para_nuvem(tabela, campos):
+    """Linha lida do banco -> valores de texto enviados ao Supabase."""
+    return _conversor(tabela, campos, "para_nuvem")
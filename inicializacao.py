@@ -0,0 +1,37 @@
+import time
+
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# ==========================
+# 🔹 TEMPO DE INICIALIZAÇÃO
+# ==========================
+# main.py importa este módulo antes de tudo. Cada etapa da inicialização
+# chama marcar() quando termina, e relatorio_inicializacao() registra quanto
+# cada uma levou e compara o total com o orçamento de inicialização a frio.
+
+ORCAMENTO_MS = 1500  # meta: do início do programa até a janela pronta
+
+_inicio = time.perf_counter()
+_etapas = []
+
+
+def marcar(etapa):
+    """Registra o fim de uma etapa da inicialização."""
+    _etapas.append((etapa, time.perf_counter()))
+
+
+def relatorio_inicializacao():
+    """Imprime o tempo de cada etapa e o total. Retorna o total em ms."""
+    anterior = _inicio
+    for etapa, instante in _etapas:
+        log.info("⏱ %s: %.0f ms", etapa, (instante - anterior) * 1000)
+        anterior = instante
+
+    total = (anterior - _inicio) * 1000
+    if total <= ORCAMENTO_MS:
+        log.info("✅ Inicialização em %.0f ms (orçamento: %d ms).", total, ORCAMENTO_MS)
+    else:
+        log.warning("⚠ Inicialização em %.0f ms, acima do orçamento de %d ms.", total, ORCAMENTO_MS)
+    return total
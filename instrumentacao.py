@@ -0,0 +1,181 @@
+import atexit
+import cProfile
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timezone
+
+from config import get_local_db_path
+from logs import get_logger
+
+# ==========================
+# 🔹 INSTRUMENTAÇÃO (tempos e contadores)
+# ==========================
+# Mede os caminhos quentes (carregar/salvar, sincronização, busca, telas de
+# parcelas e de empréstimos) sem depender de prints:
+# - medir("operacao") é um gerenciador de contexto; medido("operacao")
+#   é o decorador equivalente. Cada medição guarda a duração (últimas
+#   AMOSTRAS_POR_OPERACAO por operação, para p50/p95) e vira uma linha JSON
+#   no log "agiota.metricas" (arquivo rotativo metricas.log, veja logs.py).
+# - contar("contador", n) soma ocorrências (ex.: acertos do cache).
+# - AGIOTA_PERFIL=1 (todas) ou AGIOTA_PERFIL=op1,op2 liga o cProfile nas
+#   operações medidas da thread principal; ao sair, cada operação vira um
+#   arquivo .prof na pasta "perfil" (abre com pstats ou snakeviz).
+
+AMOSTRAS_POR_OPERACAO = 500
+
+log = get_logger(__name__)
+_metricas = get_logger("metricas")
+_lock = threading.Lock()
+_amostras = defaultdict(lambda: deque(maxlen=AMOSTRAS_POR_OPERACAO))
+_contadores = Counter()
+
+_PERFIL = {op.strip() for op in os.environ.get("AGIOTA_PERFIL", "").split(",") if op.strip()}
+_perfis = {}                  # operação -> cProfile.Profile (acumula as chamadas)
+_perfilando = threading.local()
+
+
+def _pasta():
+    return os.path.dirname(os.path.abspath(get_local_db_path()))
+
+
+# ==========================
+# 🔹 Registro
+# ==========================
+def registrar(operacao, ms, **campos):
+    """Guarda uma duração (ms) e escreve a linha estruturada no log."""
+    with _lock:
+        _amostras[operacao].append(ms)
+    if _metricas.isEnabledFor(logging.INFO):  # sem log ligado, nem monta o JSON
+        _metricas.info(json.dumps({
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "op": operacao,
+            "ms": round(ms, 3),
+            "thread": threading.current_thread().name,
+            **campos,
+        }, ensure_ascii=False, default=str))
+
+
+def contar(contador, quantidade=1):
+    with _lock:
+        _contadores[contador] += quantidade
+
+
+class Medicao:
+    """Uma medição em andamento (veja medir())."""
+
+    __slots__ = ("operacao", "campos", "_inicio", "_perfil")
+
+    def __init__(self, operacao, **campos):
+        self.operacao = operacao
+        self.campos = campos
+        self._perfil = None
+
+    def __enter__(self):
+        self._perfil = _iniciar_perfil(self.operacao)
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, erro, tb):
+        ms = (time.perf_counter() - self._inicio) * 1000
+        if self._perfil is not None:
+            self._perfil.disable()
+            _perfilando.ativo = False
+        if tipo is not None:
+            self.campos["erro"] = tipo.__name__
+        registrar(self.operacao, ms, **self.campos)
+        return False
+
+
+def medir(operacao, **campos):
+    """
+    Mede o bloco: `with medir("salvar_parcelas") as m: ...`.
+    m.campos recebe dados extras que vão para o log (ex.: m.campos["linhas"] = n).
+    """
+    return Medicao(operacao, **campos)
+
+
+def medido(operacao=None, rotulo=None):
+    """
+    Decorador: mede cada chamada da função (nome padrão: o da função).
+    `rotulo(*args, **kwargs)` acrescenta um sufixo à operação, ex.:
+    @medido("baixar_alteracoes", rotulo=lambda nome, **_: nome) -> "baixar_alteracoes.clientes".
+    """
+    def decorar(func):
+        nome = operacao or func.__qualname__
+
+        @functools.wraps(func)
+        def medir_chamada(*args, **kwargs):
+            op = f"{nome}.{rotulo(*args, **kwargs)}" if rotulo else nome
+            with medir(op):
+                return func(*args, **kwargs)
+        return medir_chamada
+    return decorar
+
+
+# ==========================
+# 🔹 Consulta (painel de diagnóstico)
+# ==========================
+def _percentil(ordenados, fracao):
+    return ordenados[min(len(ordenados) - 1, round(fracao * (len(ordenados) - 1)))]
+
+
+def estatisticas():
+    """operação -> {"n", "p50", "p95", "max"} (ms), sobre as amostras recentes."""
+    with _lock:
+        copias = {op: sorted(amostras) for op, amostras in _amostras.items() if amostras}
+    return {
+        op: {
+            "n": len(ordenados),
+            "p50": _percentil(ordenados, 0.50),
+            "p95": _percentil(ordenados, 0.95),
+            "max": ordenados[-1],
+        }
+        for op, ordenados in sorted(copias.items())
+    }
+
+
+def contadores():
+    with _lock:
+        return dict(sorted(_contadores.items()))
+
+
+def zerar():
+    with _lock:
+        _amostras.clear()
+        _contadores.clear()
+
+
+# ==========================
+# 🔹 Perfil (cProfile) opcional
+# ==========================
+def _iniciar_perfil(operacao):
+    # Só a medição mais externa da thread principal (o cProfile não aninha)
+    if not _PERFIL or ("1" not in _PERFIL and operacao not in _PERFIL):
+        return None
+    if threading.current_thread() is not threading.main_thread():
+        return None
+    if getattr(_perfilando, "ativo", False):
+        return None
+    perfil = _perfis.get(operacao)
+    if perfil is None:
+        perfil = _perfis[operacao] = cProfile.Profile()
+    _perfilando.ativo = True
+    perfil.enable()
+    return perfil
+
+
+@atexit.register
+def salvar_perfis():
+    """Grava um .prof por operação perfilada (na pasta "perfil", ao lado do banco)."""
+    if not _perfis:
+        return
+    pasta = os.path.join(_pasta(), "perfil")
+    os.makedirs(pasta, exist_ok=True)
+    for operacao, perfil in _perfis.items():
+        perfil.dump_stats(os.path.join(pasta, f"{operacao}.prof"))
+    log.info("🔬 Perfis de %d operações salvos em %s", len(_perfis), pasta)
@@ -0,0 +1,113 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# ==========================
+# 🔹 LOG CENTRAL
+# ==========================
+# Todos os módulos registram por aqui (log = get_logger(__name__)), com
+# formatação preguiçosa: log.info("✅ %d clientes carregados.", n). Mensagem
+# abaixo do nível nem chega a ser formatada, então log.debug() dentro de
+# laços não custa nada com o nível padrão (INFO).
+#
+# Quem chama só enfileira o registro; uma thread em segundo plano
+# (QueueListener) escreve no console (se houver um: o .exe do PyInstaller
+# não tem) e no arquivo rotativo agiota.log, ao lado do banco local. As
+# medições da instrumentação ("agiota.metricas") vão para metricas.log.
+#
+# Níveis por módulo pela variável AGIOTA_LOG, ex.:
+#   AGIOTA_LOG=WARNING                      -> só avisos e erros
+#   AGIOTA_LOG=INFO,supabase_utils=DEBUG    -> detalhes só da sincronização
+
+RAIZ = "agiota"
+METRICAS = f"{RAIZ}.metricas"
+NIVEL_PADRAO = logging.INFO
+TAMANHO_ARQUIVO = 1_000_000  # bytes por arquivo de log
+ARQUIVOS_ANTIGOS = 3
+
+_ouvinte = None
+_enfileirar = None  # QueueHandler pendurado no logger raiz
+
+
+def get_logger(nome):
+    """Logger de um módulo, abaixo do logger raiz do programa."""
+    return logging.getLogger(f"{RAIZ}.{nome}")
+
+
+class _SoMetricas(logging.Filter):
+    def filter(self, registro):
+        return registro.name == METRICAS
+
+
+class _SemMetricas(logging.Filter):
+    def filter(self, registro):
+        return registro.name != METRICAS
+
+
+def _aplicar_niveis(texto):
+    """ "INFO,parcelas=DEBUG" -> nível da raiz e de cada módulo citado."""
+    raiz = logging.getLogger(RAIZ)
+    raiz.setLevel(NIVEL_PADRAO)
+    for parte in filter(None, (p.strip() for p in texto.split(","))):
+        nome, _, nivel = parte.rpartition("=")
+        alvo = get_logger(nome) if nome else raiz
+        alvo.setLevel(nivel.upper())
+
+
+def configurar_logs(pasta=None, niveis=None, console=True):
+    """
+    Liga o log do programa (uma vez, no início). `pasta`: onde ficam os
+    arquivos (padrão: a do banco local); `niveis`: como em AGIOTA_LOG.
+    """
+    global _ouvinte, _enfileirar
+    if _ouvinte is not None:
+        return
+
+    if pasta is None:
+        from config import get_local_db_path
+        pasta = os.path.dirname(os.path.abspath(get_local_db_path()))
+
+    handlers = []
+    if console and sys.stderr is not None:
+        tela = logging.StreamHandler(sys.stderr)
+        tela.setFormatter(logging.Formatter("%(message)s"))
+        tela.addFilter(_SemMetricas())
+        handlers.append(tela)
+
+    for nome_arquivo, filtro, formato in (
+        ("agiota.log", _SemMetricas(), "%(asctime)s %(levelname)s %(name)s: %(message)s"),
+        ("metricas.log", _SoMetricas(), "%(message)s"),
+    ):
+        arquivo = RotatingFileHandler(
+            os.path.join(pasta, nome_arquivo), maxBytes=TAMANHO_ARQUIVO,
+            backupCount=ARQUIVOS_ANTIGOS, encoding="utf-8", delay=True,
+        )
+        arquivo.setFormatter(logging.Formatter(formato))
+        arquivo.addFilter(filtro)
+        handlers.append(arquivo)
+
+    fila = queue.SimpleQueue()
+    raiz = logging.getLogger(RAIZ)
+    _enfileirar = QueueHandler(fila)
+    raiz.addHandler(_enfileirar)
+    raiz.propagate = False
+    _aplicar_niveis(niveis if niveis is not None else os.environ.get("AGIOTA_LOG", ""))
+
+    _ouvinte = QueueListener(fila, *handlers, respect_handler_level=True)
+    _ouvinte.start()
+    atexit.register(encerrar_logs)
+
+
+def encerrar_logs():
+    """Escreve o que ainda está na fila e para a thread do log."""
+    global _ouvinte, _enfileirar
+    if _ouvinte is None:
+        return
+    logging.getLogger(RAIZ).removeHandler(_enfileirar)
+    _ouvinte.stop()
+    for handler in _ouvinte.handlers:
+        handler.close()
+    _ouvinte = _enfileirar = None
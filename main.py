@@ -1,80 +1,63 @@
+# ⏱ Primeiro import: marca o início da inicialização
+from inicializacao import marcar, relatorio_inicializacao
+
 # 🔧 Sistema e banco
-import os, sys
+import sys
 import uuid
 
 from ui.clientes_ui import ClientForm
 # 🎨 Interface gráfica (PySide6)
 from PySide6.QtCore import (
-    QRunnable, QThreadPool, Qt, QTimer,
-    
+    QRunnable, QThreadPool, Qt,
+    QObject, Signal, QTimer
 )
-from ui.emprestimos_ui import EmprestimoForm
-
 from ui.splash import SplashScreen
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
-    QLabel, QPushButton, QFrame, QTableWidget,
-    QTableWidgetItem, QHeaderView, QComboBox, QGraphicsDropShadowEffect,
-    QMessageBox, QStyleFactory, QAbstractItemView
+    QLabel, QPushButton, QFrame, QTableView, QLineEdit,
+    QHeaderView, QComboBox, QGraphicsDropShadowEffect,
+    QMessageBox, QAbstractItemView
 )
 
 from PySide6.QtGui import QColor
-from ui.financeiro_ui import FinanceiroWindow
+from ui.clientes_tabela import ClientesTableModel, ClientesFilterProxy, AcoesDelegate, COLUNA_ACOES
+from ui.facetas import FacetaModel
 
 # Config
-from config import criar_tabelas_local, get_local_db_path, verificar_tabelas
-
-print("📂 Conectando ao banco:", get_local_db_path())
-print("🔧 Criando tabelas...")
-criar_tabelas_local()
-print("✅ Tabelas criadas.")
-
-# ☁️ Supabase (sincronização)
-from supabase_utils import (
-    baixar_clientes, enviar_clientes,
-    baixar_emprestimos, enviar_emprestimos,
-    baixar_parcelas, enviar_parcelas,
-    baixar_movimentacoes, enviar_movimentacoes
-)
+from config import preparar_banco_local, get_local_db_path
+from banco import get_conexao, fechar_conexao, fechar_todas
+from busca import buscar_clientes
+from persistencia import fila_gravacao
+from logs import configurar_logs, encerrar_logs, get_logger
+from instrumentacao import medido
 
 # 📦 Módulos de dados
-from clientes import (
-    clientes, carregar_clientes, salvar_clientes,
-    sincronizar_clientes_download, sincronizar_clientes_upload
-)
-from emprestimos import (
-    emprestimos, carregar_emprestimos, salvar_emprestimos,
-    sincronizar_emprestimos_download, sincronizar_emprestimos_upload
-)
-from parcelas import (
-    parcelas, carregar_parcelas, salvar_parcelas,
-    sincronizar_parcelas_download, sincronizar_parcelas_upload
-)
-from movimentacoes import (
-    movimentacoes, carregar_movimentacoes, salvar_movimentacoes,
-    sincronizar_movimentacoes_download, sincronizar_movimentacoes_upload
-)
-
+from clientes import clientes, carregar_clientes
+from emprestimos import emprestimos, carregar_emprestimos
+from parcelas import parcelas, carregar_parcelas
+from movimentacoes import movimentacoes, carregar_movimentacoes
 
-def resource_path(relative_path):
-    """Obtém o caminho do recurso (funciona no .exe e no modo normal)."""
-    try:
-        # PyInstaller cria uma pasta temporária e guarda tudo lá
-        base_path = sys._MEIPASS
-    except AttributeError:
-        base_path = os.path.abspath(".")
+# ☁️ Sincronização (o cliente do Supabase só é criado na primeira sincronização)
+from sincronizacao import baixar_tudo, enviar_tudo, envio_automatico, TABELAS_DOWNLOAD
 
-    return os.path.join(base_path, relative_path)
+log = get_logger(__name__)
 
+# Tabelas carregadas na inicialização, na ordem
+CARREGAMENTO = [
+    ("clientes", carregar_clientes),
+    ("emprestimos", carregar_emprestimos),
+    ("parcelas", carregar_parcelas),
+    ("movimentacoes", carregar_movimentacoes),
+]
 
-print("📤 Iniciando operação no banco...")
 
 # =====================================================================
 # ModernWindow
 # =====================================================================
 class ModernWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, dados=None):
+        """`dados`: tabelas já carregadas (CarregamentoWorker); sem eles, carrega aqui."""
         super().__init__()
         self.offset = None
 
@@ -110,8 +93,21 @@ class ModernWindow(QMainWindow):
         self.parcelas = parcelas
         self.movimentacoes = movimentacoes
 
-        # 🔹 Carrega dados do banco local na inicialização
-        self.load_local_db()
+        # 🔹 Modelo da lista de clientes (a tela de busca só mostra/filtra)
+        self.clientes_model = ClientesTableModel(self.clients, self)
+        self.clientes_proxy = ClientesFilterProxy(self)
+        self.clientes_proxy.setSourceModel(self.clientes_model)
+
+        # 🔹 Valores dos filtros Nome / Cidade / Indicação (mantidos pela lista de clientes)
+        self.modelos_filtro = {
+            campo: FacetaModel(faceta, self) for campo, faceta in self.clients.facetas.items()
+        }
+
+        # 🔹 Dados do banco local (normalmente já carregados durante a splash)
+        if dados is None:
+            self.load_local_db()
+        else:
+            self._usar_dados(dados)
 
         # 🔹 Layout principal da interface
         main_layout = QVBoxLayout()
@@ -219,11 +215,11 @@ class ModernWindow(QMainWindow):
 
     # ======== Ações de janela ========
     def handle_close(self):
-        """Salva no SQLite e no Supabase antes de fechar, em segundo plano."""
+        """Agenda o salvamento no SQLite e fecha (a fila é descarregada ao sair)."""
         try:
-            self.save_local_db_background()
+            self.save_local_db()
         except Exception as e:
-            print(f"⚠ Erro ao salvar antes de fechar: {e}")
+            log.warning("⚠ Erro ao salvar antes de fechar: %s", e)
         self.close()
 
     def mouse_press_event(self, event):
@@ -292,7 +288,7 @@ class ModernWindow(QMainWindow):
                     data.get("Cidade", ""),
                     data.get("Indicação", "")
                 )
-                self.clients.append(cliente_tuple)
+                self.clientes_model.adicionar_cliente(cliente_tuple)
             else:  # ✅ Edição de cliente existente
                 id_cliente = self.clients[edit_index][0]  # mantém o mesmo ID
                 cliente_tuple = (
@@ -305,30 +301,22 @@ class ModernWindow(QMainWindow):
                     data.get("Indicação", "")
                 )
                 self.clients[edit_index] = cliente_tuple
+                self.clientes_model.cliente_alterado(edit_index)
 
-            
 
             # Salva no banco local
             self.save_local_db()
 
             # Atualiza a tabela da interface se existir
+            # (as listas dos filtros já se atualizaram sozinhas); a busca
+            # por texto lê o banco, então espera este salvamento chegar lá
             if hasattr(self, "table_results"):
-                self.rebuild_search_filters()
+                if self.inp_busca.text().strip():
+                    fila_gravacao.esperar()
                 self.apply_search_filters()
 
-        # monta lista de cidades a partir da memória
-        try:
-            idx_cidade = 5  # agora 'cidade' é índice 5
-            cities = sorted({
-                str(c[idx_cidade]).strip()
-                for c in self.clients
-                if len(c) > idx_cidade and str(c[idx_cidade]).strip()
-            })
-        except Exception as e:
-            print(f"ℹ Falha ao montar lista de cidades: {e}")
-            cities = []
-
-        self.form = ClientForm(callback, initial_data=initial_data, cities=cities)
+        # Cidades já cadastradas, direto da faceta da lista de clientes
+        self.form = ClientForm(callback, initial_data=initial_data, cities=self.modelos_filtro["cidade"])
         self.form.show()
 
     # ======== Tela de Pesquisa ========
@@ -358,6 +346,25 @@ class ModernWindow(QMainWindow):
 
         layout.addLayout(top_row)
 
+        # Busca por texto (nome, CPF, telefone, endereço, cidade, indicação)
+        self.inp_busca = QLineEdit()
+        self.inp_busca.setPlaceholderText("🔎 Buscar por nome, CPF, telefone, endereço, cidade ou indicação...")
+        self.inp_busca.setClearButtonEnabled(True)
+        self.inp_busca.setStyleSheet("""
+            QLineEdit {
+                background-color:#2c3446; color:white;
+                padding:8px; border-radius:6px; font-size:13px;
+            }
+        """)
+        # Busca enquanto digita, mas só depois de uma pausa curta
+        self._timer_busca = QTimer(self.search_widget)
+        self._timer_busca.setSingleShot(True)
+        self._timer_busca.setInterval(150)
+        self._timer_busca.timeout.connect(self.apply_search_filters)
+        self.inp_busca.textChanged.connect(self._timer_busca.start)
+        self.inp_busca.returnPressed.connect(self.apply_search_filters)
+        layout.addWidget(self.inp_busca)
+
         # Linha de filtros com alinhamento inferior
         filters_row = QHBoxLayout()
         filters_row.setAlignment(Qt.AlignBottom)
@@ -370,6 +377,7 @@ class ModernWindow(QMainWindow):
 
         self.cb_nome = QComboBox()
         self.cb_nome.setEditable(False)
+        self.cb_nome.setModel(self.modelos_filtro["nome"])
         self.cb_nome.setStyleSheet("""
             QComboBox {
                 background-color:#2c3446; color:white;
@@ -392,6 +400,7 @@ class ModernWindow(QMainWindow):
 
         self.cb_cidade = QComboBox()
         self.cb_cidade.setEditable(False)
+        self.cb_cidade.setModel(self.modelos_filtro["cidade"])
         self.cb_cidade.setStyleSheet("""
             QComboBox {
                 background-color:#2c3446; color:white;
@@ -414,6 +423,7 @@ class ModernWindow(QMainWindow):
 
         self.cb_indicacao = QComboBox()
         self.cb_indicacao.setEditable(False)
+        self.cb_indicacao.setModel(self.modelos_filtro["indicacao"])
         self.cb_indicacao.setStyleSheet("""
             QComboBox {
                 background-color:#2c3446; color:white;
@@ -453,17 +463,22 @@ class ModernWindow(QMainWindow):
 
         layout.addLayout(filters_row)
 
-        # Tabela de resultados
-        self.table_results = QTableWidget(0, 7)
-        self.table_results.cellDoubleClicked.connect(self.abrir_financeiro_cliente)
+        # Tabela de resultados (view sobre o modelo de clientes)
+        self.table_results = QTableView()
+        self.table_results.setModel(self.clientes_proxy)
+        self.table_results.doubleClicked.connect(self.abrir_financeiro_cliente)
+
+        acoes = AcoesDelegate(self.table_results)
+        acoes.financeiro_clicado.connect(lambda row: self.open_dados_cliente(self.clients[row]))
+        acoes.editar_clicado.connect(self.editar_cliente)
+        self.table_results.setItemDelegateForColumn(COLUNA_ACOES, acoes)
+        self.table_results.setMouseTracking(True)
 
         self.table_results.setSelectionMode(QAbstractItemView.NoSelection)
-        self.table_results.setHorizontalHeaderLabels(
-            ["Nome", "CPF", "Endereço", "Cidade", "Telefone", "Indicação", "Ações"]
-        )
+        self.table_results.verticalHeader().setDefaultSectionSize(34)
         self.table_results.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table_results.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #2c3446; color: white;
                 border: 1px solid #3a455b;
             }
@@ -476,18 +491,19 @@ class ModernWindow(QMainWindow):
 
         self._replace_main_content(self.search_widget)
 
-        # Popular filtros e mostrar tudo
-        self.rebuild_search_filters()
+        # Mostrar tudo
         self.apply_search_filters()
 
-    def abrir_financeiro_cliente(self, row, col):
+    def abrir_financeiro_cliente(self, index):
         """Abre a aba Financeiro do cliente ao dar duplo clique na tabela."""
+        row = self.clientes_proxy.mapToSource(index).row()
         if row < 0 or row >= len(self.clients):
             return
 
         cliente = self.clients[row]  # tupla (id_cliente, nome, cpf, telefone, endereco, cidade, indicacao)
 
         # 🔹 Abre a janela FinanceiroWindow já focada
+        from ui.financeiro_ui import FinanceiroWindow
         self.finance_window = FinanceiroWindow(cliente, parent=self)
         self.finance_window.setWindowFlags(Qt.Window | Qt.WindowCloseButtonHint | Qt.WindowMinimizeButtonHint)
         self.finance_window.setAttribute(Qt.WA_DeleteOnClose)  
@@ -495,45 +511,6 @@ class ModernWindow(QMainWindow):
 
 
     # ======== Filtros de pesquisa ========
-    def rebuild_search_filters(self):
-        """Atualiza as listas suspensas com valores únicos existentes nos clientes."""
-        # NOVOS ÍNDICES com base na nova tupla:
-        # (0:id_cliente, 1:nome, 2:cpf, 3:telefone, 4:endereco, 5:cidade, 6:indicacao)
-        campos = {
-            "Nome": 1,
-            "Cidade": 5,
-            "Indicação": 6
-        }
-
-        def unique_values(key):
-            idx = campos.get(key)
-            if idx is None:
-                return [""]
-            vals = sorted(set([
-                str(c[idx]).strip() for c in self.clients if str(c[idx]).strip()
-            ]))
-            return [""] + vals
-
-        cur_nome = self.cb_nome.currentText() if self.cb_nome.count() else ""
-        cur_cidade = self.cb_cidade.currentText() if self.cb_cidade.count() else ""
-        cur_ind = self.cb_indicacao.currentText() if self.cb_indicacao.count() else ""
-
-        self.cb_nome.clear()
-        self.cb_nome.addItems(unique_values("Nome"))
-        self.cb_cidade.clear()
-        self.cb_cidade.addItems(unique_values("Cidade"))
-        self.cb_indicacao.clear()
-        self.cb_indicacao.addItems(unique_values("Indicação"))
-
-        self._set_combobox_if_present(self.cb_nome, cur_nome)
-        self._set_combobox_if_present(self.cb_cidade, cur_cidade)
-        self._set_combobox_if_present(self.cb_indicacao, cur_ind)
-
-
-    def _set_combobox_if_present(self, cb: QComboBox, value: str):
-        idx = cb.findText(value)
-        cb.setCurrentIndex(idx if idx >= 0 else 0)
-
     def clear_search_filters(self):
         """Reseta todos os filtros e recarrega a lista completa."""
         if hasattr(self, "cb_nome"):
@@ -542,188 +519,87 @@ class ModernWindow(QMainWindow):
             self.cb_cidade.setCurrentIndex(0)
         if hasattr(self, "cb_indicacao"):
             self.cb_indicacao.setCurrentIndex(0)
+        if hasattr(self, "inp_busca"):
+            self.inp_busca.blockSignals(True)
+            self.inp_busca.clear()
+            self.inp_busca.blockSignals(False)
         self.apply_search_filters()
 
 
+    @medido()
     def apply_search_filters(self):
         """Filtra a lista de clientes de acordo com os filtros selecionados (sem salvar no SQLite)."""
-        nome = self.cb_nome.currentText().strip().lower() if hasattr(self, "cb_nome") else ""
-        cidade = self.cb_cidade.currentText().strip().lower() if hasattr(self, "cb_cidade") else ""
-        indicacao = self.cb_indicacao.currentText().strip().lower() if hasattr(self, "cb_indicacao") else ""
-
-        filtered = []
-        for c in self.clients:
-            # c = (id_cliente, nome, cpf, telefone, endereco, cidade, indicacao)
-            ok_nome = (c[1].strip().lower() == nome) if nome else True
-            ok_cidade = (c[5].strip().lower() == cidade) if cidade else True
-            ok_ind = (c[6].strip().lower() == indicacao) if indicacao else True
-            if ok_nome and ok_cidade and ok_ind:
-                filtered.append(c)
-
-        # Evita disparar handle_table_edit durante a repopulação
-        if self.table_results.receivers("itemChanged(QTableWidgetItem*)") > 0:
-            self.table_results.itemChanged.disconnect(self.handle_table_edit)
-
-        self.table_results.setRowCount(0)
-
-        for c in filtered:
-            row = self.table_results.rowCount()
-            self.table_results.insertRow(row)
-
-            # Cabeçalhos visuais: ["Nome", "CPF", "Endereço", "Cidade", "Telefone", "Indicação", "Ações"]
-
-            # Nome
-            item_nome = QTableWidgetItem(c[1])
-            item_nome.setFlags(item_nome.flags() & ~Qt.ItemIsEditable)
-            self.table_results.setItem(row, 0, item_nome)
-
-            # CPF
-            item_cpf = QTableWidgetItem(c[2])
-            item_cpf.setFlags(item_cpf.flags() & ~Qt.ItemIsEditable)
-            self.table_results.setItem(row, 1, item_cpf)
-
-            # Endereço
-            item_endereco = QTableWidgetItem(c[4])
-            item_endereco.setFlags(item_endereco.flags() & ~Qt.ItemIsEditable)
-            self.table_results.setItem(row, 2, item_endereco)
-
-            # Cidade
-            item_cidade = QTableWidgetItem(c[5])
-            item_cidade.setFlags(item_cidade.flags() & ~Qt.ItemIsEditable)
-            self.table_results.setItem(row, 3, item_cidade)
-
-            # Telefone
-            item_tel = QTableWidgetItem(c[3])
-            item_tel.setFlags(item_tel.flags() & ~Qt.ItemIsEditable)
-            self.table_results.setItem(row, 4, item_tel)
-
-            # Indicação
-            item_indicacao = QTableWidgetItem(c[6])
-            item_indicacao.setFlags(item_indicacao.flags() & ~Qt.ItemIsEditable)
-            self.table_results.setItem(row, 5, item_indicacao)
-            
-            # Layout horizontal para os botões de ação
-            action_widget = QWidget()
-            action_layout = QHBoxLayout(action_widget)
-            action_layout.setContentsMargins(0, 0, 0, 0)
-            action_layout.setSpacing(6)
-
-            # Botão 📑 Financeiro
-            btn_financeiro = QPushButton("📑")
-            btn_financeiro.setFixedSize(28, 28)
-            btn_financeiro.setToolTip("Financeiro")
-            btn_financeiro.setStyleSheet("""
-                QPushButton {
-                    background: none; color: white;
-                    border: none; font-size: 16px;
-                }
-                QPushButton:hover {
-                    background-color: #3a455b;
-                    border-radius: 6px;
-                }
-            """)
-            btn_financeiro.clicked.connect(lambda _, cliente=c: self.open_dados_cliente(cliente))
-            action_layout.addWidget(btn_financeiro)
-
-            # Botão ✏️ Editar Cliente
-            btn_edit = QPushButton("✏️")
-            btn_edit.setFixedSize(28, 28)
-            btn_edit.setToolTip("Editar dados")
-            btn_edit.setStyleSheet("""
-                QPushButton {
-                    background: none; color: white;
-                    border: none; font-size: 16px;
-                }
-                QPushButton:hover {
-                    background-color: #3a455b;
-                    border-radius: 6px;
-                }
-            """)
-            btn_edit.clicked.connect(lambda _, cliente=c: self.open_client_form(
-                initial_data={
-                    "Nome": cliente[1],
-                    "CPF": cliente[2],
-                    "Telefone": cliente[3],
-                    "Endereço": cliente[4],
-                    "Cidade": cliente[5],
-                    "Indicação": cliente[6]
-                },
-                edit_index=next((i for i, cli in enumerate(self.clients) if cli[0] == cliente[0]), None)
-            ))
-            action_layout.addWidget(btn_edit)
-
-            self.table_results.setCellWidget(row, 6, action_widget)
-
-        self.table_results.itemChanged.connect(self.handle_table_edit)
+        self.clientes_proxy.definir_filtros(
+            nome=self.cb_nome.currentText() if hasattr(self, "cb_nome") else "",
+            cidade=self.cb_cidade.currentText() if hasattr(self, "cb_cidade") else "",
+            indicacao=self.cb_indicacao.currentText() if hasattr(self, "cb_indicacao") else "",
+        )
+        texto = self.inp_busca.text() if hasattr(self, "inp_busca") else ""
+        self.clientes_proxy.definir_busca(buscar_clientes(texto))
+
+    def editar_cliente(self, row):
+        """Abre o formulário de edição do cliente na posição `row` da lista."""
+        cliente = self.clients[row]
+        self.open_client_form(
+            initial_data={
+                "Nome": cliente[1],
+                "CPF": cliente[2],
+                "Telefone": cliente[3],
+                "Endereço": cliente[4],
+                "Cidade": cliente[5],
+                "Indicação": cliente[6]
+            },
+            edit_index=row
+        )
 
     def open_finance_form(self, client_data):
         """Abre o formulário de empréstimo para o cliente selecionado."""
+        from ui.emprestimos_ui import EmprestimoForm
+
         def callback(data):
-            print("💰 Empréstimo salvo para cliente:", client_data[1])
-            print("Dados do empréstimo:", data)
+            log.info("💰 Empréstimo salvo para cliente: %s", client_data[1])
+            log.debug("Dados do empréstimo: %s", data)
 
         self.form_emprestimo = EmprestimoForm(callback)
         self.form_emprestimo.show()
 
 
-    # ======== Edição inline da tabela ========
-    def handle_table_edit(self, item):
-        """Atualiza os dados do cliente na lista quando uma célula da tabela é editada."""
-        row = item.row()
-        col = item.column()
-        novo_valor = item.text().strip()
-
-        # Colunas visuais -> campos reais (índices na tupla)
-        # Tabela mostra: 0 Nome, 1 CPF, 2 Endereço, 3 Cidade, 4 Telefone, 5 Indicação
-        # Tupla real: (0:id_cliente, 1:nome, 2:cpf, 3:telefone, 4:endereco, 5:cidade, 6:indicacao)
-        mapeamento = {
-            2: 4,  # Endereço
-            3: 5,  # Cidade
-            4: 3,  # Telefone
-            # 0 Nome, 1 CPF, 5 Indicação estão não editáveis (bloqueados)
-        }
-
-        if col not in mapeamento:
-            return  # coluna não editável
-
-        idx_real = mapeamento[col]
-        cliente = self.clients[row]
-        valor_antigo = cliente[idx_real]
-
-        if novo_valor != valor_antigo:
-            cliente_atualizado = list(cliente)
-            cliente_atualizado[idx_real] = novo_valor
-            self.clients[row] = tuple(cliente_atualizado)
-            self.save_local_db()
-
-
     # ======== Banco Local ========
     def load_local_db(self):
         """Carrega dados locais de clientes, empréstimos, parcelas e movimentações."""
         try:
-            self.clients = carregar_clientes()
-            self.emprestimos = carregar_emprestimos()
-            self.parcelas = carregar_parcelas()
-            self.movimentacoes = carregar_movimentacoes()
-
-            print(f"✅ {len(self.clients)} clientes carregados.")
-            print(f"✅ {len(self.emprestimos)} empréstimos carregados.")
-            print(f"✅ {len(self.parcelas)} parcelas carregadas.")
-            print(f"✅ {len(self.movimentacoes)} movimentações carregadas.")
+            self._usar_dados({nome: carregar() for nome, carregar in CARREGAMENTO})
         except Exception as e:
-            print(f"⚠ Erro ao carregar banco local: {e}")
+            log.error("⚠ Erro ao carregar banco local: %s", e)
+
+    def _usar_dados(self, dados):
+        """Passa a usar as listas carregadas do banco local."""
+        self.clients = dados["clientes"]
+        self.clientes_model.definir_clientes(self.clients)
+        self.emprestimos = dados["emprestimos"]
+        self.parcelas = dados["parcelas"]
+        self.movimentacoes = dados["movimentacoes"]
+
+        log.info(
+            "✅ Carregados: %d clientes, %d empréstimos, %d parcelas, %d movimentações.",
+            len(self.clients), len(self.emprestimos), len(self.parcelas), len(self.movimentacoes),
+        )
 
 
     def save_local_db(self):
-        """Salva todos os dados locais no banco."""
+        """
+        Agenda a gravação de tudo que mudou na fila de gravação, sem travar
+        a tela. Pedidos seguidos viram uma única transação.
+        """
         try:
-            salvar_clientes(self.clients)
-            salvar_emprestimos()
-            salvar_parcelas()
-            salvar_movimentacoes()
-            print("💾 Banco local atualizado com sucesso.")
+            fila_gravacao.agendar(
+                clientes=self.clients,
+                emprestimos=self.emprestimos,
+                parcelas=self.parcelas,
+                movimentacoes=self.movimentacoes,
+            )
         except Exception as e:
-            print(f"⚠ Erro ao salvar no banco local: {e}")
+            log.error("⚠ Erro ao salvar no banco local: %s", e)
 
     # ======== Utilidades ========
     def _replace_main_content(self, new_widget: QWidget):
@@ -784,6 +660,11 @@ class ModernWindow(QMainWindow):
         """)
         btn_download.clicked.connect(self.acao_download_supabase)
         layout.addWidget(btn_download, alignment=Qt.AlignCenter)
+        layout.addSpacing(20)
+
+        # Diagnóstico: tempos das operações medidas nesta sessão
+        from ui.diagnostico_ui import DiagnosticoPanel
+        layout.addWidget(DiagnosticoPanel())
 
         self._replace_main_content(self.extras_widget)
 
@@ -793,28 +674,30 @@ class ModernWindow(QMainWindow):
         reply = QMessageBox.question(
             self,
             "Confirmação",
-            "⚠ Esta ação pode gerar a exclusão de dados locais.\n\nTem certeza que deseja prosseguir?",
+            "⚠ Registros alterados na nuvem vão substituir os dados locais correspondentes"
+            " (alterações locais ainda não enviadas são mantidas).\n\nTem certeza que deseja prosseguir?",
             QMessageBox.Yes | QMessageBox.Cancel
         )
         if reply != QMessageBox.Yes:
-            print("ℹ Operação de download cancelada pelo usuário.")
+            log.info("ℹ Operação de download cancelada pelo usuário.")
             return
 
-        # 🔹 Sincroniza dados de cada módulo
-        try:
-            sincronizar_clientes_download()
-            sincronizar_emprestimos_download()
-            sincronizar_parcelas_download()
-            sincronizar_movimentacoes_download()
+        # 🔹 As quatro tabelas são baixadas em paralelo, fora da thread da interface
+        self._iniciar_sincronizacao("download", "📥 Baixando dados da nuvem...")
 
+    def _ao_concluir_download(self, resultado):
+        """Recarrega os dados locais e mostra a tela de busca após o download."""
+        falhas = [nome for nome, qtd in resultado.items() if qtd is None]
+        try:
             self.load_local_db()
             self.show_search_screen()
-            self.rebuild_search_filters()
-            self.apply_search_filters()
 
-            print("✅ Dados do Supabase carregados e exibidos na tela de busca.")
+            if falhas:
+                log.warning("⚠ Falha ao baixar: %s", ", ".join(falhas))
+            else:
+                log.info("✅ Dados do Supabase carregados e exibidos na tela de busca.")
         except Exception as e:
-            print(f"⚠ Erro ao baixar dados do Supabase: {e}")
+            log.error("⚠ Erro ao baixar dados do Supabase: %s", e)
 
     # ======== Upload / Backup na nuvem ========
     def _backup_em_nuvem(self):
@@ -822,40 +705,69 @@ class ModernWindow(QMainWindow):
         reply = QMessageBox.question(
             self,
             "Confirmação",
-            "⚠ Esta ação pode gerar a exclusão de dados da nuvem.\n\nTem certeza que deseja prosseguir?",
+            "⚠ As alterações locais ainda não enviadas (inclusive exclusões) serão"
+            " enviadas para a nuvem. Os demais registros da nuvem não são tocados."
+            "\n\nTem certeza que deseja prosseguir?",
             QMessageBox.Yes | QMessageBox.Cancel
         )
         if reply != QMessageBox.Yes:
-            print("ℹ Upload para nuvem cancelado pelo usuário.")
+            log.info("ℹ Upload para nuvem cancelado pelo usuário.")
             return
 
-        self.status_label.setText("💾 Salvando em nuvem...")
+        # 🔹 Salva no SQLite primeiro (rápido, só o que mudou); o envio
+        # espera a fila de gravação chegar ao disco antes de ler o banco
+        self.save_local_db()
+
+        # 🔹 Depois envia as tabelas para o Supabase, em segundo plano
+        self._iniciar_sincronizacao("envio", "💾 Salvando em nuvem...")
+
+    def _ao_concluir_envio(self, resultado):
+        falhas = [nome for nome, ok in resultado.items() if not ok]
+        if falhas:
+            log.warning("⚠ Erro ao salvar na nuvem: %s", ", ".join(falhas))
+            self._set_status(f"⚠ Erro ao salvar na nuvem ({', '.join(falhas)}). Tente novamente.")
+        else:
+            self._set_status("✅ Pronto, tudo salvo. Pode ficar tranquilo!")
+
+    # ======== Sincronização em segundo plano ========
+    def _iniciar_sincronizacao(self, direcao, mensagem):
+        """Dispara o SyncWorker; progresso e conclusão voltam por sinais Qt."""
+        if getattr(self, "_sincronizando", False):
+            self._set_status("⏳ Já existe uma sincronização em andamento.")
+            return
 
-        # 🔹 Salva no SQLite primeiro
-        self.save_local_db_background()
+        self._sincronizando = True
+        self._set_status(mensagem)
 
-        # 🔹 Depois envia cada tipo de dado para o Supabase
-        try:
-            sincronizar_clientes_upload()
-            sincronizar_emprestimos_upload()
-            sincronizar_parcelas_upload()
-            sincronizar_movimentacoes_upload()
-
-            QTimer.singleShot(
-                2000,
-                lambda: self.status_label.setText("✅ Pronto, tudo salvo. Pode ficar tranquilo!")
-            )
-        except Exception as e:
-            print(f"⚠ Erro ao salvar na nuvem: {e}")
-            self.status_label.setText("⚠ Erro ao salvar na nuvem.")
-
-    def save_local_db_background(self):
-        """Salva o banco local em segundo plano."""
-        worker = SaveWorker(self.save_local_db, "Salvando no SQLite")
+        worker = SyncWorker(direcao)
+        worker.signals.progresso.connect(self._mostrar_progresso_sincronizacao)
+        worker.signals.concluido.connect(self._ao_concluir_sincronizacao)
         QThreadPool.globalInstance().start(worker)
 
+    def _mostrar_progresso_sincronizacao(self, direcao, nome, registros, pagina):
+        """Mostra na tela de Funções Extras o andamento (por página/lote)."""
+        if direcao == "download":
+            self._set_status(f"📥 Baixando {nome}: {registros} registros (página {pagina})")
+        else:
+            self._set_status(f"☁️ Enviando {nome}: {registros} registros (lote {pagina})")
+
+    def _ao_concluir_sincronizacao(self, direcao, resultado):
+        self._sincronizando = False
+        if direcao == "download":
+            self._ao_concluir_download(resultado)
+        else:
+            self._ao_concluir_envio(resultado)
+
+    def _set_status(self, texto):
+        """Atualiza a mensagem de status, se a tela de Funções Extras ainda existir."""
+        try:
+            self.status_label.setText(texto)
+        except (AttributeError, RuntimeError):
+            pass
+
     def open_dados_cliente(self, client_data):
         """Abre a tela financeira do cliente selecionado."""
+        from ui.financeiro_ui import FinanceiroWindow
         self.finance_window = FinanceiroWindow(client_data, parent=self)
         self.finance_window.setWindowFlags(Qt.Window | Qt.WindowCloseButtonHint | Qt.WindowMinimizeButtonHint)
         self.finance_window.setAttribute(Qt.WA_DeleteOnClose)  # fecha de vez ao clicar no X
@@ -864,32 +776,129 @@ class ModernWindow(QMainWindow):
 
 
 # =====================================================================
-# SaveWorker (Thread para salvar em segundo plano)
+# SyncWorker (sincronização com a nuvem em segundo plano)
 # =====================================================================
-class SaveWorker(QRunnable):
-    def __init__(self, save_func, descricao="Salvando dados..."):
+class SyncSignals(QObject):
+    # direção ("envio"/"download"), tabela, registros, página/lote
+    progresso = Signal(str, str, int, int)
+    # direção, resultado por tabela
+    concluido = Signal(str, object)
+
+
+class SyncWorker(QRunnable):
+    def __init__(self, direcao):
         super().__init__()
-        self.save_func = save_func
-        self.descricao = descricao
+        self.direcao = direcao
+        self.signals = SyncSignals()
 
     def run(self):
+        def progresso(nome, registros, pagina):
+            self.signals.progresso.emit(self.direcao, nome, registros, pagina)
+
         try:
-            print(f"💾 {self.descricao} (em segundo plano)")
-            self.save_func()
-            print(f"✅ {self.descricao} concluído.")
+            # O banco precisa estar com tudo que está na fila de gravação
+            if not fila_gravacao.esperar():
+                raise RuntimeError("alterações locais ainda não gravadas no banco")
+            if self.direcao == "download":
+                resultado = baixar_tudo(progresso)
+            else:
+                resultado = enviar_tudo(progresso)
         except Exception as e:
-            print(f"⚠ Erro ao executar '{self.descricao}': {e}")
+            log.error("⚠ Erro na sincronização (%s): %s", self.direcao, e)
+            resultado = dict.fromkeys(TABELAS_DOWNLOAD)  # todas como falha
+        self.signals.concluido.emit(self.direcao, resultado)
+
+
+# =====================================================================
+# CarregamentoWorker (esquema + dados locais durante a splash)
+# =====================================================================
+class CarregamentoSignals(QObject):
+    # mensagem, percentual (0-100)
+    progresso = Signal(str, int)
+    # dict tabela -> lista carregada, ou a exceção que impediu o carregamento
+    concluido = Signal(object)
+
+
+class CarregamentoWorker(QRunnable):
+    """Confere/migra o esquema e carrega as quatro tabelas fora da thread da interface."""
+    def __init__(self):
+        super().__init__()
+        self.signals = CarregamentoSignals()
+
+    def run(self):
+        try:
+            self.signals.progresso.emit("🔧 Verificando banco local...", 0)
+            log.info("📂 Conectando ao banco: %s", get_local_db_path())
+            preparar_banco_local()
+
+            # Juros de atraso do dia, antes de carregar as parcelas
+            self.signals.progresso.emit("📅 Atualizando parcelas em atraso...", 5)
+            from encargos import atualizar_encargos
+            atualizar_encargos()
+
+            # O progresso anda conforme as linhas já carregadas
+            conn = get_conexao()
+            linhas = {
+                nome: conn.execute(f"SELECT COUNT(*) FROM {nome}").fetchone()[0]
+                for nome, _ in CARREGAMENTO
+            }
+            total = sum(linhas.values()) or 1
+            feitas = 0
+            dados = {}
+            for nome, carregar in CARREGAMENTO:
+                self.signals.progresso.emit(f"📂 Carregando {nome}...", 10 + 90 * feitas // total)
+                dados[nome] = carregar()
+                feitas += linhas[nome]
+
+            self.signals.progresso.emit("✅ Pronto!", 100)
+            resultado = dados
+        except Exception as e:
+            log.error("⚠ Erro ao carregar banco local: %s", e)
+            resultado = e
+        finally:
+            fechar_conexao()
+        self.signals.concluido.emit(resultado)
 
 
 # =====================================================================
 # Execução principal
 # =====================================================================
 if __name__ == "__main__":
+    configurar_logs()
+    marcar("imports")
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
-    print(QStyleFactory.keys())
-    verificar_tabelas()
-    main_window = ModernWindow()
-    splash = SplashScreen(parent=main_window)
+    marcar("QApplication")
+
+    splash = SplashScreen()
     splash.show()
-    sys.exit(app.exec())
+    marcar("splash")
+
+    def ao_carregar(resultado):
+        global main_window
+        if isinstance(resultado, Exception):
+            splash.close()
+            QMessageBox.critical(None, "O Agiota", f"Não foi possível abrir o banco local:\n{resultado}")
+            app.exit(1)
+            return
+
+        marcar("esquema e dados locais (em segundo plano)")
+        main_window = ModernWindow(dados=resultado)
+        marcar("janela principal")
+        splash.concluir(main_window)
+        relatorio_inicializacao()
+        envio_automatico.iniciar()  # alterações locais pendentes seguem para a nuvem
+
+    # 🔹 Esquema (uma única vez) e dados locais carregam fora da thread da interface
+    carregamento = CarregamentoWorker()
+    carregamento.signals.progresso.connect(splash.definir_progresso)
+    carregamento.signals.concluido.connect(ao_carregar)
+    QThreadPool.globalInstance().start(carregamento)
+
+    codigo = app.exec()
+    fila_gravacao.encerrar()  # nada agendado se perde ao sair
+    envio_automatico.encerrar()
+    QThreadPool.globalInstance().waitForDone()
+    fechar_todas()
+    encerrar_logs()
+    sys.exit(codigo)
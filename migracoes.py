@@ -0,0 +1,275 @@
+from esquema import conversor_para_banco
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# ==========================
+# 🔹 MIGRAÇÕES DO BANCO LOCAL
+# ==========================
+# A versão do esquema fica em PRAGMA user_version. Na inicialização,
+# aplicar_migracoes() roda, em ordem, as migrações ainda não aplicadas,
+# cada uma na sua transação. Migrações já publicadas não devem ser
+# alteradas: mudanças novas entram como uma nova migração no fim da lista.
+
+TABELAS_DADOS = ("clientes", "emprestimos", "parcelas", "movimentacoes")
+
+
+def _colunas(conn, tabela):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({tabela})")]
+
+
+def _migracao_1_coluna_versao(conn):
+    """Coluna atualizado_em usada pela sincronização incremental."""
+    for tabela in TABELAS_DADOS:
+        if "atualizado_em" not in _colunas(conn, tabela):
+            conn.execute(f"ALTER TABLE {tabela} ADD COLUMN atualizado_em TEXT")
+
+
+# Esquema tipado (dinheiro em centavos, datas ISO) — versão 2
+_TABELAS_TIPADAS_V2 = {
+    "emprestimos": (
+        ["id", "id_cliente", "valor", "data_inicio", "parcelas", "observacao", "atualizado_em"],
+        """
+            id TEXT PRIMARY KEY,
+            id_cliente TEXT,
+            valor INTEGER,
+            data_inicio TEXT,
+            parcelas TEXT,
+            observacao TEXT,
+            atualizado_em TEXT
+        """,
+    ),
+    "parcelas": (
+        [
+            "id", "id_emprestimo", "numero", "valor", "vencimento",
+            "juros", "desconto", "parcela_atualizada", "valor_pago",
+            "residual", "pago", "data_pagamento", "atualizado_em"
+        ],
+        """
+            id TEXT PRIMARY KEY,
+            id_emprestimo TEXT,
+            numero TEXT,
+            valor INTEGER,
+            vencimento TEXT,
+            juros INTEGER,
+            desconto INTEGER,
+            parcela_atualizada INTEGER,
+            valor_pago INTEGER,
+            residual INTEGER,
+            pago TEXT,
+            data_pagamento TEXT,
+            atualizado_em TEXT
+        """,
+    ),
+    "movimentacoes": (
+        ["id", "tipo", "valor", "data", "descricao", "id_relacionado", "origem", "atualizado_em"],
+        """
+            id TEXT PRIMARY KEY,
+            tipo TEXT,
+            valor INTEGER,
+            data TEXT,
+            descricao TEXT,
+            id_relacionado TEXT,
+            origem TEXT,
+            atualizado_em TEXT
+        """,
+    ),
+}
+
+
+def _migracao_2_colunas_tipadas(conn):
+    """Dinheiro em centavos (INTEGER) e datas em ISO-8601, reescrevendo as tabelas."""
+    for tabela, (campos, definicao) in _TABELAS_TIPADAS_V2.items():
+        converter = conversor_para_banco(tabela, campos)
+        nova = f"{tabela}_v2"
+
+        conn.execute(f"DROP TABLE IF EXISTS {nova}")
+        conn.execute(f"CREATE TABLE {nova} ({definicao})")
+        conn.executemany(
+            f"INSERT INTO {nova} ({', '.join(campos)}) VALUES ({', '.join(['?'] * len(campos))})",
+            map(converter, conn.execute(f"SELECT {', '.join(campos)} FROM {tabela}"))
+        )
+        conn.execute(f"DROP TABLE {tabela}")
+        conn.execute(f"ALTER TABLE {nova} RENAME TO {tabela}")
+
+
+def _migracao_3_indices(conn):
+    """Índices para as buscas por chave estrangeira, vencimento, filtros e versão."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_parcelas_emprestimo ON parcelas (id_emprestimo)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_parcelas_vencimento ON parcelas (vencimento)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_emprestimos_cliente ON emprestimos (id_cliente)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_movimentacoes_relacionado ON movimentacoes (id_relacionado)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_clientes_cidade_indicacao ON clientes (cidade, indicacao)")
+    for tabela in TABELAS_DADOS:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabela}_versao ON {tabela} (atualizado_em)")
+
+
+# Colunas pesquisáveis do cliente na busca por texto
+_CAMPOS_BUSCA = ("nome", "cpf", "telefone", "endereco", "cidade", "indicacao")
+
+
+def _migracao_4_busca_clientes(conn):
+    """
+    Índice FTS5 sobre os clientes, sem acentos e com prefixos, mantido por
+    triggers. O índice aponta para o rowid de clientes (content='clientes');
+    o REPLACE das gravações só atualiza o índice com recursive_triggers=ON.
+    """
+    campos = ", ".join(_CAMPOS_BUSCA)
+    novos = ", ".join(f"new.{c}" for c in _CAMPOS_BUSCA)
+    antigos = ", ".join(f"old.{c}" for c in _CAMPOS_BUSCA)
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS clientes_busca USING fts5(
+            {campos},
+            content='clientes', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS clientes_busca_ai AFTER INSERT ON clientes BEGIN
+            INSERT INTO clientes_busca (rowid, {campos}) VALUES (new.rowid, {novos});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS clientes_busca_ad AFTER DELETE ON clientes BEGIN
+            INSERT INTO clientes_busca (clientes_busca, rowid, {campos})
+            VALUES ('delete', old.rowid, {antigos});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS clientes_busca_au AFTER UPDATE ON clientes BEGIN
+            INSERT INTO clientes_busca (clientes_busca, rowid, {campos})
+            VALUES ('delete', old.rowid, {antigos});
+            INSERT INTO clientes_busca (rowid, {campos}) VALUES (new.rowid, {novos});
+        END
+    """)
+    conn.execute("INSERT INTO clientes_busca (clientes_busca) VALUES ('rebuild')")
+
+
+# Chave de cada tabela de dados
+_CHAVES = {"clientes": "id_cliente", "emprestimos": "id", "parcelas": "id", "movimentacoes": "id"}
+
+
+def _migracao_5_caixa_saida(conn):
+    """
+    Caixa de saída: uma entrada por linha alterada ou removida localmente e
+    ainda não confirmada pela nuvem. Começa com o que foi gravado depois do
+    último envio de cada tabela (tudo, se a tabela nunca foi enviada).
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS caixa_saida (
+            tabela TEXT NOT NULL,
+            chave TEXT NOT NULL,
+            operacao TEXT NOT NULL,
+            registrado_em TEXT NOT NULL,
+            tentativas INTEGER NOT NULL DEFAULT 0,
+            erro TEXT,
+            PRIMARY KEY (tabela, chave)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_caixa_saida_ordem ON caixa_saida (tabela, operacao, registrado_em)")
+
+    for tabela in TABELAS_DADOS:
+        row = conn.execute("SELECT ultimo_envio FROM sincronizacao WHERE tabela = ?", (tabela,)).fetchone()
+        marca = row[0] if row else None
+        conn.execute(
+            f"""
+            INSERT OR IGNORE INTO caixa_saida (tabela, chave, operacao, registrado_em)
+            SELECT :tabela, {_CHAVES[tabela]}, 'gravar', COALESCE(atualizado_em, '')
+            FROM {tabela}
+            WHERE {_CHAVES[tabela]} IS NOT NULL
+              AND (:marca IS NULL OR atualizado_em > :marca)
+            """,
+            {"tabela": tabela, "marca": marca}
+        )
+
+
+def _migracao_6_resumos_nuvem(conn):
+    """Resumo (hash) do conteúdo de cada linha como está na nuvem (veja resumos.py)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS resumos_nuvem (
+            tabela TEXT NOT NULL,
+            chave TEXT NOT NULL,
+            resumo TEXT NOT NULL,
+            PRIMARY KEY (tabela, chave)
+        ) WITHOUT ROWID
+    """)
+
+
+def _migracao_7_fila_envio_na_caixa(conn):
+    """
+    Fim da fila de envio antiga (lotes em JSON): as linhas dos lotes ainda
+    não confirmados entram na caixa de saída, que passa a ser o único
+    caminho de envio, e a tabela fila_envio é apagada.
+    """
+    existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fila_envio'"
+    ).fetchone()
+    if not existe:
+        return
+
+    for tabela in TABELAS_DADOS:
+        chave = _CHAVES[tabela]
+        # Entrada já existente na caixa é mais recente que o lote: fica ela
+        conn.execute(
+            f"""
+            INSERT OR IGNORE INTO caixa_saida (tabela, chave, operacao, registrado_em)
+            SELECT :tabela, json_extract(r.value, '$.{chave}'), 'gravar', COALESCE(MIN(f.criado_em), '')
+            FROM fila_envio AS f, json_each(f.registros) AS r
+            WHERE f.tabela = :tabela AND f.enviado_em IS NULL AND f.registros IS NOT NULL
+              AND json_extract(r.value, '$.{chave}') IN (SELECT {chave} FROM {tabela})
+            GROUP BY json_extract(r.value, '$.{chave}')
+            """,
+            {"tabela": tabela}
+        )
+    conn.execute("DROP TABLE fila_envio")
+
+
+def _migracao_8_juros_atraso(conn):
+    """
+    Coluna só local com os últimos juros calculados pelos encargos por
+    atraso (encargos.py): juros diferentes dela foram digitados à mão.
+    Começa vazia: não há como saber quais juros já gravados vieram de
+    cálculo, então todos os existentes contam como digitados e são mantidos.
+    """
+    if "juros_atraso" not in _colunas(conn, "parcelas"):
+        conn.execute("ALTER TABLE parcelas ADD COLUMN juros_atraso INTEGER")
+
+
+MIGRACOES = [
+    (1, "coluna de versão para sincronização", _migracao_1_coluna_versao),
+    (2, "dinheiro em centavos e datas ISO", _migracao_2_colunas_tipadas),
+    (3, "índices", _migracao_3_indices),
+    (4, "busca de clientes por texto", _migracao_4_busca_clientes),
+    (5, "caixa de saída para a nuvem", _migracao_5_caixa_saida),
+    (6, "resumos das linhas na nuvem", _migracao_6_resumos_nuvem),
+    (7, "fila de envio antiga na caixa de saída", _migracao_7_fila_envio_na_caixa),
+    (8, "juros calculados pelos encargos", _migracao_8_juros_atraso),
+]
+
+VERSAO_ATUAL = MIGRACOES[-1][0]
+
+
+def versao_banco(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migracoes(conn):
+    """
+    Leva o banco da versão gravada em user_version até VERSAO_ATUAL.
+    `conn` deve estar em modo autocommit (isolation_level=None).
+    """
+    versao = versao_banco(conn)
+    for numero, descricao, migrar in MIGRACOES:
+        if numero <= versao:
+            continue
+
+        log.info("🔧 Migrando banco local para a versão %d (%s)...", numero, descricao)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migrar(conn)
+            conn.execute(f"PRAGMA user_version = {numero}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
@@ -1,45 +1,25 @@
-import sqlite3
-import uuid
-from supabase_utils import baixar_movimentacoes, enviar_movimentacoes
-from config import get_local_db_path
+from supabase_utils import TABELAS
+from banco import get_conexao
+from persistencia import fila_gravacao
+from instrumentacao import medido
+from repositorio import Tabela, Movimentacao
+from esquema import conversor_do_banco
 
-# Lista que vai guardar as movimentações em memória
-movimentacoes = []
+# Colunas na ordem das tuplas em memória (a coluna de versão fica só no banco)
+SELECT_MOVIMENTACOES = f"SELECT {', '.join(TABELAS['movimentacoes']['campos'])} FROM movimentacoes"
+# Centavos -> Dinheiro e datas ISO -> DD/MM/AAAA
+_do_banco = conversor_do_banco("movimentacoes", TABELAS["movimentacoes"]["campos"])
+
+# Movimentações em memória, indexadas também pelo registro relacionado
+movimentacoes = Tabela(Movimentacao, indices=("id_relacionado",))
 
 # 🔹 Carregar movimentações do banco local
+@medido()
 def carregar_movimentacoes():
-    
-    conn = sqlite3.connect(get_local_db_path())
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM movimentacoes")
-    dados = cur.fetchall()
-    conn.close()
-
-    
-    global movimentacoes
-    movimentacoes = dados
-    return dados
+    movimentacoes.recarregar(map(_do_banco, get_conexao().execute(SELECT_MOVIMENTACOES)))
+    return movimentacoes
 
-# 🔹 Salvar movimentações no banco local
+# 🔹 Salvar movimentações no banco local (só as alteradas desde o último salvamento)
+@medido()
 def salvar_movimentacoes():
-    global movimentacoes
-    conn = sqlite3.connect(get_local_db_path())
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM movimentacoes")
-    for mov in movimentacoes:
-        # Se não tiver ID, gera um novo UUID
-        if not mov[0]:
-            mov = (str(uuid.uuid4()),) + mov[1:]
-        cursor.execute("INSERT INTO movimentacoes VALUES (?, ?, ?, ?, ?, ?, ?)", mov)
-    conn.commit()
-    conn.close()
-
-# 🔹 Baixar da nuvem
-def sincronizar_movimentacoes_download():
-    global movimentacoes
-    movimentacoes = baixar_movimentacoes()
-
-# 🔹 Enviar para a nuvem
-def sincronizar_movimentacoes_upload():
-    global movimentacoes
-    enviar_movimentacoes(movimentacoes)
+    fila_gravacao.gravar(movimentacoes=movimentacoes)
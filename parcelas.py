@@ -1,69 +1,69 @@
-import sqlite3
 import uuid
-from supabase_utils import baixar_parcelas, enviar_parcelas
-from config import get_local_db_path
+from supabase_utils import TABELAS
+from banco import get_conexao
+from persistencia import fila_gravacao
+from instrumentacao import medido
+from logs import get_logger
+from repositorio import Tabela, Parcela
+from esquema import conversor_do_banco
 
-# Lista que vai guardar as parcelas em memória
-parcelas = []
+log = get_logger(__name__)
+
+# Colunas na ordem das tuplas em memória (a coluna de versão fica só no banco)
+SELECT_PARCELAS = f"SELECT {', '.join(TABELAS['parcelas']['campos'])} FROM parcelas"
+# Centavos -> Dinheiro e datas ISO -> DD/MM/AAAA
+_do_banco = conversor_do_banco("parcelas", TABELAS["parcelas"]["campos"])
+
+# Parcelas em memória, indexadas também por empréstimo
+parcelas = Tabela(Parcela, indices=("id_emprestimo",))
 
 
 # 🔹 Carregar todas as parcelas do banco local
+@medido()
 def carregar_parcelas():
-    
-    conn = sqlite3.connect(get_local_db_path())
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM parcelas")
-    dados = cur.fetchall()
-    conn.close()
+    parcelas.recarregar(map(_do_banco, get_conexao().execute(SELECT_PARCELAS)))
+    return parcelas
 
-    
 
-    global parcelas
-    parcelas = dados
-    return dados
+# 🔹 Parcelas de um empréstimo (pelo índice, sem varrer a lista)
+def parcelas_do_emprestimo(id_emprestimo):
+    return parcelas.por("id_emprestimo", id_emprestimo)
 
 
 # 🔹 Carregar parcelas de um empréstimo específico
+@medido()
 def carregar_parcelas_por_emprestimo(id_emprestimo):
-    """Retorna todas as parcelas de um empréstimo específico"""
-    print(f"DEBUG - Carregando parcelas do empréstimo {id_emprestimo}...")
-    conn = sqlite3.connect(get_local_db_path())
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM parcelas WHERE id_emprestimo = ?", (id_emprestimo,))
-    dados = cur.fetchall()
-    conn.close()
-
-    print("DEBUG - Parcelas encontradas:", dados)
-
-    global parcelas
-    parcelas = dados
-    return dados
+    """
+    Retorna as parcelas de um empréstimo (tupla de registros, só leitura),
+    pelo índice da lista em memória: sem consultar o banco nem esperar a
+    fila de gravação, e já com as edições ainda não gravadas.
+    """
+    return tuple(parcelas_do_emprestimo(id_emprestimo))
 
 
-# 🔹 Salvar todas as parcelas no banco local
+# 🔹 Salvar parcelas no banco local
+@medido()
 def salvar_parcelas(lista=None):
-    global parcelas
-    if lista is not None:
-        parcelas = lista
-
-    conn = sqlite3.connect(get_local_db_path())
-    cursor = conn.cursor()
+    """
+    Grava só as parcelas alteradas (e removidas) desde o último salvamento.
+    `lista` precisa ser uma ListaRastreada; sem argumento, a lista em memória.
+    """
+    if lista is None:
+        lista = parcelas
 
-    for parcela in parcelas:
-        if not parcela[0] or parcela[0] == "null":
-            parcela = (str(uuid.uuid4()),) + parcela[1:]
+    gravadas, removidas = fila_gravacao.gravar(parcelas=lista)["parcelas"]
+    log.info("✅ %d parcelas salvas e %d removidas no banco local.", gravadas, removidas)
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO parcelas (
-                id, id_emprestimo, numero, valor, vencimento,
-                juros, desconto, parcela_atualizada, valor_pago,
-                residual, pago, data_pagamento
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, parcela)
 
-    conn.commit()
-    conn.close()
-    print(f"✅ {len(parcelas)} parcelas salvas no banco local.")
+# 🔹 Trocar as parcelas de um empréstimo (ex.: editadas na janela de parcelas)
+@medido()
+def salvar_parcelas_do_emprestimo(id_emprestimo, novas):
+    """
+    Faz as parcelas do empréstimo em memória ficarem iguais a `novas`
+    (as demais parcelas não são tocadas) e grava só o que mudou.
+    """
+    parcelas.substituir_grupo("id_emprestimo", id_emprestimo, novas)
+    salvar_parcelas()
 
 
 # 🔹 Criar ou atualizar uma parcela
@@ -75,56 +75,26 @@ def adicionar_ou_atualizar_parcela(
     """
     Adiciona ou atualiza parcela com todos os campos novos.
     """
-    global parcelas
-
-    # Verifica se já existe
-    existente = None
-    for p in parcelas:
-        if p[1] == id_emprestimo and str(p[2]) == str(numero):
-            existente = p
-            break
-
-    if existente:
-        parcela_id = existente[0]
-        nova_parcela = (
-            parcela_id, id_emprestimo, numero, valor, vencimento,
+    # Verifica se já existe (só entre as parcelas do empréstimo)
+    existente = next(
+        (p for p in parcelas_do_emprestimo(id_emprestimo) if str(p[2]) == str(numero)), None
+    )
+
+    if existente is not None:
+        nova_parcela = parcelas.gravar_registro((
+            existente[0], id_emprestimo, numero, valor, vencimento,
             juros, desconto, parcela_atualizada, valor_pago,
             residual, pago, data_pagamento
-        )
-        parcelas = [nova_parcela if p[0] == parcela_id else p for p in parcelas]
-        print(f"🔄 Parcela atualizada: {nova_parcela}")
+        ))
+        log.debug("🔄 Parcela atualizada: %s", nova_parcela)
     else:
         parcela_id = str(uuid.uuid4())
-        nova_parcela = (
+        nova_parcela = parcelas.gravar_registro((
             parcela_id, id_emprestimo, numero, valor, vencimento,
             juros, desconto, parcela_atualizada, valor_pago,
             residual, pago, data_pagamento
-        )
-        parcelas.append(nova_parcela)
-        print(f"✅ Nova parcela criada: {nova_parcela}")
+        ))
+        log.debug("✅ Nova parcela criada: %s", nova_parcela)
 
     salvar_parcelas()
     return nova_parcela
-
-
-
-# 🔹 Baixar da nuvem
-def sincronizar_parcelas_download():
-    global parcelas
-    parcelas = baixar_parcelas()
-    print(f"⬇️ {len(parcelas)} parcelas baixadas do Supabase.")
-
-
-# 🔹 Enviar para a nuvem
-def sincronizar_parcelas_upload():
-    global parcelas
-    parcelas_corrigidas = []
-    for p in parcelas:
-        if not p[0] or p[0] == "null":
-            novo_id = str(uuid.uuid4())
-            p = (novo_id,) + p[1:]
-        parcelas_corrigidas.append(p)
-    parcelas = parcelas_corrigidas
-    enviar_parcelas(parcelas)
-    print(f"⬆️ {len(parcelas)} parcelas enviadas ao Supabase.")
-
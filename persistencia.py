@@ -0,0 +1,194 @@
+import threading
+import time
+
+from banco import transacao, fechar_conexao
+from rastreio import ListaRastreada, gravar_pendencias
+from supabase_utils import TABELAS
+from instrumentacao import medir, contar
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# ==========================
+# 🔹 FILA DE GRAVAÇÃO NO BANCO LOCAL
+# ==========================
+# Uma única thread grava no SQLite. Quem salva só agenda: as pendências
+# das listas (linhas alteradas e chaves removidas) são retiradas na hora,
+# na thread de quem chamou, e ficam na fila como um retrato imutável;
+# a lista pode continuar sendo editada sem afetar o que vai para o disco.
+#
+# Pedidos que chegam juntos (ex.: várias edições seguidas) se acumulam
+# por ATRASO_AGRUPAMENTO e viram uma única transação; a linha mais nova
+# de cada chave é a que vale. Se a gravação falhar, o lote volta para a
+# fila (sem sobrepor mudanças mais novas) e é tentado de novo.
+#
+# esperar() bloqueia até tudo que foi agendado antes dela estar no disco
+# (usado antes de ler do banco ou de enviar para a nuvem) e encerrar()
+# descarrega a fila ao fechar o programa.
+
+ATRASO_AGRUPAMENTO = 0.25    # segundos esperando mais pedidos antes de gravar
+ATRASO_NOVA_TENTATIVA = 2.0  # segundos entre tentativas após uma falha
+
+
+class _Pendencias:
+    """Linhas e remoções ainda não gravadas de uma tabela (chave -> mais recente)."""
+
+    def __init__(self):
+        self.alteradas = {}
+        self.removidas = set()
+
+    def incluir(self, alteradas, removidas):
+        for chave in removidas:
+            self.alteradas.pop(chave, None)
+            self.removidas.add(chave)
+        for linha in alteradas:
+            self.alteradas[linha[0]] = linha
+            self.removidas.discard(linha[0])
+
+    def devolver(self, antigas):
+        """Devolve um lote que falhou, sem sobrepor o que chegou depois dele."""
+        for chave in antigas.removidas:
+            if chave not in self.alteradas:
+                self.removidas.add(chave)
+        for chave, linha in antigas.alteradas.items():
+            if chave not in self.alteradas and chave not in self.removidas:
+                self.alteradas[chave] = linha
+
+
+class FilaGravacao:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pendentes = {}     # tabela -> _Pendencias
+        self._agendados = 0      # pedidos recebidos
+        self._gravados = 0       # pedidos já no disco
+        self._falhas = 0
+        self._erro = None
+        self._urgente = False    # alguém está esperando: grava sem agrupar
+        self._parar = False
+        self._thread = None
+
+    # ==========================
+    # 🔹 Pedidos
+    # ==========================
+    def agendar(self, **listas):
+        """
+        Agenda a gravação de uma ou mais tabelas (ex.: clientes=clientes).
+        Só ListaRastreada é aceita: entra o que mudou, inclusive remoções
+        (uma lista comum não diz o que foi apagado).
+        Retorna tabela -> (linhas gravadas, linhas removidas).
+        """
+        for nome, linhas in listas.items():
+            if not isinstance(linhas, ListaRastreada):
+                raise TypeError(f"{nome}: esperava ListaRastreada, recebeu {type(linhas).__name__}")
+        retratos = {nome: linhas.retirar_pendencias() for nome, linhas in listas.items()}
+
+        with self._cond:
+            for nome, (alteradas, removidas) in retratos.items():
+                if alteradas or removidas:
+                    self._pendentes.setdefault(nome, _Pendencias()).incluir(alteradas, removidas)
+            self._agendados += 1
+            contar("fila_gravacao.pedidos")
+            self._iniciar()
+            self._cond.notify_all()
+        return {nome: (len(a), len(r)) for nome, (a, r) in retratos.items()}
+
+    def gravar(self, **listas):
+        """Agenda e espera chegar ao disco; repassa o erro se a gravação falhar."""
+        contagem = self.agendar(**listas)
+        if not self.esperar():
+            raise self._erro or TimeoutError("gravação no banco local não concluída")
+        return contagem
+
+    def esperar(self, timeout=None):
+        """
+        Bloqueia até tudo que foi agendado antes desta chamada estar no disco.
+        Retorna False se a gravação falhar ou o tempo acabar.
+        """
+        with self._cond:
+            alvo, falhas = self._agendados, self._falhas
+            if self._gravados >= alvo:
+                return True
+            self._urgente = True
+            self._cond.notify_all()
+            self._cond.wait_for(
+                lambda: self._gravados >= alvo or self._falhas != falhas, timeout
+            )
+            return self._gravados >= alvo
+
+    def encerrar(self, timeout=30):
+        """Descarrega a fila e para a thread de gravação (ao fechar o programa)."""
+        gravado = self.esperar(timeout)
+        with self._cond:
+            self._parar = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if not gravado:
+            log.error("⚠ Nem todas as alterações foram gravadas no banco local: %s", self._erro)
+        return gravado
+
+    # ==========================
+    # 🔹 Thread de gravação
+    # ==========================
+    def _iniciar(self):
+        if self._thread is None and not self._parar:
+            self._thread = threading.Thread(target=self._executar, name="FilaGravacao", daemon=True)
+            self._thread.start()
+
+    def _proximo_lote(self):
+        """Espera haver pendências, dá a janela de agrupamento e retira o lote."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pendentes or self._parar or self._gravados < self._agendados)
+            if not self._pendentes and self._gravados >= self._agendados:
+                return None, None
+
+            prazo = time.monotonic() + ATRASO_AGRUPAMENTO
+            while not self._urgente and not self._parar:
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    break
+                self._cond.wait(restante)
+
+            lote, self._pendentes = self._pendentes, {}
+            return lote, self._agendados
+
+    def _executar(self):
+        try:
+            while True:
+                lote, alvo = self._proximo_lote()
+                if lote is None:
+                    return
+                try:
+                    if lote:
+                        with medir("fila_gravacao.lote") as medicao, transacao() as conn:
+                            for nome, pendencias in lote.items():
+                                gravadas, removidas = gravar_pendencias(
+                                    conn, TABELAS[nome], pendencias.alteradas.values(), pendencias.removidas
+                                )
+                                medicao.campos[nome] = gravadas + removidas
+                except Exception as e:
+                    log.error("⚠ Erro ao gravar no banco local: %s", e)
+                    with self._cond:
+                        for nome, pendencias in lote.items():
+                            self._pendentes.setdefault(nome, _Pendencias()).devolver(pendencias)
+                        self._erro = e
+                        self._falhas += 1
+                        self._cond.notify_all()
+                        if self._cond.wait_for(lambda: self._parar, ATRASO_NOVA_TENTATIVA):
+                            return
+                    continue
+
+                with self._cond:
+                    self._gravados = alvo
+                    if self._gravados >= self._agendados:
+                        self._urgente = False
+                    self._cond.notify_all()
+                if lote:
+                    log.info("💾 Banco local atualizado (%s).", ", ".join(lote))
+        finally:
+            fechar_conexao()
+
+
+# Fila única do programa
+fila_gravacao = FilaGravacao()
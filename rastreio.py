@@ -0,0 +1,160 @@
+import uuid
+
+import caixa_saida
+from banco import agora_iso
+from esquema import conversor_para_banco
+
+
+def _sem_chave(valor):
+    return not valor or valor == "null"
+
+
+class ListaRastreada(list):
+    """
+    Lista de tuplas (linhas de uma tabela) que anota o que mudou desde o
+    último salvamento: chaves inseridas/alteradas e chaves removidas.
+    Assim o salvamento grava só essas linhas, em vez da tabela inteira.
+    A chave é sempre o primeiro campo da tupla.
+    """
+
+    def __init__(self, linhas=()):
+        super().__init__(linhas)
+        self._alteradas = {}    # chave -> linha mais recente
+        self._removidas = set()
+
+    # ==========================
+    # 🔹 Registro das mudanças
+    # ==========================
+    @staticmethod
+    def _com_chave(linha):
+        # Garante que a linha nunca entra sem ID
+        linha = tuple(linha)
+        if _sem_chave(linha[0]):
+            linha = (str(uuid.uuid4()),) + linha[1:]
+        return linha
+
+    def _registrar(self, linha):
+        self._alteradas[linha[0]] = linha
+        self._removidas.discard(linha[0])
+
+    def _registrar_remocao(self, linha):
+        self._alteradas.pop(linha[0], None)
+        if not _sem_chave(linha[0]):
+            self._removidas.add(linha[0])
+
+    # ==========================
+    # 🔹 Operações de lista
+    # ==========================
+    def append(self, linha):
+        linha = self._com_chave(linha)
+        super().append(linha)
+        self._registrar(linha)
+
+    def extend(self, linhas):
+        for linha in linhas:
+            self.append(linha)
+
+    def __iadd__(self, linhas):
+        self.extend(linhas)
+        return self
+
+    def insert(self, indice, linha):
+        linha = self._com_chave(linha)
+        super().insert(indice, linha)
+        self._registrar(linha)
+
+    def __setitem__(self, indice, valor):
+        if isinstance(indice, slice):
+            antigas = {l[0]: l for l in self[indice]}
+            novas = [self._com_chave(l) for l in valor]
+            super().__setitem__(indice, novas)
+            chaves_novas = {l[0] for l in novas}
+            for chave, linha in antigas.items():
+                if chave not in chaves_novas:
+                    self._registrar_remocao(linha)
+            for linha in novas:
+                if antigas.get(linha[0]) != linha:
+                    self._registrar(linha)
+            return
+
+        antiga = self[indice]
+        nova = self._com_chave(valor)
+        super().__setitem__(indice, nova)
+        if antiga[0] != nova[0]:
+            self._registrar_remocao(antiga)
+        if antiga != nova:
+            self._registrar(nova)
+
+    def __delitem__(self, indice):
+        removidas = self[indice] if isinstance(indice, slice) else [self[indice]]
+        super().__delitem__(indice)
+        for linha in removidas:
+            self._registrar_remocao(linha)
+
+    def pop(self, indice=-1):
+        linha = super().pop(indice)
+        self._registrar_remocao(linha)
+        return linha
+
+    def remove(self, linha):
+        super().remove(linha)
+        self._registrar_remocao(linha)
+
+    def clear(self):
+        for linha in self:
+            self._registrar_remocao(linha)
+        super().clear()
+
+    # ==========================
+    # 🔹 Pendências
+    # ==========================
+    def tem_pendencias(self):
+        return bool(self._alteradas or self._removidas)
+
+    def retirar_pendencias(self):
+        """Entrega e zera as pendências: (linhas alteradas, chaves removidas)."""
+        alteradas, self._alteradas = self._alteradas, {}
+        removidas, self._removidas = self._removidas, set()
+        return list(alteradas.values()), list(removidas)
+
+
+def sql_gravar(config):
+    """
+    INSERT ... ON CONFLICT DO UPDATE dos campos e da versão da tabela.
+    Ao contrário do INSERT OR REPLACE, não apaga a linha antiga: colunas
+    só locais (ex.: parcelas.juros_atraso) continuam como estavam.
+    """
+    tabela, chave, campos, versao = config["local"], config["chave"], config["campos"], config["versao"]
+    colunas = campos + [versao]
+    return f"""
+        INSERT INTO {tabela} ({', '.join(colunas)})
+        VALUES ({', '.join(['?'] * len(colunas))})
+        ON CONFLICT ({chave}) DO UPDATE SET
+            {', '.join(f'{c} = excluded.{c}' for c in colunas if c != chave)}
+    """
+
+
+def gravar_pendencias(conn, config, alteradas, removidas):
+    """
+    Grava pendências já retiradas de uma ListaRastreada (linhas alteradas e
+    chaves removidas) com sql_gravar() + DELETE, anotando-as na caixa
+    de saída na mesma transação. Quem retirou é quem cuida de devolvê-las
+    se a transação for desfeita. Toda linha gravada recebe um novo carimbo
+    na coluna de versão; dinheiro e datas são convertidos para o formato do
+    banco (centavos / ISO). `config` é a entrada de supabase_utils.TABELAS.
+    Retorna (linhas gravadas, linhas removidas).
+    """
+    tabela, campos = config["local"], config["campos"]
+    alteradas, removidas = list(alteradas), list(removidas)
+    if removidas:
+        conn.executemany(
+            f"DELETE FROM {tabela} WHERE {campos[0]} = ?",
+            ((chave,) for chave in removidas)
+        )
+        caixa_saida.registrar(conn, tabela, removidas, caixa_saida.REMOVER)
+    if alteradas:
+        carimbo = (agora_iso(),)
+        converter = conversor_para_banco(tabela, campos)
+        conn.executemany(sql_gravar(config), (converter(l) + carimbo for l in alteradas))
+        caixa_saida.registrar(conn, tabela, (l[0] for l in alteradas), carimbo=carimbo[0])
+    return len(alteradas), len(removidas)
@@ -0,0 +1,231 @@
+from bisect import bisect_left
+from collections import Counter, namedtuple
+
+from rastreio import ListaRastreada
+from supabase_utils import TABELAS
+
+# ==========================
+# 🔹 REGISTROS
+# ==========================
+# Cada linha em memória é uma tupla nomeada e compacta (sem __dict__):
+# continua valendo cliente[1], mas também cliente.nome.
+
+class Cliente(namedtuple("Cliente", TABELAS["clientes"]["campos"])):
+    __slots__ = ()
+
+
+class Emprestimo(namedtuple("Emprestimo", TABELAS["emprestimos"]["campos"])):
+    __slots__ = ()
+
+
+class Parcela(namedtuple("Parcela", TABELAS["parcelas"]["campos"])):
+    __slots__ = ()
+
+
+class Movimentacao(namedtuple("Movimentacao", TABELAS["movimentacoes"]["campos"])):
+    __slots__ = ()
+
+
+# ==========================
+# 🔹 FACETAS (valor -> quantidade)
+# ==========================
+def _valor_faceta(valor):
+    return "" if valor is None else str(valor).strip()
+
+
+class Faceta:
+    """
+    Valores distintos de um campo, com quantos registros usam cada um, e a
+    lista desses valores em ordem. Incluir ou remover um registro só mexe
+    na contagem do seu valor; a lista muda apenas quando um valor aparece
+    ou some, e os ouvintes (ex.: modelos do Qt) são avisados da posição:
+    - valor_incluido(posicao, valor)
+    - valor_removido(posicao)
+    - valores_recomecados(valores)
+    Valores vazios não entram.
+    """
+
+    def __init__(self):
+        self._contagem = {}
+        self.valores = []
+        self._ouvintes = []
+
+    def ouvir(self, ouvinte):
+        self._ouvintes.append(ouvinte)
+
+    def deixar_de_ouvir(self, ouvinte):
+        self._ouvintes.remove(ouvinte)
+
+    def quantidade(self, valor):
+        return self._contagem.get(_valor_faceta(valor), 0)
+
+    def adicionar(self, valor):
+        valor = _valor_faceta(valor)
+        if not valor:
+            return
+        quantidade = self._contagem.get(valor, 0)
+        self._contagem[valor] = quantidade + 1
+        if quantidade == 0:
+            posicao = bisect_left(self.valores, valor)
+            self.valores.insert(posicao, valor)
+            for ouvinte in self._ouvintes:
+                ouvinte.valor_incluido(posicao, valor)
+
+    def remover(self, valor):
+        valor = _valor_faceta(valor)
+        quantidade = self._contagem.get(valor, 0)
+        if quantidade > 1:
+            self._contagem[valor] = quantidade - 1
+        elif quantidade == 1:
+            del self._contagem[valor]
+            posicao = bisect_left(self.valores, valor)
+            del self.valores[posicao]
+            for ouvinte in self._ouvintes:
+                ouvinte.valor_removido(posicao)
+
+    def recomecar(self, valores):
+        self._contagem = Counter(v for v in map(_valor_faceta, valores) if v)
+        self.valores = sorted(self._contagem)
+        for ouvinte in self._ouvintes:
+            ouvinte.valores_recomecados(self.valores)
+
+
+# ==========================
+# 🔹 TABELA EM MEMÓRIA COM ÍNDICES
+# ==========================
+class Tabela(ListaRastreada):
+    """
+    Lista rastreada de registros com índices de busca:
+    - por chave (primeiro campo): obter(chave) e posicao(chave) em O(1)
+    - por chave estrangeira (`indices`): por(campo, valor) em O(k)
+    - facetas (`facetas`): valores distintos e contagem de um campo
+    Os índices acompanham toda inclusão, alteração e remoção. O objeto é
+    o mesmo durante toda a execução: recarregar() troca o conteúdo no
+    lugar, então quem importou a tabela nunca fica com uma lista velha.
+    """
+
+    def __init__(self, registro, indices=(), facetas=()):
+        super().__init__()
+        self._registro = registro
+        self._campos = {campo: registro._fields.index(campo) for campo in indices}
+        self._campos_faceta = {campo: registro._fields.index(campo) for campo in facetas}
+        self.facetas = {campo: Faceta() for campo in facetas}
+        self._registros = {}                                  # chave -> registro
+        self._grupos = {campo: {} for campo in self._campos}  # campo -> valor -> {chave: None}
+        self._posicoes = {}                                   # chave -> posição (None = refazer)
+
+    # ==========================
+    # 🔹 Consultas
+    # ==========================
+    def obter(self, chave):
+        return self._registros.get(chave)
+
+    def posicao(self, chave):
+        if self._posicoes is None:
+            self._posicoes = {linha[0]: i for i, linha in enumerate(self)}
+        return self._posicoes.get(chave)
+
+    def por(self, campo, valor):
+        """Registros cujo `campo` (indexado) é `valor`, na ordem da lista."""
+        return [self._registros[chave] for chave in self._grupos[campo].get(valor, ())]
+
+    # ==========================
+    # 🔹 Carga e gravação por chave
+    # ==========================
+    def recarregar(self, linhas):
+        """Troca todo o conteúdo (ex.: lido do banco) sem marcar nada como alterado."""
+        list.__setitem__(self, slice(None), map(self._registro._make, linhas))
+        self._alteradas.clear()
+        self._removidas.clear()
+        self._registros = {}
+        self._grupos = {campo: {} for campo in self._campos}
+        for linha in self:
+            self._indexar(linha)
+        self._posicoes = None
+        for campo, i in self._campos_faceta.items():
+            self.facetas[campo].recomecar(linha[i] for linha in self)
+
+    def gravar_registro(self, linha):
+        """Altera o registro de mesma chave ou inclui no fim. Retorna o registro."""
+        posicao = self.posicao(linha[0])
+        if posicao is None:
+            self.append(linha)
+            return self[-1]
+        self[posicao] = linha
+        return self[posicao]
+
+    def substituir_grupo(self, campo, valor, linhas):
+        """Faz o grupo `campo == valor` ficar igual a `linhas` (inclui, altera e remove)."""
+        novas = [self._com_chave(linha) for linha in linhas]
+        manter = {linha[0] for linha in novas}
+        sobrando = [self.posicao(r[0]) for r in self.por(campo, valor) if r[0] not in manter]
+        for posicao in sorted(sobrando, reverse=True):  # do fim para o começo
+            del self[posicao]
+        for linha in novas:
+            self.gravar_registro(linha)
+
+    # ==========================
+    # 🔹 Manutenção dos índices
+    # ==========================
+    def _com_chave(self, linha):
+        return self._registro._make(ListaRastreada._com_chave(linha))
+
+    def _indexar(self, linha):
+        self._registros[linha[0]] = linha
+        for campo, i in self._campos.items():
+            self._grupos[campo].setdefault(linha[i], {})[linha[0]] = None
+
+    def _desindexar(self, linha):
+        self._registros.pop(linha[0], None)
+        for campo, i in self._campos.items():
+            grupo = self._grupos[campo].get(linha[i])
+            if grupo is not None:
+                grupo.pop(linha[0], None)
+                if not grupo:
+                    del self._grupos[campo][linha[i]]
+
+    def _registrar(self, linha):
+        super()._registrar(linha)
+        antiga = self._registros.get(linha[0])
+        if antiga is not None:
+            self._desindexar(antiga)
+        self._indexar(linha)
+        for campo, i in self._campos_faceta.items():
+            # Só o campo que mudou mexe na faceta
+            if antiga is None or _valor_faceta(antiga[i]) != _valor_faceta(linha[i]):
+                if antiga is not None:
+                    self.facetas[campo].remover(antiga[i])
+                self.facetas[campo].adicionar(linha[i])
+        if self._posicoes is not None and linha[0] not in self._posicoes:
+            if self and self[-1] is linha:
+                self._posicoes[linha[0]] = len(self) - 1
+            else:
+                self._posicoes = None
+
+    def _registrar_remocao(self, linha):
+        super()._registrar_remocao(linha)
+        antiga = self._registros.get(linha[0])
+        if antiga is not None:
+            self._desindexar(antiga)
+            for campo, i in self._campos_faceta.items():
+                self.facetas[campo].remover(antiga[i])
+        self._posicoes = None
+
+    # Operações que deslocam posições sem passar por _registrar*
+    def insert(self, indice, linha):
+        super().insert(indice, linha)
+        self._posicoes = None
+
+    def __setitem__(self, indice, valor):
+        super().__setitem__(indice, valor)
+        if isinstance(indice, slice):
+            self._posicoes = None
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._posicoes = None
+
+    def reverse(self):
+        super().reverse()
+        self._posicoes = None
+
@@ -0,0 +1,52 @@
+import hashlib
+import json
+
+# ==========================
+# 🔹 RESUMOS DAS LINHAS NA NUVEM
+# ==========================
+# Para cada linha sincronizada, a tabela local "resumos_nuvem" guarda um
+# resumo (hash) do conteúdo que a nuvem tem: os campos de TABELAS[nome]
+# no formato do banco local (centavos / ISO), sem a coluna de versão.
+# É atualizado quando uma linha é baixada e quando um envio é confirmado.
+# Comparar resumos evita regravar no download (e reenviar no upload)
+# linhas que não mudaram, sem precisar de nada novo no Supabase.
+
+
+def resumo(valores):
+    """Hash do conteúdo de uma linha (valores no formato do banco, sem a versão)."""
+    # Texto de cada valor: 1 e "1" resumem igual, como ficam nas colunas TEXT;
+    # vazio e nulo também (a nuvem guarda "" onde o banco local tem NULL)
+    texto = json.dumps([None if v is None or v == "" else str(v) for v in valores], ensure_ascii=False)
+    return hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def calcular(linhas):
+    """
+    Resumos de várias linhas (valores no formato do banco, sem a versão).
+    Não é vetorizado: é só resumo() linha a linha, num único lugar.
+    """
+    return [resumo(valores) for valores in linhas]
+
+
+def salvos(conn, nome, chaves):
+    """Resumos guardados para as chaves da tabela: chave -> resumo (só as que têm)."""
+    return dict(conn.execute(
+        "SELECT chave, resumo FROM resumos_nuvem "
+        "WHERE tabela = ? AND chave IN (SELECT value FROM json_each(?))",
+        (nome, json.dumps(list(chaves)))
+    ))
+
+
+def gravar(conn, nome, pares):
+    """Guarda os resumos [(chave, resumo)] da tabela."""
+    conn.executemany(
+        "INSERT OR REPLACE INTO resumos_nuvem (tabela, chave, resumo) VALUES (?, ?, ?)",
+        ((nome, chave, valor) for chave, valor in pares)
+    )
+
+
+def remover(conn, nome, chaves):
+    conn.executemany(
+        "DELETE FROM resumos_nuvem WHERE tabela = ? AND chave = ?",
+        ((nome, chave) for chave in chaves)
+    )
@@ -0,0 +1,142 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import caixa_saida
+from banco import fechar_conexao
+from persistencia import fila_gravacao
+from supabase_utils import baixar_alteracoes, enviar_alteracoes, enviar_remocoes, supabase_configurado
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# ==========================
+# 🔹 SINCRONIZAÇÃO DE TODAS AS TABELAS
+# ==========================
+# As tabelas trafegam em paralelo, cada uma na sua thread (e na sua própria
+# conexão SQLite). No envio, a nuvem exige que o pai exista antes do filho,
+# então clientes -> emprestimos -> parcelas seguem em cadeia, enquanto
+# movimentacoes vai em paralelo; as remoções percorrem a cadeia ao
+# contrário (filhos antes dos pais). No download não há essa restrição local.
+
+CADEIA_ENVIO = [["clientes", "emprestimos", "parcelas"], ["movimentacoes"]]
+TABELAS_DOWNLOAD = ["clientes", "emprestimos", "parcelas", "movimentacoes"]
+
+# Um envio por vez (botão de backup e envio automático)
+_enviando = threading.Lock()
+
+
+def _em_thread(func):
+    """Roda func e libera a conexão SQLite da thread ao final."""
+    def executar(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            fechar_conexao()
+    return executar
+
+
+def enviar_tudo(progresso=None):
+    """
+    Envia as alterações locais (caixa de saída) das quatro tabelas.
+    Retorna {tabela: True/False}. Uma tabela da cadeia só é enviada se a
+    anterior foi enviada por completo.
+    """
+    @_em_thread
+    def enviar_cadeia(nomes):
+        resultado = {}
+        for nome in nomes:
+            if resultado and not all(resultado.values()):
+                log.warning("⚠ Envio de %s adiado: a tabela anterior não foi enviada por completo.", nome)
+                resultado[nome] = False
+                continue
+            resultado[nome] = enviar_alteracoes(nome, progresso=progresso)
+
+        removeu = True
+        for nome in reversed(nomes):
+            removeu = removeu and enviar_remocoes(nome)
+            resultado[nome] = resultado[nome] and removeu
+        return resultado
+
+    resultado = {}
+    with _enviando, ThreadPoolExecutor(max_workers=len(CADEIA_ENVIO)) as executor:
+        for parcial in executor.map(enviar_cadeia, CADEIA_ENVIO):
+            resultado.update(parcial)
+    return resultado
+
+
+def baixar_tudo(progresso=None):
+    """
+    Baixa as alterações da nuvem das quatro tabelas, todas em paralelo.
+    Retorna {tabela: registros baixados}, com None nas que falharam.
+    """
+    baixar = _em_thread(lambda nome: baixar_alteracoes(nome, progresso=progresso))
+    with ThreadPoolExecutor(max_workers=len(TABELAS_DOWNLOAD)) as executor:
+        return dict(zip(TABELAS_DOWNLOAD, executor.map(baixar, TABELAS_DOWNLOAD)))
+
+
+# ==========================
+# 🔹 ENVIO AUTOMÁTICO
+# ==========================
+# Thread em segundo plano que esvazia a caixa de saída: a cada
+# INTERVALO_ENVIO confere se há alterações locais pendentes e, havendo
+# Supabase configurado, chama enviar_tudo(). Sem conexão o envio falha,
+# as entradas continuam na caixa e o intervalo dobra (até ESPERA_MAXIMA_ENVIO).
+
+INTERVALO_ENVIO = 60.0       # segundos entre verificações
+ESPERA_MAXIMA_ENVIO = 900.0  # teto da espera após falhas seguidas
+
+
+class EnvioAutomatico:
+    def __init__(self, intervalo=INTERVALO_ENVIO):
+        self.intervalo = intervalo
+        self._acordar = threading.Event()
+        self._parar = False
+        self._thread = None
+
+    def iniciar(self):
+        if self._thread is None:
+            self._parar = False
+            self._thread = threading.Thread(target=self._executar, name="EnvioAutomatico", daemon=True)
+            self._thread.start()
+
+    def acordar(self):
+        """Verifica a caixa de saída agora, sem esperar o intervalo."""
+        self._acordar.set()
+
+    def encerrar(self, timeout=5):
+        self._parar = True
+        self._acordar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _executar(self):
+        espera = self.intervalo
+        try:
+            while True:
+                self._acordar.wait(espera)
+                self._acordar.clear()
+                if self._parar:
+                    return
+                try:
+                    if _enviando.locked() or not caixa_saida.quantidade() or not supabase_configurado():
+                        espera = self.intervalo
+                        continue
+                    # O que ainda está na fila de gravação entra na caixa antes do envio
+                    fila_gravacao.esperar()
+                    enviado = all(enviar_tudo().values())
+                except Exception as e:
+                    log.error("⚠ Erro no envio automático: %s", e)
+                    enviado = False
+
+                if enviado:
+                    espera = self.intervalo
+                else:
+                    espera = min(espera * 2, ESPERA_MAXIMA_ENVIO)
+                    log.info("ℹ Envio automático: nova tentativa em %.0f s.", espera)
+        finally:
+            fechar_conexao()
+
+
+# Envio automático do programa (iniciado pela janela principal)
+envio_automatico = EnvioAutomatico()
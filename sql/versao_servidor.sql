@@ -0,0 +1,27 @@
+-- Versão carimbada pelo próprio Supabase (rodar uma vez no SQL Editor).
+-- A coluna atualizado_em passa a receber a hora do servidor em todo
+-- INSERT/UPDATE, ignorando o valor enviado pelo programa. Assim o download
+-- incremental (atualizado_em > marca) não depende do relógio de cada
+-- computador nem de quando a edição foi feita.
+
+create or replace function carimbar_atualizado_em() returns trigger as $$
+begin
+    -- mesmo formato de banco.agora_iso(), para a coluna ser texto ou timestamptz
+    new.atualizado_em := to_char(clock_timestamp() at time zone 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"');
+    return new;
+end;
+$$ language plpgsql;
+
+do $$
+declare
+    tabela text;
+begin
+    foreach tabela in array array['clientes', 'emprestimos', 'parcelas', 'movimentacoes'] loop
+        execute format('drop trigger if exists carimbar_atualizado_em on %I', tabela);
+        execute format(
+            'create trigger carimbar_atualizado_em before insert or update on %I '
+            'for each row execute function carimbar_atualizado_em()', tabela
+        );
+    end loop;
+end;
+$$;
@@ -1,17 +1,61 @@
-from supabase import create_client, Client
-import sqlite3
+import json
 import os
-from dotenv import load_dotenv
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+import caixa_saida
+import resumos
+from banco import get_conexao, transacao, agora_iso
+from esquema import conversor_para_banco, conversor_para_nuvem
+from instrumentacao import medido, contar
+from logs import get_logger
+from rastreio import sql_gravar
+
+log = get_logger(__name__)
 
 # ==========================
 # 🔹 CONFIGURAÇÕES DO SUPABASE
 # ==========================
-load_dotenv()
+# O cliente (e o pacote supabase, que é pesado) só é criado na primeira
+# sincronização, e não ao importar este módulo. O .env também é lido uma
+# vez só, na primeira consulta às credenciais.
+_cliente = None
+_credenciais = None
+_cliente_lock = threading.Lock()
+
+
+def _ler_credenciais():
+    """(URL, chave) do Supabase, do ambiente ou do .env (lido na primeira chamada)."""
+    global _credenciais
+    if _credenciais is None:
+        with _cliente_lock:
+            if _credenciais is None:
+                from dotenv import load_dotenv
+
+                load_dotenv()
+                _credenciais = (os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+    return _credenciais
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+def get_supabase():
+    """Retorna o cliente do Supabase, criando-o na primeira chamada."""
+    global _cliente
+    if _cliente is None:
+        url, chave = _ler_credenciais()
+        with _cliente_lock:
+            if _cliente is None:
+                from supabase import create_client
+
+                _cliente = create_client(url, chave)
+    return _cliente
+
+
+def supabase_configurado():
+    """Há URL e chave do Supabase (no ambiente ou no .env)?"""
+    url, chave = _ler_credenciais()
+    return bool(url and chave)
 
 # ==========================
 # 🔹 TABELAS LOCAIS E REMOTAS
@@ -21,13 +65,15 @@ TABELAS = {
         "local": "clientes",
         "remota": "clientes",
         "campos": ["id_cliente", "nome", "cpf", "telefone", "endereco", "cidade", "indicacao"],
-        "chave": "id_cliente"
+        "chave": "id_cliente",
+        "versao": "atualizado_em"
     },
     "emprestimos": {
         "local": "emprestimos",
         "remota": "emprestimos",
         "campos": ["id", "id_cliente", "valor", "data_inicio", "parcelas", "observacao"],  # ✅ inclui id
-        "chave": "id"
+        "chave": "id",
+        "versao": "atualizado_em"
     },
     "parcelas": {
         "local": "parcelas",
@@ -37,122 +83,477 @@ TABELAS = {
             "juros", "desconto", "parcela_atualizada", "valor_pago",
             "residual", "pago", "data_pagamento"
         ],
-        "chave": "id"
+        "chave": "id",
+        "versao": "atualizado_em"
     },
 
     "movimentacoes": {
         "local": "movimentacoes",
         "remota": "movimentacoes",
         "campos": ["id", "tipo", "valor", "data", "descricao", "id_relacionado", "origem"],  # ✅ inclui id
-        "chave": "id"
+        "chave": "id",
+        "versao": "atualizado_em"
     }
 }
 
-LOCAL_DB = "dados.db"
+# Quantidade de linhas pedidas por requisição nos downloads
+TAMANHO_PAGINA = 1000
+
+# Conflito no download: linha alterada na nuvem que também tem alteração
+# local ainda não enviada (caixa de saída)
+RECENTE = "recente"  # vence a versão mais nova (coluna de versão)
+LOCAL = "local"      # a alteração local é mantida e enviada depois
+POLITICA_CONFLITO = os.environ.get("AGIOTA_CONFLITO", RECENTE)
+
+
+def _por_tabela(nome, *args, **kwargs):
+    # Sufixo das medições: cada tabela tem os seus tempos
+    return nome
 
 # ==========================
 # 🔹 FUNÇÕES GENÉRICAS
 # ==========================
-def baixar_tabela(nome):
-    """Baixa dados de uma tabela específica do Supabase."""
-    try:
-        config = TABELAS[nome]
-        print(f"☁️ Baixando {nome} do Supabase...")
-        response = supabase.table(config["remota"]).select("*").execute()
-        data = response.data if hasattr(response, "data") else []
-
-        if not data:
-            print(f"⚠ Nenhum dado encontrado em {config['remota']}.")
-            return []
-
-        conn = sqlite3.connect(LOCAL_DB)
-        cur = conn.cursor()
-
-        # Confirma se a tabela existe
-        cur.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{config['local']}'")
-        if not cur.fetchone():
-            raise RuntimeError(f"⚠ A tabela local '{config['local']}' não existe! Rode verificar_tabelas() antes.")
-
-        # Limpa e insere dados
-        cur.execute(f"DELETE FROM {config['local']}")
-        for item in data:
-            valores = [item.get(c, "") for c in config["campos"]]
-            placeholders = ", ".join(["?"] * len(valores))
-            cur.execute(f"""
-                INSERT INTO {config['local']} ({', '.join(config['campos'])})
-                VALUES ({placeholders})
-            """, valores)
-
-        conn.commit()
-        conn.close()
-        print(f"✅ {len(data)} registros de {nome} salvos localmente.")
-        return data
+def _literal(valor):
+    """Valor entre aspas para os filtros do PostgREST (datas têm ':' e '.')."""
+    return '"' + str(valor).replace("\\", "\\\\").replace('"', '\\"') + '"'
 
-    except Exception as e:
-        print(f"⚠ Erro ao baixar {nome}: {e}")
-        return []
 
+def _depois_de(versao, chave, ultimo, com_nulos):
+    """Filtro or=(...) das linhas depois do par (versão, chave) na ordem do download."""
+    valor, id_ = ultimo
+    if valor is None:
+        # Versões nulas ficam no fim da ordem; segue só pela chave
+        return f"and({versao}.is.null,{chave}.gt.{_literal(id_)})"
+    valor, id_ = _literal(valor), _literal(id_)
+    filtro = f"{versao}.gt.{valor},and({versao}.eq.{valor},{chave}.gt.{id_})"
+    if com_nulos:
+        filtro += f",{versao}.is.null"
+    return filtro
+
+
+def _paginas(config, colunas, tamanho_pagina, marca=None):
+    """
+    Busca a tabela remota em páginas ordenadas por (versão, chave), uma
+    requisição por vez. Cada página começa logo depois do último par
+    (versão, chave) visto, e não num deslocamento (offset): uma linha
+    alterada durante o download vai para o fim da ordem sem empurrar as
+    seguintes para fora da página. Só uma página fica em memória. Com
+    `marca`, traz apenas as linhas com versão maior que ela.
+    """
+    versao, chave = config["versao"], config["chave"]
+    ultimo = None
+    while True:
+        consulta = get_supabase().table(config["remota"]).select(",".join(colunas))
+        if ultimo is not None:
+            consulta = consulta.or_(_depois_de(versao, chave, ultimo, com_nulos=not marca))
+        elif marca:
+            consulta = consulta.gt(versao, marca)
+        consulta = consulta.order(versao).order(chave).limit(tamanho_pagina)
+        response = consulta.execute()
+        pagina = response.data if hasattr(response, "data") and response.data else []
+
+        if pagina:
+            yield pagina
+        if len(pagina) < tamanho_pagina:
+            return
+        ultimo = (pagina[-1].get(versao), pagina[-1][chave])
+
+
+def _mesclar_pagina(conn, nome, pagina, politica):
+    """
+    Aplica uma página baixada sobre a tabela local, só onde há diferença.
+    Retorna (linhas gravadas, chaves da página).
+    """
+    config = TABELAS[nome]
+    tabela, chave, campos, versao = config["local"], config["chave"], config["campos"], config["versao"]
+    # Na nuvem dinheiro e datas ficam como texto de exibição; no banco local,
+    # em centavos / ISO
+    converter = conversor_para_banco(tabela, campos)
+    remotas = [(converter([item.get(c, "") for c in campos]), item.get(versao, "")) for item in pagina]
+
+    # Situação local de cada chave da página, numa consulta só
+    situacao = {
+        linha[0]: linha[1:]
+        for linha in conn.execute(
+            f"""
+            SELECT j.value, t.{chave} IS NOT NULL, r.resumo, c.registrado_em,
+                   {', '.join(f't.{c}' for c in campos)}
+            FROM json_each(?) AS j
+            LEFT JOIN {tabela} AS t ON t.{chave} = j.value
+            LEFT JOIN resumos_nuvem AS r ON r.tabela = ? AND r.chave = j.value
+            LEFT JOIN caixa_saida AS c ON c.tabela = ? AND c.chave = j.value
+            """,
+            (json.dumps([valores[0] for valores, _ in remotas]), nome, nome)
+        )
+    }
+
+    gravar, novos_resumos, descartar = [], [], []
+    for valores, versao_remota in remotas:
+        existe, resumo_salvo, pendente_desde, *locais = situacao[valores[0]]
+        novo = resumos.resumo(valores)
+        if pendente_desde is not None:
+            # Conflito: a linha também tem alteração local ainda não enviada
+            if politica == LOCAL or not versao_remota or versao_remota <= pendente_desde:
+                contar(f"conflitos_mantidos.{nome}")
+                continue
+            descartar.append(valores[0])
+            contar(f"conflitos_descartados.{nome}")
+        elif existe:
+            atual = resumo_salvo or resumos.resumo(locais)
+            if atual == novo:
+                if resumo_salvo is None:
+                    novos_resumos.append((valores[0], novo))
+                continue
+        gravar.append(valores + (versao_remota,))
+        novos_resumos.append((valores[0], novo))
+
+    if gravar:
+        conn.executemany(sql_gravar(config), gravar)
+    if descartar:
+        caixa_saida.descartar(conn, nome, descartar)
+    resumos.gravar(conn, nome, novos_resumos)
+    return len(gravar), [valores[0] for valores, _ in remotas]
+
+
+def _remover_ausentes(conn, nome, chaves_remotas):
+    """Download completo: remove as linhas locais que não existem mais na nuvem (menos as pendentes)."""
+    config = TABELAS[nome]
+    tabela, chave = config["local"], config["chave"]
+    ausentes = [
+        linha[0] for linha in conn.execute(
+            f"""
+            SELECT {chave} FROM {tabela}
+            WHERE {chave} NOT IN (SELECT value FROM json_each(?))
+              AND {chave} NOT IN (SELECT chave FROM caixa_saida WHERE tabela = ?)
+            """,
+            (json.dumps(chaves_remotas), nome)
+        )
+    ]
+    conn.executemany(f"DELETE FROM {tabela} WHERE {chave} = ?", ((c,) for c in ausentes))
+    resumos.remover(conn, nome, ausentes)
+    return len(ausentes)
 
-def enviar_tabela(nome, registros):
-    """Envia dados de uma tabela específica para o Supabase."""
+
+def _mesclar_paginas(nome, paginas, completo=False, progresso=None, politica=None):
+    """
+    Mescla as páginas baixadas na tabela local e avança a marca de download
+    no final. Cada linha remota é comparada com a local pela chave e pelo
+    resumo do conteúdo: só inserções e alterações de verdade são gravadas.
+    Linha com alteração local ainda não enviada (caixa de saída) é um
+    conflito, resolvido por `politica` (padrão: POLITICA_CONFLITO).
+    Retorna (linhas recebidas, linhas gravadas ou removidas localmente).
+    Nenhuma transação fica aberta enquanto se espera a rede (a fila de
+    gravação e os encargos continuam gravando durante o download):
+    - completo=True (download completo): as páginas vão para uma tabela
+      temporária (só desta conexão, sem travar o banco) e, quando todas
+      chegam, são aplicadas numa única transação curta; no fim, linhas
+      locais que não vieram da nuvem são removidas (se veio alguma linha).
+      Uma falha no meio do download mantém os dados antigos.
+    - completo=False (alterações): cada página na sua própria transação curta.
+      Como a marca só avança no fim, uma falha no meio apenas faz baixar o
+      mesmo trecho de novo.
+    """
+    config = TABELAS[nome]
+    versao = config["versao"]
+    politica = politica or POLITICA_CONFLITO
+
+    # Confirma se a tabela existe
+    existe = get_conexao().execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (config["local"],)
+    ).fetchone()
+    if not existe:
+        raise RuntimeError(f"⚠ A tabela local '{config['local']}' não existe! Rode verificar_tabelas() antes.")
+
+    total = 0
+    alteradas = 0
+    maior_versao = None
+    conn = get_conexao()
+    if completo:
+        conn.execute("DROP TABLE IF EXISTS temp.paginas_baixadas")
+        conn.execute("CREATE TEMP TABLE paginas_baixadas (numero INTEGER PRIMARY KEY, conteudo TEXT)")
     try:
-        config = TABELAS[nome]
-        if not registros:
-            print(f"⚠ Nenhum dado de {nome} para enviar.")
-            return False
-
-        registros_validos = []
-        for r in registros:
-            if isinstance(r, tuple):
-                # Converte tupla para dict com todos os campos, inclusive o ID
-                r_dict = {c: r[i] for i, c in enumerate(config["campos"])}
+        for numero, pagina in enumerate(paginas, start=1):
+            if completo:
+                conn.execute("INSERT INTO temp.paginas_baixadas VALUES (?, ?)", (numero, json.dumps(pagina)))
             else:
-                r_dict = r
+                with transacao():
+                    alteradas += _mesclar_pagina(conn, nome, pagina, politica)[0]
+            total += len(pagina)
+
+            versoes = [item[versao] for item in pagina if item.get(versao)]
+            if versoes and (maior_versao is None or max(versoes) > maior_versao):
+                maior_versao = max(versoes)
 
-            # Aceita registros mesmo que algum campo seja vazio, desde que o ID exista
-            if r_dict.get(config["chave"]):
-                registros_validos.append(r_dict)
+            contar(f"linhas_baixadas.{nome}", len(pagina))
+            if progresso:
+                progresso(nome, total, numero)
 
-        if not registros_validos:
-            print(f"⚠ Nenhum registro válido de {nome} para enviar.")
-            return False
+        with transacao():
+            if completo and total:
+                chaves_remotas = []
+                for n in range(1, numero + 1):
+                    conteudo = conn.execute(
+                        "SELECT conteudo FROM temp.paginas_baixadas WHERE numero = ?", (n,)
+                    ).fetchone()[0]
+                    gravadas, chaves = _mesclar_pagina(conn, nome, json.loads(conteudo), politica)
+                    alteradas += gravadas
+                    chaves_remotas.extend(chaves)
+                alteradas += _remover_ausentes(conn, nome, chaves_remotas)
+            if maior_versao:
+                _gravar_marca(conn, nome, "ultimo_download", maior_versao)
+    finally:
+        if completo:
+            conn.execute("DROP TABLE IF EXISTS temp.paginas_baixadas")
 
-        response = supabase.table(config["remota"]).upsert(
-            registros_validos,
-            on_conflict=[config["chave"]]
-        ).execute()
+    contar(f"linhas_alteradas_download.{nome}", alteradas)
+    return total, alteradas
 
-        enviados = len(response.data) if response.data else len(registros_validos)
-        print(f"✅ {enviados} registros de {nome} enviados ao Supabase.")
-        return True
+
+@medido(rotulo=_por_tabela)
+def baixar_tabela(nome, tamanho_pagina=TAMANHO_PAGINA, progresso=None, politica=None):
+    """
+    Baixa a tabela inteira do Supabase, página por página, e mescla com a
+    tabela local: grava só o que difere, remove o que não existe mais na
+    nuvem e mantém as alterações locais ainda não enviadas conforme a
+    `politica` de conflito. `progresso(nome, linhas_baixadas, pagina)` é
+    chamado a cada página. Retorna a quantidade de registros baixados.
+    """
+    try:
+        config = TABELAS[nome]
+        log.info("☁️ Baixando %s do Supabase...", nome)
+        colunas = config["campos"] + [config["versao"]]
+        total, alteradas = _mesclar_paginas(
+            nome, _paginas(config, colunas, tamanho_pagina), completo=True,
+            progresso=progresso, politica=politica,
+        )
+
+        if not total:
+            log.warning("⚠ Nenhum dado encontrado em %s.", config["remota"])
+            return 0
+
+        log.info("✅ %d registros de %s baixados, %d alterados localmente.", total, nome, alteradas)
+        return total
 
     except Exception as e:
-        print(f"⚠ Erro ao enviar {nome}: {e}")
-        return False
+        log.error("⚠ Erro ao baixar %s: %s", nome, e)
+        return 0
+
+
+def _registros_validos(config, registros):
+    """Descarta registros sem ID (aceita campos vazios, desde que o ID exista)."""
+    return [r for r in registros if r.get(config["chave"])]
+
 
 # ==========================
-# 🔹 FUNÇÕES ESPECÍFICAS POR MÓDULO
+# 🔹 ENVIO (lotes)
 # ==========================
-def baixar_clientes():
-    return baixar_tabela("clientes")
+# Os envios saem em lotes, cada requisição com novas tentativas e espera
+# exponencial. O que enviar é decidido pela caixa de saída (caixa_saida.py).
 
-def enviar_clientes(registros):
-    return enviar_tabela("clientes", registros)
+TAMANHO_LOTE = 500
+TAMANHO_LOTE_REMOCAO = 100  # as chaves vão na URL (id=in.(...))
+TENTATIVAS_ENVIO = 4
+ESPERA_INICIAL = 1.0  # segundos; dobra a cada nova tentativa
 
-def baixar_emprestimos():
-    return baixar_tabela("emprestimos")
 
-def enviar_emprestimos(registros):
-    return enviar_tabela("emprestimos", registros)
+def _com_tentativas(requisicao):
+    """Executa a requisição com novas tentativas e espera exponencial. Lança a última exceção."""
+    for tentativa in range(TENTATIVAS_ENVIO):
+        try:
+            return requisicao().execute()
+        except Exception:
+            if tentativa == TENTATIVAS_ENVIO - 1:
+                raise
+            espera = ESPERA_INICIAL * (2 ** tentativa)
+            time.sleep(espera + random.uniform(0, espera / 2))
 
-def baixar_parcelas():
-    return baixar_tabela("parcelas")
 
-def enviar_parcelas(registros):
-    return enviar_tabela("parcelas", registros)
+def _enviar_lote(config, lote):
+    """Envia (upsert) um lote de registros, com novas tentativas."""
+    return _com_tentativas(lambda: get_supabase().table(config["remota"]).upsert(
+        lote,
+        on_conflict=[config["chave"]]
+    ))
 
-def baixar_movimentacoes():
-    return baixar_tabela("movimentacoes")
 
-def enviar_movimentacoes(registros):
-    return enviar_tabela("movimentacoes", registros)
+# ==========================
+# 🔹 SINCRONIZAÇÃO INCREMENTAL
+# ==========================
+# Download: cada tabela tem uma coluna de versão (TABELAS[nome]["versao"]),
+# e a tabela local "sincronizacao" guarda até onde já baixamos (maior
+# versão vista na nuvem).
+# Envio: sai exatamente o que está na caixa de saída (caixa_saida.py),
+# gravações e remoções, e cada entrada só é retirada quando a nuvem confirma.
+#
+# A versão que vale é a da chegada na nuvem, não a da gravação local: uma
+# edição feita offline e enviada dias depois precisa ter versão maior que
+# a marca dos outros computadores, senão nunca seria baixada por eles.
+# O ideal é a própria nuvem carimbar (trigger em sql/versao_servidor.sql,
+# que sobrepõe o valor enviado); sem ela, cada lote sai carimbado com a
+# hora do envio. Para tolerar diferenças de relógio entre os computadores,
+# o download pede a partir de MARGEM_RELOGIO antes da marca; o que vier
+# repetido é descartado pela comparação de resumos, sem gravar nada.
+
+MARGEM_RELOGIO = timedelta(minutes=10)
+
+def _ler_marca(nome, campo):
+    row = get_conexao().execute(
+        f"SELECT {campo} FROM sincronizacao WHERE tabela = ?", (nome,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _gravar_marca(conn, nome, campo, valor):
+    conn.execute("INSERT OR IGNORE INTO sincronizacao (tabela) VALUES (?)", (nome,))
+    conn.execute(f"UPDATE sincronizacao SET {campo} = ? WHERE tabela = ?", (valor, nome))
+
+
+def _com_margem(marca):
+    """Marca de download recuada MARGEM_RELOGIO (a marca como está, se não for uma data)."""
+    if not marca:
+        return marca
+    try:
+        return (datetime.fromisoformat(marca) - MARGEM_RELOGIO).isoformat(timespec="microseconds")
+    except ValueError:
+        return marca
+
+
+@medido(rotulo=_por_tabela)
+def baixar_alteracoes(nome, tamanho_pagina=TAMANHO_PAGINA, progresso=None, politica=None):
+    """
+    Baixa, página por página, só as linhas alteradas na nuvem desde o último
+    download, e as mescla com a tabela local (veja _mesclar_paginas).
+    `progresso(nome, linhas_baixadas, pagina)` é chamado a cada página.
+    Retorna a quantidade de registros baixados (None se falhar).
+    """
+    try:
+        config = TABELAS[nome]
+        colunas = config["campos"] + [config["versao"]]
+        marca = _ler_marca(nome, "ultimo_download")
+
+        log.info("☁️ Baixando alterações de %s desde %s...", nome, marca or "o início")
+        total, alteradas = _mesclar_paginas(
+            nome, _paginas(config, colunas, tamanho_pagina, _com_margem(marca)),
+            progresso=progresso, politica=politica,
+        )
+
+        if not total:
+            log.info("✅ %s já está atualizado.", nome)
+            return 0
+
+        log.info("✅ %d registros de %s baixados, %d alterados localmente.", total, nome, alteradas)
+        return total
+
+    except Exception as e:
+        log.error("⚠ Erro ao baixar alterações de %s: %s", nome, e)
+        return None
+
+
+def _drenar_caixa(nome, operacao, tamanho_lote, enviar, progresso=None):
+    """
+    Envia as entradas da caixa de saída com a operação dada, um lote por vez,
+    e retira cada lote quando a nuvem confirma. Entradas registradas depois
+    do início ficam para a próxima vez. Para no primeiro lote que falhar.
+    Retorna (registros enviados, True se não sobrou nada até o início).
+    """
+    ate = agora_iso()
+    enviados = 0
+    numero = 0
+    while True:
+        entradas = caixa_saida.pendentes(nome, operacao, tamanho_lote, ate)
+        if not entradas:
+            return enviados, True
+        try:
+            enviados += enviar([chave for chave, _ in entradas])
+        except Exception as e:
+            with transacao() as conn:
+                caixa_saida.anotar_falha(conn, nome, entradas, e)
+            log.error("⚠ Erro ao enviar lote de %s: %s", nome, e)
+            log.warning(
+                "⚠ %d alterações de %s ficaram na caixa de saída e serão enviadas na próxima sincronização.",
+                caixa_saida.quantidade(nome), nome,
+            )
+            return enviados, False
+
+        with transacao() as conn:
+            caixa_saida.confirmar(conn, nome, entradas)
+        numero += 1
+        if progresso:
+            progresso(nome, enviados, numero)
+
+
+@medido(rotulo=_por_tabela)
+def enviar_alteracoes(nome, tamanho_lote=TAMANHO_LOTE, progresso=None):
+    """
+    Envia as linhas gravadas localmente que estão na caixa de saída, em
+    lotes (upsert). `progresso(nome, registros_enviados, lote)` é chamado a
+    cada lote. Retorna True se não sobrou nada pendente.
+    """
+    try:
+        config = TABELAS[nome]
+        colunas = config["campos"] + [config["versao"]]
+        # Dinheiro e datas voltam ao texto de exibição, que é o formato da nuvem
+        converter = conversor_para_nuvem(config["local"], colunas)
+        sql = f"""
+            SELECT {', '.join(colunas)} FROM {config['local']}
+            WHERE {config['chave']} IN (SELECT value FROM json_each(?))
+        """
+
+        def enviar(chaves):
+            # Linhas que voltaram a ser iguais ao que a nuvem tem não vão
+            linhas = get_conexao().execute(sql, (json.dumps(chaves),)).fetchall()
+            salvos = resumos.salvos(get_conexao(), nome, chaves)
+            alteradas = [
+                (linha, novo) for linha, novo in zip(linhas, resumos.calcular(l[:-1] for l in linhas))
+                if salvos.get(linha[0]) != novo
+            ]
+            contar(f"envios_evitados.{nome}", len(linhas) - len(alteradas))
+
+            lote = _registros_validos(config, (dict(zip(colunas, converter(l))) for l, _ in alteradas))
+            if lote:
+                # Versão = hora do envio (a nuvem sobrepõe se tiver o trigger)
+                carimbo = agora_iso()
+                for registro in lote:
+                    registro[config["versao"]] = carimbo
+                _enviar_lote(config, lote)
+                contar(f"registros_enviados.{nome}", len(lote))
+                with transacao() as conn:
+                    resumos.gravar(conn, nome, ((l[0], novo) for l, novo in alteradas))
+            return len(lote)
+
+        enviados, completo = _drenar_caixa(nome, caixa_saida.GRAVAR, tamanho_lote, enviar, progresso)
+        if enviados:
+            log.info("✅ %d registros de %s enviados ao Supabase.", enviados, nome)
+        elif completo:
+            log.info("✅ Nenhuma alteração de %s para enviar.", nome)
+        return completo
+
+    except Exception as e:
+        log.error("⚠ Erro ao enviar alterações de %s: %s", nome, e)
+        return False
+
+
+@medido(rotulo=_por_tabela)
+def enviar_remocoes(nome, tamanho_lote=TAMANHO_LOTE_REMOCAO):
+    """
+    Apaga na nuvem as linhas removidas localmente (caixa de saída).
+    Retorna True se não sobrou nada pendente.
+    """
+    try:
+        config = TABELAS[nome]
+
+        def remover(chaves):
+            _com_tentativas(
+                lambda: get_supabase().table(config["remota"]).delete().in_(config["chave"], chaves)
+            )
+            contar(f"registros_removidos.{nome}", len(chaves))
+            return len(chaves)
+
+        removidos, completo = _drenar_caixa(nome, caixa_saida.REMOVER, tamanho_lote, remover)
+        if removidos:
+            log.info("🗑 %d registros de %s removidos do Supabase.", removidos, nome)
+        return completo
+
+    except Exception as e:
+        log.error("⚠ Erro ao remover registros de %s no Supabase: %s", nome, e)
+        return False
@@ -0,0 +1,61 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from banco import fechar_conexao, fechar_todas, get_conexao
+
+
+class FecharTodas(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.banco_anterior = os.environ.get("AGIOTA_BANCO")
+        os.environ["AGIOTA_BANCO"] = os.path.join(self.pasta.name, "teste.db")
+
+    def tearDown(self):
+        fechar_todas()
+        if self.banco_anterior is None:
+            os.environ.pop("AGIOTA_BANCO", None)
+        else:
+            os.environ["AGIOTA_BANCO"] = self.banco_anterior
+        self.pasta.cleanup()
+
+    def test_thread_viva_reabre_conexao(self):
+        aberta, fechada, fim = threading.Event(), threading.Event(), threading.Event()
+        resultado = {}
+
+        def trabalhador():
+            antiga = get_conexao()
+            aberta.set()
+            fechada.wait(5)
+            nova = get_conexao()
+            resultado["reaberta"] = nova is not antiga
+            resultado["consulta"] = nova.execute("SELECT 1").fetchone()[0]
+            try:
+                antiga.execute("SELECT 1")
+                resultado["antiga_fechada"] = False
+            except sqlite3.ProgrammingError:
+                resultado["antiga_fechada"] = True
+            fechar_conexao()
+            fim.set()
+
+        threading.Thread(target=trabalhador, daemon=True).start()
+        aberta.wait(5)
+        fechar_todas()
+        fechada.set()
+        fim.wait(5)
+
+        self.assertEqual(
+            resultado, {"reaberta": True, "consulta": 1, "antiga_fechada": True}
+        )
+
+    def test_mesma_thread_reabre_conexao(self):
+        antiga = get_conexao()
+        fechar_todas()
+        self.assertIsNot(get_conexao(), antiga)
+        self.assertEqual(get_conexao().execute("SELECT 1").fetchone()[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+from banco import fechar_todas, get_conexao
+
+# Esquema de parcelas anterior às migrações (tudo texto, sem juros_atraso),
+# como nos bancos criados antes dos encargos por atraso
+_PARCELAS_ANTIGA = """
+    CREATE TABLE parcelas (
+        id TEXT PRIMARY KEY,
+        id_emprestimo TEXT,
+        numero TEXT,
+        valor TEXT,
+        vencimento TEXT,
+        juros TEXT,
+        desconto TEXT,
+        parcela_atualizada TEXT,
+        valor_pago TEXT,
+        residual TEXT,
+        pago TEXT,
+        data_pagamento TEXT
+    )
+"""
+
+
+class EncargosBancoAntigo(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.banco_anterior = os.environ.get("AGIOTA_BANCO")
+        os.environ["AGIOTA_BANCO"] = os.path.join(self.pasta.name, "antigo.db")
+
+        conn = sqlite3.connect(os.environ["AGIOTA_BANCO"])
+        conn.execute(_PARCELAS_ANTIGA)
+        conn.executemany(
+            "INSERT INTO parcelas (id, id_emprestimo, numero, valor, vencimento, juros, pago) "
+            "VALUES (?, 'e1', ?, '1000.00', '01/01/2025', ?, 'Não')",
+            [("digitado", "1", "R$ 200,00"), ("perdoado", "2", "R$ 0,00"), ("vazio", "3", "")],
+        )
+        conn.commit()
+        conn.close()
+
+        from config import preparar_banco_local
+        preparar_banco_local()
+
+    def tearDown(self):
+        fechar_todas()
+        if self.banco_anterior is None:
+            os.environ.pop("AGIOTA_BANCO", None)
+        else:
+            os.environ["AGIOTA_BANCO"] = self.banco_anterior
+        self.pasta.cleanup()
+
+    def juros(self):
+        return dict(get_conexao().execute("SELECT id, juros FROM parcelas"))
+
+    def test_juros_digitados_sao_mantidos(self):
+        from encargos import atualizar_encargos
+
+        atualizar_encargos(date(2025, 3, 1))
+        atualizar_encargos(date(2025, 4, 1))
+        juros = self.juros()
+
+        self.assertEqual(juros["digitado"], 20000)
+        self.assertEqual(juros["perdoado"], 0)
+        # Sem juros: recebe os do atraso (2% + 1% ao mês por 90 dias)
+        self.assertEqual(juros["vazio"], 5000)
+
+    def test_atualizacao_nao_vai_para_a_caixa_de_saida(self):
+        from encargos import atualizar_encargos
+
+        antes = get_conexao().execute("SELECT COUNT(*) FROM caixa_saida").fetchone()[0]
+        atualizar_encargos(date(2025, 3, 1))
+        depois = get_conexao().execute("SELECT COUNT(*) FROM caixa_saida").fetchone()[0]
+        self.assertEqual(antes, depois)
+
+
+if __name__ == "__main__":
+    unittest.main()
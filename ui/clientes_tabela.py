@@ -0,0 +1,220 @@
+from PySide6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QRect, QEvent, Signal
+)
+from PySide6.QtGui import QColor, QFont
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle, QToolTip
+
+
+# ==========================
+# 🔹 MODELO DA LISTA DE CLIENTES
+# ==========================
+# A tabela da tela de busca lê direto da lista de clientes em memória:
+# nada de QTableWidgetItem/QPushButton por linha. Filtrar só muda quais
+# linhas o proxy mostra, e os botões de ação são desenhados pelo delegate.
+
+# Colunas visuais -> índice na tupla
+# (0:id_cliente, 1:nome, 2:cpf, 3:telefone, 4:endereco, 5:cidade, 6:indicacao)
+COLUNAS = [
+    ("Nome", 1),
+    ("CPF", 2),
+    ("Endereço", 4),
+    ("Cidade", 5),
+    ("Telefone", 3),
+    ("Indicação", 6),
+    ("Ações", None),
+]
+COLUNA_ACOES = len(COLUNAS) - 1
+
+
+class ClientesTableModel(QAbstractTableModel):
+    """Modelo somente leitura sobre a lista de clientes (tuplas)."""
+
+    def __init__(self, clientes, parent=None):
+        super().__init__(parent)
+        self._clientes = clientes
+
+    # ==========================
+    # 🔹 Interface do Qt
+    # ==========================
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._clientes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUNAS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        campo = COLUNAS[index.column()][1]
+        if campo is None:
+            return None
+        return self._clientes[index.row()][campo]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUNAS[section][0]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled if index.isValid() else Qt.NoItemFlags
+
+    # ==========================
+    # 🔹 Atualizações da lista
+    # ==========================
+    def cliente(self, row):
+        return self._clientes[row]
+
+    def definir_clientes(self, clientes):
+        """Troca a lista inteira (ex.: depois de recarregar do banco)."""
+        self.beginResetModel()
+        self._clientes = clientes
+        self.endResetModel()
+
+    def adicionar_cliente(self, tupla):
+        """Anexa um cliente ao fim da lista, avisando a view antes e depois."""
+        row = len(self._clientes)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._clientes.append(tupla)
+        self.endInsertRows()
+
+    def cliente_alterado(self, row):
+        """Avisa a view de que a linha `row` da lista mudou."""
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUNAS) - 1))
+
+
+class ClientesFilterProxy(QSortFilterProxyModel):
+    """
+    Filtro por Nome / Cidade / Indicação (igualdade, sem diferenciar
+    maiúsculas) e pelo resultado da busca por texto, que também define a
+    ordem das linhas (mais relevantes primeiro).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filtros = ()  # ((índice na tupla, valor normalizado), ...)
+        self._busca = None  # id_cliente -> posição no resultado (None = sem busca)
+
+    def definir_filtros(self, nome="", cidade="", indicacao=""):
+        filtros = tuple(
+            (campo, valor.strip().lower())
+            for campo, valor in ((1, nome), (5, cidade), (6, indicacao))
+            if valor.strip()
+        )
+        if filtros != self._filtros:
+            self._filtros = filtros
+            self.invalidateRowsFilter()
+
+    def definir_busca(self, ids=None):
+        """Mostra só os clientes `ids` (em ordem de relevância); None mostra todos."""
+        busca = None if ids is None else {id_cliente: i for i, id_cliente in enumerate(ids)}
+        if busca == self._busca:
+            return
+        self._busca = busca
+        self.invalidateRowsFilter()
+        self.sort(0 if busca is not None else -1)  # -1 volta à ordem da lista
+
+    def lessThan(self, esquerda, direita):
+        if self._busca is None:
+            return esquerda.row() < direita.row()
+        modelo = self.sourceModel()
+        fim = len(self._busca)
+        return (self._busca.get(modelo.cliente(esquerda.row())[0], fim)
+                < self._busca.get(modelo.cliente(direita.row())[0], fim))
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._filtros and self._busca is None:
+            return True
+        cliente = self.sourceModel().cliente(source_row)
+        if self._busca is not None and cliente[0] not in self._busca:
+            return False
+        return all(str(cliente[campo]).strip().lower() == valor for campo, valor in self._filtros)
+
+
+# ==========================
+# 🔹 BOTÕES DE AÇÃO (desenhados)
+# ==========================
+class AcoesDelegate(QStyledItemDelegate):
+    """
+    Desenha os botões 📑 (Financeiro) e ✏️ (Editar) da coluna Ações e
+    emite o sinal correspondente com a linha da lista de clientes.
+    `view` é a tabela onde o delegate é usado (precisa de mouse tracking).
+    """
+
+    financeiro_clicado = Signal(int)
+    editar_clicado = Signal(int)
+
+    TAMANHO = 28
+    ESPACO = 6
+    BOTOES = (("📑", "financeiro"), ("✏️", "editar"))
+
+    TOOLTIPS = {"financeiro": "Financeiro", "editar": "Editar dados"}
+
+    def __init__(self, view):
+        super().__init__(view)
+        self._view = view
+        self._hover = None  # (linha da view, botão) sob o mouse
+        self._fonte = QFont()
+        self._fonte.setPointSize(12)
+
+    def _retangulos(self, option):
+        largura = len(self.BOTOES) * self.TAMANHO + (len(self.BOTOES) - 1) * self.ESPACO
+        x = option.rect.x() + (option.rect.width() - largura) // 2
+        y = option.rect.y() + (option.rect.height() - self.TAMANHO) // 2
+        for i, (_, acao) in enumerate(self.BOTOES):
+            yield acao, QRect(x + i * (self.TAMANHO + self.ESPACO), y, self.TAMANHO, self.TAMANHO)
+
+    def _botao_em(self, option, pos):
+        for acao, rect in self._retangulos(option):
+            if rect.contains(pos):
+                return acao
+        return None
+
+    def paint(self, painter, option, index):
+        if index.column() != COLUNA_ACOES:
+            super().paint(painter, option, index)
+            return
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setFont(self._fonte)
+        for (texto, _), (acao, rect) in zip(self.BOTOES, self._retangulos(option)):
+            if option.state & QStyle.State_MouseOver and self._hover == (index.row(), acao):
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(QColor("#3a455b"))
+                painter.drawRoundedRect(rect, 6, 6)
+            painter.setPen(QColor("white"))
+            painter.drawText(rect, Qt.AlignCenter, texto)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if index.column() != COLUNA_ACOES:
+            return super().editorEvent(event, model, option, index)
+
+        if event.type() == QEvent.MouseMove:
+            hover = (index.row(), self._botao_em(option, event.position().toPoint()))
+            if hover != self._hover:
+                self._hover = hover
+                self._view.viewport().update()
+            return False
+
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            acao = self._botao_em(option, event.position().toPoint())
+            if acao is None:
+                return False
+            # a view mostra o proxy; o sinal leva a linha da lista de clientes
+            row = model.mapToSource(index).row()
+            if acao == "financeiro":
+                self.financeiro_clicado.emit(row)
+            else:
+                self.editar_clicado.emit(row)
+            return True
+
+        return False
+
+    def helpEvent(self, event, view, option, index):
+        if index.column() == COLUNA_ACOES and event.type() == QEvent.ToolTip:
+            acao = self._botao_em(option, event.pos())
+            if acao:
+                QToolTip.showText(event.globalPos(), self.TOOLTIPS[acao], view)
+                return True
+        return super().helpEvent(event, view, option, index)
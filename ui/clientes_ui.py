@@ -1,9 +1,9 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QFrame, QLabel, QLineEdit, QComboBox,
     QPushButton, QMessageBox, QDialog, QGridLayout, QHBoxLayout, QToolButton,
-    QGraphicsDropShadowEffect
+    QGraphicsDropShadowEffect, QCompleter
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QAbstractItemModel
 from PySide6.QtGui import QColor
 import re
 
@@ -14,6 +14,7 @@ class ClientForm(QWidget):
     Formulário de cliente.
     Campos: Nome, CPF, Endereço, Cidade, Telefone, Indicação.
     Pode ser usado para criar ou editar (se data inicial for passada).
+    `cities`: lista de cidades ou um modelo já pronto (ex.: FacetaModel).
     """
     def __init__(self, parent_callback, initial_data=None, cities=None):
         super().__init__()
@@ -57,8 +58,16 @@ class ClientForm(QWidget):
                 cb.setStyleSheet("background-color: #2c3446; color: white; padding: 6px; border-radius: 6px;")
                 cb.setInsertPolicy(QComboBox.NoInsert)  # evita duplicar item automaticamente
 
-                for city in (cities or []):
-                    cb.addItem(city)
+                if isinstance(cities, QAbstractItemModel):
+                    cb.setModel(cities)  # modelo compartilhado: nada é incluído nele
+                else:
+                    for city in (cities or []):
+                        cb.addItem(city)
+
+                completer = QCompleter(cb.model(), cb)
+                completer.setCaseSensitivity(Qt.CaseInsensitive)
+                completer.setFilterMode(Qt.MatchContains)
+                cb.setCompleter(completer)
 
                 layout.addWidget(lbl)
                 layout.addWidget(cb)
@@ -82,10 +91,10 @@ class ClientForm(QWidget):
                 val = initial_data.get(k, "")
                 if isinstance(w, QComboBox):
                     idx = w.findText(val)
-                    if idx < 0 and val:
-                        w.addItem(val)
-                        idx = w.findText(val)
-                    w.setCurrentIndex(max(0, idx))
+                    if idx >= 0:
+                        w.setCurrentIndex(idx)
+                    else:
+                        w.setEditText(val)
                 else:
                     w.setText(val)
 
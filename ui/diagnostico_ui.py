@@ -0,0 +1,87 @@
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PySide6.QtCore import Qt
+
+from instrumentacao import estatisticas, contadores, zerar
+
+
+class DiagnosticoPanel(QWidget):
+    """
+    Painel de diagnóstico (Funções Extras): p50/p95/máximo de cada operação
+    medida nesta sessão e os contadores. Só lê os números ao abrir ou ao
+    clicar em Atualizar.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        topo = QHBoxLayout()
+        titulo = QLabel("📊 Diagnóstico de desempenho")
+        titulo.setStyleSheet("color: #9fb0c7; font-size: 15px; font-weight: bold;")
+        topo.addWidget(titulo)
+        topo.addStretch()
+
+        for texto, acao in (("🔄 Atualizar", self.atualizar), ("🧹 Zerar", self._zerar)):
+            botao = QPushButton(texto)
+            botao.setStyleSheet("""
+                QPushButton {
+                    background-color: #374157; color: white;
+                    padding: 4px 10px; border-radius: 6px;
+                }
+                QPushButton:hover { background-color: #4a5671; }
+            """)
+            botao.clicked.connect(acao)
+            topo.addWidget(botao)
+        layout.addLayout(topo)
+
+        self.tabela = QTableWidget(0, 5)
+        self.tabela.setHorizontalHeaderLabels(["Operação", "Chamadas", "p50 (ms)", "p95 (ms)", "Máx. (ms)"])
+        self.tabela.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.tabela.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tabela.verticalHeader().setVisible(False)
+        self.tabela.setSelectionMode(QAbstractItemView.NoSelection)
+        self.tabela.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabela.setStyleSheet("""
+            QTableWidget {
+                background-color: #2c3446; color: white;
+                border: 1px solid #3a455b;
+            }
+            QHeaderView::section {
+                background-color: #374157; color: white;
+                font-weight: bold; padding: 4px; border: none;
+            }
+        """)
+        layout.addWidget(self.tabela)
+
+        self.lbl_contadores = QLabel("")
+        self.lbl_contadores.setWordWrap(True)
+        self.lbl_contadores.setStyleSheet("color: #ccc; font-size: 12px;")
+        layout.addWidget(self.lbl_contadores)
+
+        self.atualizar()
+
+    def atualizar(self):
+        dados = estatisticas()
+        self.tabela.setRowCount(len(dados))
+        for linha, (operacao, valores) in enumerate(dados.items()):
+            celulas = [operacao, str(valores["n"])] + [
+                f"{valores[chave]:.1f}" for chave in ("p50", "p95", "max")
+            ]
+            for coluna, texto in enumerate(celulas):
+                item = QTableWidgetItem(texto)
+                if coluna:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.tabela.setItem(linha, coluna, item)
+
+        numeros = contadores()
+        self.lbl_contadores.setText(
+            "  •  ".join(f"{nome}: {valor}" for nome, valor in numeros.items())
+            or "Nenhum contador registrado ainda."
+        )
+
+    def _zerar(self):
+        zerar()
+        self.atualizar()
@@ -1,14 +1,16 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QFrame, QLabel, QLineEdit, QPushButton, QMessageBox
+    QWidget, QVBoxLayout, QFrame, QLabel, QLineEdit, QPushButton, QMessageBox,
+    QComboBox, QDateEdit
 )
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import QGraphicsDropShadowEffect
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QDate
 import uuid
-import math
 
 from emprestimos import emprestimos, salvar_emprestimos
-from parcelas import salvar_parcelas
+from parcelas import salvar_parcelas_do_emprestimo
+from dinheiro import Dinheiro
+from amortizacao import calcular_cronograma, SISTEMAS, PRICE
 
 
 class EmprestimoForm(QWidget):
@@ -16,7 +18,7 @@ class EmprestimoForm(QWidget):
         super().__init__(parent)
         self.setWindowFlags(Qt.Window | Qt.WindowCloseButtonHint)
         self.setWindowTitle("Novo Empréstimo")
-        self.setFixedSize(420, 600)
+        self.setFixedSize(420, 700)
         self.setStyleSheet("background-color: #1c2331; color: white;")
 
         self.parent_callback = parent_callback
@@ -63,6 +65,20 @@ class EmprestimoForm(QWidget):
         layout.addWidget(QLabel("Taxa de juros mensal (%)"))
         layout.addWidget(self.inp_taxa)
 
+        self.cmb_sistema = QComboBox()
+        for chave, nome in SISTEMAS.items():
+            self.cmb_sistema.addItem(nome, chave)
+        self.cmb_sistema.setStyleSheet("background-color:#2c3446; color:white; padding:6px; border-radius:6px;")
+        layout.addWidget(QLabel("Sistema de amortização"))
+        layout.addWidget(self.cmb_sistema)
+
+        self.inp_data = QDateEdit(QDate.currentDate())
+        self.inp_data.setCalendarPopup(True)
+        self.inp_data.setDisplayFormat("dd/MM/yyyy")
+        self.inp_data.setStyleSheet("background-color:#2c3446; color:white; padding:6px; border-radius:6px;")
+        layout.addWidget(QLabel("Data do empréstimo (1º vencimento um mês depois)"))
+        layout.addWidget(self.inp_data)
+
         # Botão calcular
         btn_calc = QPushButton("📊 Calcular prestação")
         btn_calc.setStyleSheet("""
@@ -82,6 +98,7 @@ class EmprestimoForm(QWidget):
 
         self.lbl_resumo = QLabel("")
         self.lbl_resumo.setStyleSheet("font-size: 13px; color: #ccc;")
+        self.lbl_resumo.setWordWrap(True)
         layout.addWidget(self.lbl_resumo)
 
         # Botão salvar
@@ -99,32 +116,42 @@ class EmprestimoForm(QWidget):
     # ==============================
     def calcular_prestacao(self):
         try:
-            capital = float(self.inp_capital.text().replace(",", "."))
+            capital = Dinheiro.de_texto(self.inp_capital.text())
             n = int(self.inp_meses.text())
             taxa = float(self.inp_taxa.text().replace(",", ".")) / 100  # converte % para decimal
+            if capital is None:
+                raise ValueError("valor financiado vazio")
         except ValueError:
             QMessageBox.warning(self, "Erro", "Preencha todos os valores corretamente.")
             return
 
-        # Fórmula do valor da prestação
-        try:
-            p = (capital * taxa) / (1 - (1 + taxa) ** -n)
-        except ZeroDivisionError:
-            QMessageBox.warning(self, "Erro", "Taxa inválida.")
+        if n < 1 or taxa < 0:
+            QMessageBox.warning(self, "Erro", "Prazo ou taxa inválidos.")
             return
 
-        total_pago = p * n
-        total_juros = total_pago - capital
-
-        self.lbl_prestacao.setText(f"Valor da prestação: R$ {p:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+        # Cronograma completo (vencimentos, juros, amortização e saldo)
+        sistema = self.cmb_sistema.currentData()
+        data_inicio = self.inp_data.date().toPython()
+        cronograma = calcular_cronograma(capital, taxa, n, data_inicio, sistema)
+        parcelas = list(cronograma.parcelas())
+
+        total_pago = Dinheiro(int(cronograma.total_pago()[0]))
+        total_juros = Dinheiro(int(cronograma.total_juros()[0]))
+        primeira, ultima = parcelas[0][2], parcelas[-1][2]
+
+        # Na Price só a última parcela varia (absorve os centavos do arredondamento)
+        if primeira == ultima or sistema == PRICE:
+            self.lbl_prestacao.setText(f"Valor da prestação: {primeira}")
+        else:
+            self.lbl_prestacao.setText(f"Prestação: {primeira} (1ª) a {ultima} ({n}ª)")
         self.lbl_resumo.setText(
-            f"O total desse financiamento de {n} parcelas de R$ {p:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") +
-            f" é R$ {total_pago:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") +
-            f", sendo R$ {total_juros:,.2f} de juros.".replace(",", "X").replace(".", ",").replace("X", ".")
+            f"O total desse financiamento de {n} parcelas"
+            f" é {total_pago}, sendo {total_juros} de juros."
         )
 
         # guarda para salvar depois
-        self._ultimo_calc = {"capital": capital, "meses": n, "taxa": taxa, "prestacao": p,
+        self._ultimo_calc = {"capital": capital, "meses": n, "taxa": taxa, "sistema": sistema,
+                             "data_inicio": data_inicio, "prestacao": primeira, "parcelas": parcelas,
                              "total_pago": total_pago, "total_juros": total_juros}
 
     # ==============================
@@ -139,37 +166,36 @@ class EmprestimoForm(QWidget):
         novo_emprestimo = (
             emprestimo_id,
             self.id_cliente,
-            str(dados["capital"]),
-            "01/09/2025",  # TODO: usar data atual
+            dados["capital"],
+            dados["data_inicio"].strftime("%d/%m/%Y"),
             str(dados["meses"]),
-            f"Taxa {dados['taxa']*100:.2f}%"
+            f"Taxa {dados['taxa']*100:.2f}% ({dados['sistema'].upper()})"
         )
 
-        emprestimos.append(novo_emprestimo)
+        emprestimos.gravar_registro(novo_emprestimo)
         salvar_emprestimos()
 
         # gera parcelas
         novas_parcelas = []
-        for i in range(1, dados["meses"] + 1):
+        for numero, vencimento, prestacao, _, _, _ in dados["parcelas"]:
             parcela_id = str(uuid.uuid4())
-            valor_fmt = f"R$ {dados['prestacao']:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
             nova_parcela = (
                 parcela_id,
                 emprestimo_id,
-                str(i),
-                valor_fmt,
-                f"01/{i:02d}/2025",
-                "",
-                "",
-                valor_fmt,
-                "",
-                "",
+                str(numero),
+                prestacao,
+                vencimento.strftime("%d/%m/%Y"),
+                None,
+                None,
+                prestacao,
+                None,
+                None,
                 "Não",
                 ""
             )
             novas_parcelas.append(nova_parcela)
 
-        salvar_parcelas(novas_parcelas)
+        salvar_parcelas_do_emprestimo(emprestimo_id, novas_parcelas)
 
         # callback
         self.parent_callback({
@@ -178,6 +204,7 @@ class EmprestimoForm(QWidget):
             "meses": dados["meses"],
             "taxa": dados["taxa"],
             "prestacao": dados["prestacao"],
+            "juros": dados["total_juros"],
             "parcelas": novas_parcelas
         })
         self.close()
@@ -0,0 +1,28 @@
+from PySide6.QtCore import QStringListModel
+
+
+class FacetaModel(QStringListModel):
+    """
+    Lista de valores de uma Faceta (repositorio) para QComboBox e QCompleter.
+    A primeira linha é sempre "" (sem filtro). Quando um valor aparece ou
+    some, só aquela linha é incluída/removida; a lista não é refeita.
+    """
+
+    def __init__(self, faceta, parent=None):
+        super().__init__([""] + faceta.valores, parent)
+        self._faceta = faceta
+        faceta.ouvir(self)
+        self.destroyed.connect(lambda: faceta.deixar_de_ouvir(self))
+
+    # ==========================
+    # 🔹 Avisos da faceta
+    # ==========================
+    def valor_incluido(self, posicao, valor):
+        self.insertRows(posicao + 1, 1)
+        self.setData(self.index(posicao + 1), valor)
+
+    def valor_removido(self, posicao):
+        self.removeRows(posicao + 1, 1)
+
+    def valores_recomecados(self, valores):
+        self.setStringList([""] + valores)
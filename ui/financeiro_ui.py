@@ -5,9 +5,15 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QColor
 from PySide6.QtCore import Qt
 
-# Importa função para carregar empréstimos reais
-from emprestimos import carregar_emprestimos
+# Empréstimos do cliente vêm do índice em memória
+from emprestimos import emprestimos_do_cliente
 from parcelas import carregar_parcelas_por_emprestimo
+from encargos import situacao_emprestimos
+from dinheiro import Dinheiro
+from instrumentacao import medido
+from logs import get_logger
+
+log = get_logger(__name__)
 
 
 class FinanceiroWindow(QWidget):
@@ -82,6 +88,7 @@ class FinanceiroWindow(QWidget):
     # ==============================
     # Aba de Empréstimos
     # ==============================
+    @medido()
     def show_emprestimos(self):
         # Container principal
         container = QVBoxLayout()
@@ -119,8 +126,8 @@ class FinanceiroWindow(QWidget):
         """)
 
         # 🔹 Carregar empréstimos reais do cliente
-        todos_emprestimos = carregar_emprestimos()
-        emprestimos_cliente = [e for e in todos_emprestimos if e[1] == self.client_data[0]]
+        emprestimos_cliente = emprestimos_do_cliente(self.client_data[0])
+        situacao = situacao_emprestimos(e[0] for e in emprestimos_cliente)
 
         for linha, emp in enumerate(emprestimos_cliente):
             tabela.insertRow(linha)
@@ -138,23 +145,22 @@ class FinanceiroWindow(QWidget):
             item_data.setTextAlignment(Qt.AlignCenter)
             tabela.setItem(linha, 1, item_data)
 
-            # Valor (formato brasileiro: R$ 9.999,99)
-            try:
-                valor_float = float(str(emp[2]).replace(",", "."))
-                valor_fmt = f"R$ {valor_float:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-            except (ValueError, TypeError):
-                valor_fmt = emp[2] or ""
-
-            item_valor = QTableWidgetItem(valor_fmt)
+            # Valor (Dinheiro já formata no padrão brasileiro: R$ 9.999,99)
+            item_valor = QTableWidgetItem("" if emp[2] is None else str(emp[2]))
             item_valor.setFlags(item_valor.flags() & ~Qt.ItemIsEditable)
             item_valor.setTextAlignment(Qt.AlignCenter)
             tabela.setItem(linha, 2, item_valor)
 
-            # Status (placeholder: em breve vamos calcular pelas parcelas)
-            status = "Em andamento"
+            # Status calculado pelas parcelas (Quitado / Em atraso / Em andamento)
+            status, dias_atraso = situacao[emp[0]]
             item_status = QTableWidgetItem(status)
             item_status.setFlags(item_status.flags() & ~Qt.ItemIsEditable)
-            item_status.setForeground(Qt.yellow)
+            if status == "Quitado":
+                item_status.setForeground(QColor("#2ecc71"))
+            elif dias_atraso:
+                item_status.setForeground(QColor("#ff6e6e"))
+            else:
+                item_status.setForeground(Qt.yellow)
             item_status.setTextAlignment(Qt.AlignCenter)
             tabela.setItem(linha, 3, item_status)
 
@@ -192,7 +198,7 @@ class FinanceiroWindow(QWidget):
         from ui.parcelas_ui import ParcelasWindow
 
         def callback(data):
-            print("Novo empréstimo cadastrado:", data)
+            log.debug("Novo empréstimo cadastrado: %s", data)
 
             # Abre a tela de parcelas com os dados reais
             self.parcelas_window = ParcelasWindow({
@@ -354,18 +360,16 @@ class FinanceiroWindow(QWidget):
 
     def atualizar_totalizador(self):
         """Recalcula o total das garantias."""
-        total = 0.0
+        total = Dinheiro()
         row_count = self.tabela_garantias.rowCount()
 
         # percorre todas as linhas menos a última (totalizador)
         for r in range(row_count - 1):
             val_item = self.tabela_garantias.item(r, 2)
             if val_item:
-                txt = val_item.text().replace("R$", "").replace(".", "").replace(",", ".").strip()
                 try:
-                    total += float(txt)
-                except:
+                    total += Dinheiro.de_texto(val_item.text(), Dinheiro())
+                except ValueError:
                     pass
 
-        total_fmt = f"R$ {total:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-        self.tabela_garantias.item(row_count - 1, 2).setText(total_fmt)
+        self.tabela_garantias.item(row_count - 1, 2).setText(str(total))
@@ -5,6 +5,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
 
+from dinheiro import Dinheiro
+
 
 class GarantiaForm(QWidget):
     """Formulário simples para cadastrar garantia."""
@@ -92,13 +94,15 @@ class GarantiaForm(QWidget):
             QMessageBox.warning(self, "Erro", f"A descrição não pode ter mais que {self.desc_limit} caracteres.")
             return
 
-        # Valida e formata valor
+        # Valida e formata valor ("R$" sozinho não tem valor nenhum)
         try:
-            num = float(valor.replace("R$", "").replace(".", "").replace(",", ".").strip())
-            valor_fmt = f"R$ {num:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            dinheiro = Dinheiro.de_texto(valor)
         except ValueError:
+            dinheiro = None
+        if dinheiro is None:
             QMessageBox.warning(self, "Erro", "Digite um valor válido no formato R$ 999.999,99")
             return
+        valor_fmt = str(dinheiro)
 
         # Retorna pro FinanceiroWindow
         self.parent_callback({"descricao": desc, "valor": valor_fmt})
@@ -0,0 +1,195 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor, QFont
+
+from dinheiro import Dinheiro
+
+
+# ==========================
+# 🔹 PARCELA EM EDIÇÃO
+# ==========================
+CAMPOS_PARCELA = (
+    "id", "id_emprestimo", "numero", "valor", "vencimento",
+    "juros", "desconto", "parcela_atualizada", "valor_pago",
+    "residual", "pago", "data_pagamento",
+)
+CAMPOS_DINHEIRO = {"valor", "juros", "desconto", "parcela_atualizada", "valor_pago", "residual"}
+
+
+def _como_dinheiro(valor):
+    """Valor da tupla -> Dinheiro (textos antigos são lidos uma única vez)."""
+    if valor is None or isinstance(valor, Dinheiro):
+        return valor
+    try:
+        return Dinheiro.de_texto(str(valor))
+    except ValueError:
+        return None
+
+
+class ParcelaEditavel:
+    """
+    Parcela aberta na janela, com os campos já tipados (Dinheiro / texto).
+    Os calculados são refeitos só para exibição; parcela que o usuário não
+    editou volta como veio, para não ser regravada nem reenviada à nuvem.
+    """
+
+    __slots__ = CAMPOS_PARCELA + ("_original", "editada")
+
+    def __init__(self, linha):
+        self._original = tuple(linha)
+        self.editada = False
+        for campo, valor in zip(CAMPOS_PARCELA, linha):
+            setattr(self, campo, _como_dinheiro(valor) if campo in CAMPOS_DINHEIRO else valor)
+        self.recalcular()
+
+    def _ou_zero(self, campo):
+        return getattr(self, campo) or Dinheiro()
+
+    def recalcular(self):
+        """Parcela Atualizada = Valor + Juros - Desconto; Residual = Atualizada - Pago."""
+        self.parcela_atualizada = self._ou_zero("valor") + self._ou_zero("juros") - self._ou_zero("desconto")
+        self.residual = self.parcela_atualizada - self._ou_zero("valor_pago")
+
+    def como_tupla(self):
+        if not self.editada:
+            return self._original
+        return tuple(getattr(self, campo) for campo in CAMPOS_PARCELA)
+
+
+# ==========================
+# 🔹 MODELO DA GRADE DE PARCELAS
+# ==========================
+# Coluna visual -> (título, campo, editável, cor do texto)
+COLUNAS = [
+    ("Nº", "numero", False, None),
+    ("Vencimento", "vencimento", True, None),
+    ("Valor", "valor", True, None),
+    ("Juros", "juros", True, "#78ddff"),
+    ("Desconto", "desconto", True, "#ffaeae"),
+    ("Parcela Atualizada", "parcela_atualizada", False, None),
+    ("Valor Pago", "valor_pago", True, "#78ddff"),
+    ("Residual", "residual", False, "#ffaeae"),
+    ("Data do Pag.", "data_pagamento", True, None),
+]
+COLUNA_DO_CAMPO = {campo: col for col, (_, campo, _, _) in enumerate(COLUNAS)}
+
+# Campos recalculados quando um campo monetário muda
+CALCULADOS = ("parcela_atualizada", "residual")
+
+# Linha de totais: cor do texto por coluna
+CORES_TOTAL = {3: "#00bfff", 6: "#00bfff", 4: "#ff6e6e", 7: "#ff6e6e"}
+FUNDO_TOTAL = QColor("#4e586e")
+
+
+class ParcelasTableModel(QAbstractTableModel):
+    """
+    Grade de parcelas de um empréstimo, com uma linha de totais no fim.
+    Os totais por coluna são mantidos de forma incremental: editar uma
+    célula só ajusta a diferença (novo - antigo) nas colunas afetadas e
+    emite dataChanged apenas para as células que mudaram.
+    """
+
+    def __init__(self, parcelas, parent=None):
+        super().__init__(parent)
+        self._parcelas = [ParcelaEditavel(p) for p in parcelas]
+        self._totais = {
+            campo: sum((getattr(p, campo) or Dinheiro() for p in self._parcelas), Dinheiro())
+            for campo in CAMPOS_DINHEIRO
+        }
+        self._negrito = QFont()
+        self._negrito.setBold(True)
+        self._cores = {col: QColor(cor) for col, (_, _, _, cor) in enumerate(COLUNAS) if cor}
+        self._cores_total = {col: QColor(cor) for col, cor in CORES_TOTAL.items()}
+
+    def parcelas(self):
+        return self._parcelas
+
+    def linha_total(self):
+        return len(self._parcelas)
+
+    # ==========================
+    # 🔹 Interface do Qt
+    # ==========================
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._parcelas) + 1
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUNAS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUNAS[section][0]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.row() == self.linha_total() or not COLUNAS[index.column()][2]:
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        campo = COLUNAS[col][1]
+        total = row == self.linha_total()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if total:
+                return str(self._totais[campo]) if campo in CAMPOS_DINHEIRO else ""
+            valor = getattr(self._parcelas[row], campo)
+            return "" if valor is None else str(valor)
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.FontRole:
+            if col == 0 and not total:
+                return self._negrito
+            if total and campo in CAMPOS_DINHEIRO:
+                return self._negrito
+            return None
+        if role == Qt.ForegroundRole:
+            return self._cores_total.get(col) if total else self._cores.get(col)
+        if role == Qt.BackgroundRole and total:
+            return FUNDO_TOTAL
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not (self.flags(index) & Qt.ItemIsEditable):
+            return False
+
+        row, col = index.row(), index.column()
+        campo = COLUNAS[col][1]
+        parcela = self._parcelas[row]
+
+        if campo not in CAMPOS_DINHEIRO:
+            texto = (value or "").strip()
+            if texto == getattr(parcela, campo):
+                return False
+            setattr(parcela, campo, texto)
+            parcela.editada = True
+            self.dataChanged.emit(index, index)
+            return True
+
+        # Lê o texto digitado uma vez; valor inválido deixa a célula vazia
+        try:
+            novo = Dinheiro.de_texto(value or "")
+        except ValueError:
+            novo = None
+        if novo == getattr(parcela, campo):
+            return False
+
+        antigos = {c: getattr(parcela, c) for c in (campo,) + CALCULADOS}
+        setattr(parcela, campo, novo)
+        parcela.editada = True
+        parcela.recalcular()
+
+        for c, antigo in antigos.items():
+            atual = getattr(parcela, c)
+            if atual == antigo:
+                continue
+            self._totais[c] += (atual or Dinheiro()) - (antigo or Dinheiro())
+            celula = self.index(row, COLUNA_DO_CAMPO[c])
+            self.dataChanged.emit(celula, celula)
+            total = self.index(self.linha_total(), COLUNA_DO_CAMPO[c])
+            self.dataChanged.emit(total, total)
+        return True
@@ -1,16 +1,73 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer
-from PySide6.QtGui import QPixmap, QGuiApplication
+import os
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar
+from PySide6.QtCore import (
+    Qt, QPropertyAnimation, QEasingCurve, QObject, QRunnable, QThreadPool, QSize, Signal
+)
+from PySide6.QtGui import QImage, QPixmap, QGuiApplication
+
+from config import resource_path, get_local_db_path
+
+TAMANHO_IMAGEM = QSize(400, 400)
+
+
+def _imagem_splash(tamanho):
+    """
+    Lê a imagem da splash já no tamanho de exibição. Na primeira vez a
+    imagem original é redimensionada e guardada em cache ao lado do
+    banco; nas próximas, só o arquivo em cache é decodificado.
+    """
+    origem = resource_path("imginicio.png")
+    cache = os.path.join(
+        os.path.dirname(get_local_db_path()),
+        f".splash_{tamanho.width()}x{tamanho.height()}.png"
+    )
+
+    try:
+        if os.path.getmtime(cache) >= os.path.getmtime(origem):
+            imagem = QImage(cache)
+            if not imagem.isNull():
+                return imagem
+    except OSError:
+        pass
+
+    imagem = QImage(origem)
+    if imagem.isNull():
+        return imagem
+    if imagem.size() != tamanho:
+        imagem = imagem.scaled(tamanho, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    imagem.save(cache, "PNG", 100)  # 100 = sem compressão, decodifica mais rápido
+    return imagem
+
+
+class _ImagemSignals(QObject):
+    pronta = Signal(QImage)
+
+
+class _CarregarImagem(QRunnable):
+    """Decodifica a imagem fora da thread da interface (QImage pode; QPixmap não)."""
+    def __init__(self, tamanho):
+        super().__init__()
+        self.tamanho = tamanho
+        self.signals = _ImagemSignals()
+
+    def run(self):
+        self.signals.pronta.emit(_imagem_splash(self.tamanho))
 
 
 class SplashScreen(QWidget):
+    """
+    Tela de abertura. Mostra o andamento do carregamento (definir_progresso)
+    e, quando ele termina, concluir(janela) mostra a janela principal e
+    some com um fade-out curto.
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
 
         # Janela sem bordas e sempre no topo
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.SplashScreen)
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setFixedSize(400, 400)
+        self.setFixedSize(TAMANHO_IMAGEM.width(), TAMANHO_IMAGEM.height() + 40)
 
         # Centralizar na tela
         screen = QGuiApplication.primaryScreen().availableGeometry().center()
@@ -19,35 +76,55 @@ class SplashScreen(QWidget):
         # Layout principal
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
 
-        # Imagem ou texto alternativo
+        # Imagem (chega pronta do _CarregarImagem)
         self.label = QLabel()
-        from main import resource_path
-        pixmap = QPixmap(resource_path("imginicio.png"))
+        self.label.setFixedSize(TAMANHO_IMAGEM)
+        self.label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.label)
 
-        if not pixmap.isNull():
-            self.label.setPixmap(pixmap.scaled(400, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        else:
-            self.label.setText("Imagem não carregada")
-            self.label.setStyleSheet("color: white;")
-            self.label.setAlignment(Qt.AlignCenter)
+        # Andamento do carregamento
+        self.barra = QProgressBar()
+        self.barra.setRange(0, 100)
+        self.barra.setTextVisible(False)
+        self.barra.setFixedHeight(6)
+        self.barra.setStyleSheet("""
+            QProgressBar { background-color: #2c3446; border: none; border-radius: 3px; }
+            QProgressBar::chunk { background-color: #2ecc71; border-radius: 3px; }
+        """)
+        layout.addWidget(self.barra)
 
-        layout.addWidget(self.label)
+        self.status = QLabel("Iniciando...")
+        self.status.setAlignment(Qt.AlignCenter)
+        self.status.setStyleSheet("color: #9fb0c7; font-size: 12px;")
+        layout.addWidget(self.status)
+
+        carregar = _CarregarImagem(TAMANHO_IMAGEM)
+        carregar.signals.pronta.connect(self._mostrar_imagem)
+        QThreadPool.globalInstance().start(carregar)
 
         # Animação de fade-out
         self.anim = QPropertyAnimation(self, b"windowOpacity")
-        self.anim.setDuration(1000)
+        self.anim.setDuration(300)
         self.anim.setStartValue(1)
         self.anim.setEndValue(0)
         self.anim.setEasingCurve(QEasingCurve.InOutQuad)
-        self.anim.finished.connect(self.close_and_open_main)
+        self.anim.finished.connect(self.close)
 
-        # Iniciar animação após 2 segundos
-        from PySide6.QtCore import QTimer
-        QTimer.singleShot(2000, self.anim.start)
+    def _mostrar_imagem(self, imagem):
+        if imagem.isNull():
+            self.label.setText("Imagem não carregada")
+            self.label.setStyleSheet("color: white;")
+        else:
+            self.label.setPixmap(QPixmap.fromImage(imagem))
 
-    def close_and_open_main(self):
-        """Fecha a splash e mostra a janela principal."""
-        self.close()
-        self.parent().show()
+    def definir_progresso(self, texto, percentual):
+        self.status.setText(texto)
+        self.barra.setValue(percentual)
 
+    def concluir(self, janela):
+        """Mostra a janela principal e fecha a splash com fade-out."""
+        janela.show()
+        self.raise_()
+        self.anim.start()